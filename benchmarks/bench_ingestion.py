@@ -0,0 +1,133 @@
+"""Update qabul qilish: long polling va webhook (navbat + workerlar) rejimlari.
+
+Telegram kerak emas — bir xil sintetik update lar ikkala rejimga beriladi:
+  * polling — getUpdates sikli taqlid qilinadi (har chaqiruv --rtt ms, 100 tagacha
+    update), aiogram kabi har bir update alohida task da ishlaydi;
+  * webhook — lokal aiohttp server (bot.webhook.UpdateIngress), update lar
+    --clients ta parallel HTTP klientdan POST qilinadi.
+Handler har bir update da --work ms "ishlaydi" (DB/API kutishini taqlid qiladi).
+
+    python -m benchmarks.bench_ingestion --updates 20000 --work 20 --rtt 50
+"""
+import argparse
+import asyncio
+import time
+
+import aiohttp
+from aiohttp import web
+from aiogram import Bot, Dispatcher
+from aiogram.types import Update, Message
+
+from bot.webhook import UpdateIngress, SECRET_HEADER
+
+SECRET = "bench-secret"
+PORT = 18080
+
+
+def make_updates(n: int) -> list[dict]:
+    return [
+        {
+            "update_id": i,
+            "message": {
+                "message_id": i,
+                "date": 0,
+                "chat": {"id": 1000 + i % 5000, "type": "private"},
+                "from": {"id": 1000 + i % 5000, "is_bot": False, "first_name": "bench"},
+                "text": "📋 Bugungi rejalarim",
+            },
+        }
+        for i in range(1, n + 1)
+    ]
+
+
+def make_dispatcher(work: float, done: list) -> Dispatcher:
+    dp = Dispatcher()
+
+    @dp.message()
+    async def handler(message: Message):
+        await asyncio.sleep(work)
+        done.append(time.perf_counter())
+
+    return dp
+
+
+async def bench_polling(bot: Bot, updates: list[dict], work: float, rtt: float) -> tuple[float, int]:
+    done = []
+    dp = make_dispatcher(work, done)
+    tasks = set()
+    started = time.perf_counter()
+
+    for offset in range(0, len(updates), 100):
+        await asyncio.sleep(rtt)  # getUpdates round-trip
+        for data in updates[offset:offset + 100]:
+            task = asyncio.create_task(dp.feed_update(bot, Update.model_validate(data, context={"bot": bot})))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+
+    while tasks:
+        await asyncio.gather(*tasks)
+    return time.perf_counter() - started, 0
+
+
+async def bench_webhook(bot: Bot, updates: list[dict], work: float, clients: int,
+                        queue_size: int, workers: int) -> tuple[float, int]:
+    done = []
+    dp = make_dispatcher(work, done)
+    ingress = UpdateIngress(bot, dp, SECRET, queue_size=queue_size, workers=workers)
+    ingress.start()
+
+    runner = web.AppRunner(ingress.app("/webhook"))
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", PORT, reuse_port=True).start()
+
+    pending = asyncio.Queue()
+    for data in updates:
+        pending.put_nowait(data)
+
+    async def client(session: aiohttp.ClientSession):
+        # Telegram kabi: 503 bo'lsa — biroz kutib qayta yuboradi
+        while not pending.empty():
+            data = pending.get_nowait()
+            while True:
+                async with session.post(f"http://127.0.0.1:{PORT}/webhook", json=data,
+                                        headers={SECRET_HEADER: SECRET}) as resp:
+                    if resp.status == 200:
+                        break
+                await asyncio.sleep(0.05)
+
+    started = time.perf_counter()
+    async with aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=clients)) as session:
+        await asyncio.gather(*(client(session) for _ in range(clients)))
+    await ingress.drain()
+    elapsed = time.perf_counter() - started
+
+    await runner.cleanup()
+    return elapsed, ingress.rejected
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--updates", type=int, default=20_000)
+    parser.add_argument("--work", type=float, default=20, help="handler ishi, ms")
+    parser.add_argument("--rtt", type=float, default=50, help="getUpdates round-trip, ms")
+    parser.add_argument("--clients", type=int, default=50, help="parallel webhook ulanishlar")
+    parser.add_argument("--queue-size", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=64)
+    args = parser.parse_args()
+
+    updates = make_updates(args.updates)
+    bot = Bot(token="123456:bench")
+    try:
+        elapsed, _ = await bench_polling(bot, updates, args.work / 1000, args.rtt / 1000)
+        print(f"polling : {elapsed:7.2f}s  {len(updates) / elapsed:8.0f} update/s")
+
+        elapsed, rejected = await bench_webhook(
+            bot, updates, args.work / 1000, args.clients, args.queue_size, args.workers
+        )
+        print(f"webhook : {elapsed:7.2f}s  {len(updates) / elapsed:8.0f} update/s  (503: {rejected})")
+    finally:
+        await bot.session.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
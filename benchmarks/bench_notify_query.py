@@ -0,0 +1,98 @@
+"""Eslatmalar catch-up query'sining (get_pending_plans_to_notify) tezligi: indekssiz va indeks bilan.
+
+Alohida "bench_notify" sxemasida ishlaydi, asosiy jadvallarga tegmaydi.
+
+    BENCH_DATABASE_URL=postgresql+asyncpg://... python -m benchmarks.bench_notify_query --rows 1000000 10000000
+"""
+import argparse
+import asyncio
+import os
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+
+from bot.config import DATABASE_URL, TIMEZONE, REMINDER_RECONCILE_MINUTES
+from database.db import Base
+from bot.models import user, plan, score_log, admin  # noqa
+from bot.models.plan import Plan
+from bot.services.plan_service import get_pending_plans_to_notify
+
+BENCH_INDEXES = {"ix_plans_date_time_status", "ix_plans_notify_pending"}
+
+SCHEMA = "bench_notify"
+REPEAT = 20
+
+SEED_SQL = """
+INSERT INTO plans (user_id, title, scheduled_time, plan_date, status, score_value, created_at, notified_at)
+SELECT
+    1,
+    'Reja ' || g,
+    lpad(((g % 1440) / 60)::text, 2, '0') || ':' || lpad((g % 60)::text, 2, '0'),
+    (now() AT TIME ZONE 'Asia/Tashkent')::date - (g % 365),
+    CASE WHEN g % 365 = 0 THEN 'pending' WHEN g % 3 = 0 THEN 'failed' ELSE 'done' END::planstatus,
+    5,
+    now(),
+    CASE WHEN g % 365 = 0 THEN NULL ELSE now() END
+FROM generate_series(1, :rows) AS g
+"""
+
+
+async def timed_query(sessionmaker) -> float:
+    until = datetime.now(TIMEZONE).replace(second=0, microsecond=0, tzinfo=None)
+    since = until - timedelta(minutes=REMINDER_RECONCILE_MINUTES)
+    timings = []
+    for _ in range(REPEAT):
+        async with sessionmaker() as session:
+            started = time.perf_counter()
+            await get_pending_plans_to_notify(session, since, until)
+            timings.append(time.perf_counter() - started)
+    timings.sort()
+    return timings[len(timings) // 2] * 1000
+
+
+async def bench(rows: int, url: str):
+    engine = create_async_engine(url, connect_args={"server_settings": {"search_path": SCHEMA}})
+    sessionmaker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    async with engine.begin() as conn:
+        await conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+        await conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(text("INSERT INTO users (id, telegram_id, streak, total_score) VALUES (1, 1, 0, 0)"))
+        await conn.execute(text(SEED_SQL), {"rows": rows})
+
+    indexes = [i for i in Plan.__table__.indexes if i.name in BENCH_INDEXES]
+    async with engine.begin() as conn:
+        for index in indexes:
+            await conn.run_sync(index.drop)
+        await conn.execute(text("ANALYZE plans"))
+    without_index = await timed_query(sessionmaker)
+
+    # create_all mavjud jadvalga indeks qo'shmaydi — indekslar alohida yaratiladi
+    async with engine.begin() as conn:
+        for index in indexes:
+            await conn.run_sync(index.create)
+        await conn.execute(text("ANALYZE plans"))
+    with_index = await timed_query(sessionmaker)
+
+    async with engine.begin() as conn:
+        await conn.execute(text(f"DROP SCHEMA {SCHEMA} CASCADE"))
+    await engine.dispose()
+
+    print(f"{rows:>12,} qator | indekssiz: {without_index:9.2f} ms | indeks bilan: {with_index:7.2f} ms")
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000_000, 10_000_000])
+    args = parser.parse_args()
+
+    url = os.getenv("BENCH_DATABASE_URL", DATABASE_URL)
+    for rows in args.rows:
+        await bench(rows, url)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,148 @@
+"""extract_plans_from_text: lokal tahlil qancha xabarni GPT siz hal qiladi.
+
+Korpus — odatiy reja xabarlari (uz lotin/kirill / ru / en), hozirgi vaqt 14:10 (Tashkent).
+Kutilgan natija None bo'lsa — xabar GPT ga ketishi kerak (lokal qoidalar
+uni ishonch bilan tushunmasligi kerak). Tejalgan vaqt = lokal hal qilingan
+xabarlar × GPT p50; GPT p50 --gpt bilan o'lchanadi, aks holda --gpt-ms.
+
+    python -m benchmarks.bench_plan_extractor
+    python -m benchmarks.bench_plan_extractor --gpt
+"""
+import argparse
+import asyncio
+import time
+from datetime import datetime
+
+from bot.config import TIMEZONE, PLAN_EXTRACT_CONFIDENCE
+from bot.services.plan_extractor import extract_plans_local
+
+NOW = TIMEZONE.localize(datetime(2026, 10, 18, 14, 10))
+
+# (matn, [(title, scheduled_time, for_tomorrow), ...] yoki None)
+CORPUS = [
+    ("soat 7 da turaman, 9 da kitob o'qiyman", [("Uyg'onish", "07:00", False), ("Kitob o'qish", "09:00", False)]),
+    ("ertaga 6 da turaman va 7 da yuguraman", [("Uyg'onish", "06:00", True), ("Yugurish", "07:00", True)]),
+    ("10 ta turnik", [("Turnikda 10 ta tortish", None, False)]),
+    ("kechqurun 8 da 5 km yugurish", [("5 km yugurish", "20:00", False)]),
+    ("30 minutdan keyin 20 sahifa kitob o'qiyman", [("20 sahifa kitob o'qish", "14:40", False)]),
+    ("soat 21:00 da uxlayman", [("Uxlash", "21:00", False)]),
+    ("nonushta 8 da", [("Nonushta", "08:00", False)]),
+    ("ertalab sovuq dush", [("Sovuq dush", None, False)]),
+    ("soat 15 da matematikadan dars", [("Matematika darsi", "15:00", False)]),
+    ("ai fanidan 16 da", [("AI darsi", "16:00", False)]),
+    ("imtihonga tayyorlanaman soat 18 da", [("Imtihonga tayyorgarlik", "18:00", False)]),
+    ("gym 19:00", [("Fitnes mashg'uloti", "19:00", False)]),
+    ("sport qilaman 17 da", [("Sport mashg'uloti", "17:00", False)]),
+    ("2 stakan suv ichaman", [("2 stakan suv ichish", None, False)]),
+    ("20 minutlik meditatsiya", [("20 daqiqa meditatsiya", None, False)]),
+    ("bomdod namoz 5 da", [("Namoz o'qish", "05:00", False)]),
+    ("proyekt ustida ishlayman soat 10 da", [("Proyekt ustida ishlash", "10:00", False)]),
+    ("ertaga 7 da uyg'onish, 8 da nonushta, 9 da dars", [
+        ("Uyg'onish", "07:00", True), ("Nonushta", "08:00", True), ("Darsga tayyorgarlik", "09:00", True),
+    ]),
+    ("в 7 утра проснуться", [("Uyg'onish", "07:00", False)]),
+    ("через час читать книгу", [("Kitob o'qish", "15:10", False)]),
+    ("завтра в 6 пробежка", [("Yugurish", "06:00", True)]),
+    ("в 19:00 спортзал", [("Fitnes mashg'uloti", "19:00", False)]),
+    ("соат 7 да тураман, 9 да китоб ўқийман", [("Uyg'onish", "07:00", False), ("Kitob o'qish", "09:00", False)]),
+    ("эртага кечқурун 8 да югуриш", [("Yugurish", "20:00", True)]),
+    ("wake up at 6 am and workout at 7", [("Uyg'onish", "06:00", False), ("Sport mashg'uloti", "07:00", False)]),
+    ("read a book at 9 pm", [("Kitob o'qish", "21:00", False)]),
+    ("tomorrow breakfast at 8", [("Nonushta", "08:00", True)]),
+    ("7 da turaman keyin 8 da sport", [("Uyg'onish", "07:00", False), ("Sport mashg'uloti", "08:00", False)]),
+    # GPT ga ketishi kerak
+    ("soat 5 da onamga qo'ng'iroq qilaman", None),
+    ("do'stim bilan kinoga boraman kechqurun", None),
+    ("yarim soatdan keyin uyni tozalayman", None),
+    ("hisobotni tugatib rahbarga yuborishim kerak", None),
+    ("yarın sabah 7'de kalkacağım", None),
+    ("позвонить маме в 5", None),
+    ("buy groceries at 6", None),
+    ("kitob do'konidan yangi roman sotib olib kelaman", None),
+    # inkor / o'tgan zamon / davomiylik — lokal qabul qilinmasligi kerak
+    ("bugun yugurmayman", None),
+    ("kitob o'qimayman", None),
+    ("не буду читать", None),
+    ("I will not run", None),
+    ("I won't run today", None),
+    ("bugun 5 km yugurdim", None),
+    ("2 soat kitob o'qiyman", None),
+    ("1 soat yuguraman", None),
+    ("7 da turaman 8 da sport", None),
+    ("1,5 soatdan keyin yuguraman", None),
+    ("1.5 soatdan keyin kitob o'qiyman", None),
+    ("yugurishni yomon ko'raman", None),
+    ("yuguraman deb o'ylayman", None),
+    ("kitob o'qishni yaxshi ko'raman", None),
+]
+
+
+def percentile(values: list[float], p: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+
+def _summary(plans: list[dict]) -> list[tuple]:
+    return [(p["title"], p["scheduled_time"], p["for_tomorrow"]) for p in plans]
+
+
+def bench_local(repeat: int) -> int:
+    hits = correct = false_hits = 0
+    timings = []
+    for text, expected in CORPUS:
+        result = extract_plans_local(text, NOW)
+        accepted = bool(result.plans) and result.confidence >= PLAN_EXTRACT_CONFIDENCE
+        if accepted:
+            hits += 1
+            if _summary(result.plans) == expected:
+                correct += 1
+            else:
+                false_hits += 1
+                print(f"   ✗ {text!r}: {_summary(result.plans)} (kutilgan {expected})")
+        elif expected is not None:
+            print(f"   → GPT: {text!r} (ishonch {result.confidence:.1f})")
+
+    for _ in range(repeat):
+        for text, _ in CORPUS:
+            started = time.perf_counter()
+            extract_plans_local(text, NOW)
+            timings.append((time.perf_counter() - started) * 1000)
+
+    local_total = sum(expected is not None for _, expected in CORPUS)
+    print(
+        f"local : hit rate {hits}/{len(CORPUS)} ({hits / len(CORPUS):.0%}), "
+        f"lokal bo'lishi mumkin bo'lganlardan {correct}/{local_total}, noto'g'ri qabul {false_hits} | "
+        f"p50 {percentile(timings, 0.5):.3f} ms, p99 {percentile(timings, 0.99):.3f} ms"
+    )
+    return hits
+
+
+async def bench_gpt() -> float:
+    from bot.services.ai_service import extract_plans_gpt
+
+    timings = []
+    for text, _ in CORPUS:
+        started = time.perf_counter()
+        await extract_plans_gpt(text)
+        timings.append((time.perf_counter() - started) * 1000)
+    print(f"gpt   : p50 {percentile(timings, 0.5):.0f} ms, p99 {percentile(timings, 0.99):.0f} ms")
+    return percentile(timings, 0.5)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--gpt", action="store_true", help="GPT yo'lini ham o'lchash (tarmoq)")
+    parser.add_argument("--gpt-ms", type=float, default=1500, help="GPT p50 (o'lchanmasa)")
+    args = parser.parse_args()
+
+    hits = bench_local(args.repeat)
+    gpt_ms = asyncio.run(bench_gpt()) if args.gpt else args.gpt_ms
+    print(
+        f"tejaldi: {hits} ta GPT chaqiruvi, ~{hits * gpt_ms / 1000:.1f} s "
+        f"(xabar boshiga o'rtacha {hits * gpt_ms / len(CORPUS):.0f} ms, GPT p50 {gpt_ms:.0f} ms)"
+    )
+
+
+if __name__ == "__main__":
+    main()
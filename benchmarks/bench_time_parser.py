@@ -0,0 +1,100 @@
+"""extract_time_only: lokal qoidalar va GPT yo'li — aniqlik va latency.
+
+Korpus — "asking_time" bosqichidagi odatiy javoblar (uz / ru / en), hozirgi
+vaqt 14:10 (Tashkent) deb olinadi. GPT yo'li faqat --gpt bilan o'lchanadi
+(OPENAI_API_KEY kerak).
+
+    python -m benchmarks.bench_time_parser
+    python -m benchmarks.bench_time_parser --gpt
+"""
+import argparse
+import asyncio
+import time
+from datetime import datetime
+from unittest import mock
+
+from bot.config import TIMEZONE
+from bot.services.time_parser import parse_time
+
+NOW = TIMEZONE.localize(datetime(2026, 10, 18, 14, 10))
+
+CORPUS = [
+    # uz — aniq vaqt
+    ("soat 15 da", "15:00"), ("Soat 15 da", "15:00"), ("soat 9 da", "09:00"), ("9 da", "09:00"),
+    ("14:30 da", "14:30"), ("soat 21:15 da", "21:15"), ("21.00", "21:00"), ("soat 6ga", "06:00"),
+    ("kechqurun 19:00", "19:00"), ("kechqurun 7 da", "19:00"), ("kechqurun soat 8", "20:00"),
+    ("kechqurun soat 10 da", "22:00"), ("ertalab 7 da", "07:00"), ("tushdan keyin 3 da", "15:00"),
+    ("7 yarimda", "07:30"), ("o'n beshda", "15:00"), ("soat o'n beshda", "15:00"), ("soat yettida", "07:00"),
+    # uz — nisbiy
+    ("30 minutdan keyin", "14:40"), ("yarim soatdan keyin", "14:40"), ("1 soatdan keyin", "15:10"),
+    ("2 soatdan so'ng", "16:10"), ("bir yarim soatdan keyin", "15:40"), ("o'ttiz minutdan keyin", "14:40"),
+    ("besh minutdan keyin", "14:15"), ("10 daqiqadan keyin", "14:20"), ("15 minutdan so'ng", "14:25"),
+    ("2 soat 30 minutdan keyin", "16:40"), ("1 soat 15 minutdan so'ng", "15:25"),
+    # uz — tun
+    ("kechasi 2 da", "02:00"), ("kechasi 11 da", "23:00"), ("kechasi soat 12 da", "00:00"), ("tunda 1 da", "01:00"),
+    # ru
+    ("через час", "15:10"), ("через 15 минут", "14:25"), ("через полчаса", "14:40"), ("через 2 часа", "16:10"),
+    ("через пять минут", "14:15"), ("в 7 вечера", "19:00"), ("в 9 утра", "09:00"), ("в 15:00", "15:00"),
+    ("в 8 часов", "08:00"), ("8 часов вечера", "20:00"), ("в полдень", "12:00"),
+    ("в 12 ночи", "00:00"), ("в 2 ночи", "02:00"), ("через 2 часа 30 минут", "16:40"),
+    # en
+    ("at 7 pm", "19:00"), ("7pm", "19:00"), ("at 9", "09:00"), ("at 10:45", "10:45"), ("noon", "12:00"),
+    ("in 20 minutes", "14:30"), ("in an hour", "15:10"), ("in half an hour", "14:40"), ("20 minutes later", "14:30"),
+    ("in 2 hours 30 minutes", "16:40"), ("in 1 hour and 15 minutes", "15:25"), ("at 9 tonight", "21:00"),
+    # vaqt yo'q
+    ("kechqurun", None), ("bilmayman", None), ("bir soat kitob o'qiyman", None), ("2 soat ishlayman", None),
+    # qo'shib o'qilmagan davomiylik — noto'g'ri offset o'rniga GPT
+    ("2 soat va 30 minutdan keyin", None), ("1 hour and in 30 minutes", None),
+    # o'nli davomiylik — kasr qismi "5 soat" deb o'qilmasin
+    ("1.5 soatdan keyin", None), ("1,5 soatdan keyin", None), ("0.5 soatdan keyin", None), ("2,5 soatdan keyin", None),
+    ("через 1,5 часа", None), ("in 1.5 hours", None),
+]
+
+
+def percentile(values: list[float], p: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+
+def bench_rules(repeat: int):
+    correct = sum(parse_time(text, NOW) == expected for text, expected in CORPUS)
+    timings = []
+    for _ in range(repeat):
+        for text, _ in CORPUS:
+            started = time.perf_counter()
+            parse_time(text, NOW)
+            timings.append((time.perf_counter() - started) * 1000)
+    print(f"rules : {correct}/{len(CORPUS)} to'g'ri | p50 {percentile(timings, 0.5):.3f} ms, p99 {percentile(timings, 0.99):.3f} ms")
+    for text, expected in CORPUS:
+        got = parse_time(text, NOW)
+        if got != expected:
+            print(f"   ✗ {text!r}: {got} (kutilgan {expected})")
+
+
+async def bench_gpt():
+    from bot.services import ai_service
+
+    correct, timings = 0, []
+    with mock.patch.object(ai_service, "datetime", wraps=datetime) as patched:
+        patched.now.return_value = NOW
+        for text, expected in CORPUS:
+            started = time.perf_counter()
+            got = await ai_service.extract_time_gpt(text)
+            timings.append((time.perf_counter() - started) * 1000)
+            correct += got == expected
+    print(f"gpt   : {correct}/{len(CORPUS)} to'g'ri | p50 {percentile(timings, 0.5):.0f} ms, p99 {percentile(timings, 0.99):.0f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--gpt", action="store_true", help="GPT yo'lini ham o'lchash (tarmoq)")
+    args = parser.parse_args()
+
+    bench_rules(args.repeat)
+    if args.gpt:
+        asyncio.run(bench_gpt())
+
+
+if __name__ == "__main__":
+    main()
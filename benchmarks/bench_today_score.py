@@ -0,0 +1,92 @@
+"""Bugungi ball query'si: eski func.date(created_at) filtri va yarim ochiq UTC oralig'i.
+
+Ilova bugungi ballni user_daily_stats dan o'qiydi; bu benchmark score_logs
+(user_id, created_at) indeksi bo'yicha xom query uchun.
+
+Bitta userning 1 yillik tarixi (+ boshqa userlar shovqini) "bench_score" sxemasida yaratiladi.
+
+    BENCH_DATABASE_URL=postgresql+asyncpg://... python -m benchmarks.bench_today_score --per-day 20 --noise 1000000
+"""
+import argparse
+import asyncio
+import os
+import time
+from datetime import date
+
+from sqlalchemy import select, func, and_, text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from bot.config import DATABASE_URL
+from database.db import Base
+from bot.models import user, plan, score_log, admin  # noqa
+from bot.models.score_log import ScoreLog
+from bot.utils.timeutils import tashkent_today, tashkent_day_bounds
+
+SCHEMA = "bench_score"
+REPEAT = 50
+
+SEED_SQL = """
+INSERT INTO score_logs (user_id, score_change, reason, created_at)
+SELECT
+    CASE WHEN g <= :history THEN 1 ELSE 2 + g % 1000 END,
+    CASE WHEN g % 4 = 0 THEN -3 ELSE 5 END,
+    'bench',
+    (now() AT TIME ZONE 'UTC') - ((g % 365) || ' days')::interval - ((g % 1440) || ' minutes')::interval
+FROM generate_series(1, :total) AS g
+"""
+
+
+async def timed(conn, query) -> float:
+    timings = []
+    for _ in range(REPEAT):
+        started = time.perf_counter()
+        await conn.execute(query)
+        timings.append(time.perf_counter() - started)
+    timings.sort()
+    return timings[len(timings) // 2] * 1000
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--per-day", type=int, default=20, help="userning kunlik score_log soni")
+    parser.add_argument("--noise", type=int, default=1_000_000, help="boshqa userlarning qatorlari")
+    args = parser.parse_args()
+
+    url = os.getenv("BENCH_DATABASE_URL", DATABASE_URL)
+    engine = create_async_engine(url, connect_args={"server_settings": {"search_path": SCHEMA}})
+    history = args.per_day * 365
+
+    async with engine.begin() as conn:
+        await conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+        await conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(text(
+            "INSERT INTO users (id, telegram_id, streak, total_score) "
+            "SELECT g, g, 0, 0 FROM generate_series(1, 1001) AS g"
+        ))
+        await conn.execute(text(SEED_SQL), {"history": history, "total": history + args.noise})
+        await conn.execute(text("ANALYZE score_logs"))
+
+    old_query = select(func.sum(ScoreLog.score_change)).where(
+        and_(ScoreLog.user_id == 1, func.date(ScoreLog.created_at) == date.today())
+    )
+    start, end = tashkent_day_bounds(tashkent_today())
+    new_query = select(func.sum(ScoreLog.score_change)).where(
+        and_(ScoreLog.user_id == 1, ScoreLog.created_at >= start, ScoreLog.created_at < end)
+    )
+
+    async with engine.connect() as conn:
+        old_ms = await timed(conn, old_query)
+        new_ms = await timed(conn, new_query)
+
+    async with engine.begin() as conn:
+        await conn.execute(text(f"DROP SCHEMA {SCHEMA} CASCADE"))
+    await engine.dispose()
+
+    print(f"User tarixi: {history:,} qator, jami: {history + args.noise:,}")
+    print(f"func.date(created_at) = today : {old_ms:8.3f} ms")
+    print(f"Tashkent kuni, UTC oralig'i   : {new_ms:8.3f} ms")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
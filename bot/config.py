@@ -1,5 +1,6 @@
 from dotenv import load_dotenv
 import os
+import socket
 import pytz
 
 load_dotenv()
@@ -17,6 +18,20 @@ DATABASE_URL = f"postgresql+asyncpg://{DB_USER}:{DB_PASS}@{DB_HOST}:{DB_PORT}/{D
 
 ADMIN_ID = int(os.getenv("ADMIN_ID", 0))
 
+# FSM storage: "postgres" (replikalar o'rtasida umumiy) yoki "memory"
+FSM_STORAGE = os.getenv("FSM_STORAGE", "postgres")
+FSM_STATE_TTL_HOURS = int(os.getenv("FSM_STATE_TTL_HOURS", 24))
+
+# Update qabul qilish: "polling" yoki "webhook"
+BOT_MODE = os.getenv("BOT_MODE", "polling")
+WEBHOOK_URL = os.getenv("WEBHOOK_URL")                  # masalan https://bot.example.com
+WEBHOOK_PATH = os.getenv("WEBHOOK_PATH", "/webhook")
+WEBHOOK_SECRET = os.getenv("WEBHOOK_SECRET")            # Webhook rejimida majburiy
+WEBHOOK_HOST = os.getenv("WEBHOOK_HOST", "0.0.0.0")
+WEBHOOK_PORT = int(os.getenv("PORT", os.getenv("WEBHOOK_PORT", 8080)))
+WEBHOOK_QUEUE_SIZE = int(os.getenv("WEBHOOK_QUEUE_SIZE", 1000))
+WEBHOOK_WORKERS = int(os.getenv("WEBHOOK_WORKERS", 16))
+
 # O'zbekiston vaqti
 TIMEZONE = pytz.timezone("Asia/Tashkent")
 
@@ -29,6 +44,50 @@ STREAK_BONUS = 2
 SUMMARY_HOUR = 23
 SUMMARY_MINUTE = 59
 
+# Eslatmalar navbatini DB bilan solishtirish oralig'i (daqiqa)
+REMINDER_RECONCILE_MINUTES = 10
+# Uzoq to'xtab qolgandan keyin catch-up faqat shuncha daqiqa orqaga qaraydi (eski eslatmalar yuborilmaydi)
+REMINDER_CATCHUP_MAX_MINUTES = int(os.getenv("REMINDER_CATCHUP_MAX_MINUTES", 60))
+
 # Pending check vaqti (Tashkent vaqti)
 PENDING_CHECK_HOUR = 23
-PENDING_CHECK_MINUTE = 0
\ No newline at end of file
+PENDING_CHECK_MINUTE = 0
+
+# Replikalar: scheduler faqat liderda ishlaydi (Postgres advisory lock)
+NODE_ID = os.getenv("NODE_ID", f"{socket.gethostname()}:{os.getpid()}")
+LEADER_LOCK_KEY = 720_001
+LEADER_RENEW_SECONDS = 5
+
+# "leader" — hamma joblar bitta liderda; "sharded" — eslatmalar, summary va
+# pending check user_id % workerlar_soni bo'yicha hamma workerlar o'rtasida bo'linadi
+SCHEDULER_MODE = os.getenv("SCHEDULER_MODE", "leader")
+SHARD_HEARTBEAT_SECONDS = 5
+SHARD_TTL_SECONDS = 15
+
+# User identity cache (telegram_id → users qatori), har bir replikada
+USER_CACHE_SIZE = int(os.getenv("USER_CACHE_SIZE", 50_000))
+USER_CACHE_TTL = 60
+
+# Lokal reja tahlili — ishonch shundan past bo'lsa GPT ga yuboriladi (1.0 = faqat aniq holatlar)
+PLAN_EXTRACT_CONFIDENCE = float(os.getenv("PLAN_EXTRACT_CONFIDENCE", 0.9))
+
+# GPT reja tahlili cache: "postgres" (xotira + umumiy jadval) yoki "memory"
+EXTRACT_CACHE_STORAGE = os.getenv("EXTRACT_CACHE_STORAGE", "postgres")
+EXTRACT_CACHE_SIZE = int(os.getenv("EXTRACT_CACHE_SIZE", 5000))
+EXTRACT_CACHE_TTL_HOURS = int(os.getenv("EXTRACT_CACHE_TTL_HOURS", 24 * 7))
+
+# Whisper natijalari cache (file_unique_id → matn), saqlash EXTRACT_CACHE_STORAGE bilan bir xil
+TRANSCRIPT_CACHE_SIZE = int(os.getenv("TRANSCRIPT_CACHE_SIZE", 2000))
+TRANSCRIPT_CACHE_TTL_HOURS = int(os.getenv("TRANSCRIPT_CACHE_TTL_HOURS", 24 * 30))
+
+# Telegram yuborish limitlari
+SEND_CONCURRENCY = int(os.getenv("SEND_CONCURRENCY", 25))
+SEND_GLOBAL_RATE = 30      # ~30 xabar/sekund umumiy
+SEND_PER_CHAT_RATE = 1     # ~1 xabar/sekund bitta chatga
+SEND_MAX_RETRIES = 3
+
+
+# Broadcast
+BROADCAST_BATCH_SIZE = 500
+BROADCAST_PROGRESS_SECONDS = 5   # Admin progress xabarini yangilash oralig'i
+BROADCAST_LEASE_SECONDS = 60     # Egasi shuncha vaqt yangilamasa — boshqa replika davom ettiradi
@@ -6,7 +6,7 @@ from aiogram.fsm.state import State, StatesGroup
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from bot.services.admin_service import (
-    is_admin, get_all_users, get_users_count,
+    is_admin, get_users_page, get_users_count,
     get_all_admins, add_admin, remove_admin,
     get_user_plan_stats, get_user_status
 )
@@ -135,6 +135,25 @@ async def admin_users_count(callback: CallbackQuery, session: AsyncSession):
     if stats["top_users"]:
         text += f"━━━━━━━━━━━━━━━\n🏅 <b>Top userlar:</b>\n{top_text}"
 
+    from bot.services.user_service import user_cache_stats
+    from bot.services.ai_service import extract_stats
+    from bot.services.extraction_cache import extraction_cache_stats
+    from bot.services.transcript_cache import transcript_cache_stats
+    cache = user_cache_stats()
+    extract = extract_stats()
+    extraction_cache = extraction_cache_stats()
+    transcript_cache = transcript_cache_stats()
+    text += (
+        f"\n🗄 User cache: <b>{cache['hit_rate']:.0%}</b> hit "
+        f"({cache['size']}/{cache['maxsize']})"
+        f"\n⚡ GPT siz tahlil: <b>{extract['hit_rate']:.0%}</b> "
+        f"({extract['local']} lokal / {extract['cache']} cache / {extract['gpt']} GPT)"
+        f"\n🧠 Tahlil cache: <b>{extraction_cache['hit_rate']:.0%}</b> hit "
+        f"({extraction_cache['size']}/{extraction_cache['maxsize']})"
+        f"\n🎙 Ovoz cache: <b>{transcript_cache['hit_rate']:.0%}</b> hit "
+        f"({transcript_cache['size']}/{transcript_cache['maxsize']})"
+    )
+
     await callback.message.edit_text(
         text,
         parse_mode="HTML",
@@ -149,7 +168,7 @@ async def admin_users_list(callback: CallbackQuery, session: AsyncSession):
         await callback.answer("❌ Ruxsat yo'q!", show_alert=True)
         return
 
-    users = await get_all_users(session)
+    users, has_prev, has_next = await get_users_page(session)
 
     if not users:
         await callback.message.edit_text(
@@ -158,23 +177,32 @@ async def admin_users_list(callback: CallbackQuery, session: AsyncSession):
         )
         return
 
+    count = await get_users_count(session)
     await callback.message.edit_text(
-        f"👥 <b>Barcha userlar</b> ({len(users)} ta)\n\nUserni tanlang:",
+        f"👥 <b>Barcha userlar</b> ({count} ta)\n\nUserni tanlang:",
         parse_mode="HTML",
-        reply_markup=admin_users_list_keyboard(users, page=0)
+        reply_markup=admin_users_list_keyboard(users, has_prev, has_next)
     )
     await callback.answer()
 
 
 @router.callback_query(F.data.startswith("admin_users_page_"))
 async def admin_users_page(callback: CallbackQuery, session: AsyncSession):
-    page = int(callback.data.split("_")[-1])
-    users = await get_all_users(session)
+    if not await is_admin(session, callback.from_user.id):
+        await callback.answer("❌ Ruxsat yo'q!", show_alert=True)
+        return
+
+    # admin_users_page_{n|p}_{created_at}_{id}
+    direction, cursor = callback.data[len("admin_users_page_"):].split("_", 1)
+    users, has_prev, has_next = await get_users_page(
+        session, cursor=cursor, direction="prev" if direction == "p" else "next"
+    )
+    count = await get_users_count(session)
 
     await callback.message.edit_text(
-        f"👥 <b>Barcha userlar</b> ({len(users)} ta)\n\nUserni tanlang:",
+        f"👥 <b>Barcha userlar</b> ({count} ta)\n\nUserni tanlang:",
         parse_mode="HTML",
-        reply_markup=admin_users_list_keyboard(users, page=page)
+        reply_markup=admin_users_list_keyboard(users, has_prev, has_next)
     )
     await callback.answer()
 
@@ -539,30 +567,57 @@ async def broadcast_send_confirmed(callback: CallbackQuery, state: FSMContext, s
                 reply_markup=back_to_admin_keyboard()
             )
     else:
-        # Barcha userlarga
-        users = await get_all_users(session)
-        sent = 0
-        failed = 0
-
-        await callback.message.edit_text("⏳ Yuborilmoqda...")
-
-        for user in users:
-            try:
-                await callback.bot.send_message(
-                    chat_id=user.telegram_id,
-                    text=final_text,
-                    parse_mode="HTML"
-                )
-                sent += 1
-            except Exception:
-                failed += 1
-
+        # Barcha userlarga — fon worker orqali, progress shu xabarda ko'rinadi
+        from bot.services.broadcast_service import create_broadcast, start_broadcast
+        from bot.keyboards.admin_keys import broadcast_progress_keyboard
+        from bot.utils.formatters import format_broadcast_progress
+
+        broadcast = await create_broadcast(
+            session,
+            admin_chat_id=callback.message.chat.id,
+            progress_message_id=callback.message.message_id,
+            text=broadcast_text,
+        )
         await callback.message.edit_text(
-            f"✅ <b>Xabar yuborildi!</b>\n\n"
-            f"✅ Muvaffaqiyatli: <b>{sent} ta</b>\n"
-            f"❌ Yuborilmadi: <b>{failed} ta</b>",
+            format_broadcast_progress(broadcast),
             parse_mode="HTML",
-            reply_markup=back_to_admin_keyboard()
+            reply_markup=broadcast_progress_keyboard(broadcast.id, broadcast.status)
         )
+        start_broadcast(callback.bot, broadcast.id)
+
+    await callback.answer()
+
 
-    await callback.answer()
\ No newline at end of file
+# Broadcast boshqaruvi — pauza / davom ettirish / bekor qilish
+@router.callback_query(F.data.regexp(r"^bc_(pause|resume|cancel)_\d+$"))
+async def broadcast_control(callback: CallbackQuery, session: AsyncSession):
+    if not await is_admin(session, callback.from_user.id):
+        await callback.answer("❌ Ruxsat yo'q!", show_alert=True)
+        return
+
+    from bot.models.broadcast import BroadcastStatus
+    from bot.services.broadcast_service import get_broadcast, set_broadcast_status, start_broadcast
+    from bot.keyboards.admin_keys import broadcast_progress_keyboard
+    from bot.utils.formatters import format_broadcast_progress
+
+    _, action, broadcast_id = callback.data.split("_")
+    broadcast = await get_broadcast(session, int(broadcast_id))
+
+    if not broadcast or broadcast.status in (BroadcastStatus.done, BroadcastStatus.cancelled):
+        await callback.answer("Broadcast allaqachon tugagan.", show_alert=True)
+        return
+
+    if action == "pause":
+        await set_broadcast_status(session, broadcast, BroadcastStatus.paused)
+    elif action == "resume":
+        await set_broadcast_status(session, broadcast, BroadcastStatus.running)
+        start_broadcast(callback.bot, broadcast.id)
+    else:
+        await set_broadcast_status(session, broadcast, BroadcastStatus.cancelled)
+
+    await callback.message.edit_text(
+        format_broadcast_progress(broadcast),
+        parse_mode="HTML",
+        reply_markup=broadcast_progress_keyboard(broadcast.id, broadcast.status)
+    )
+    await callback.answer()
@@ -1,13 +1,17 @@
+from datetime import date, datetime
+
 from aiogram import Router, F
 from aiogram.types import CallbackQuery, InlineKeyboardMarkup, InlineKeyboardButton
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from bot.services.user_service import get_user_by_telegram_id
 from bot.services.plan_service import (
-    get_plan_by_id, move_plan_to_tomorrow, duplicate_plan_for_tomorrow
+    get_plan_by_id, get_pending_plans_on, move_plan_to_tomorrow, duplicate_plan_for_tomorrow
 )
-from bot.services.score_service import process_plan_result
-from bot.keyboards.plan_keys import back_to_home_keyboard
+from bot.models.plan import PlanStatus
+from bot.services.score_service import process_plan_result, process_all_pending
+from bot.keyboards.plan_keys import back_to_home_keyboard, pending_check_keyboard
+from bot.utils.formatters import format_pending_check
 
 router = Router()
 
@@ -111,4 +115,81 @@ async def continue_handler(callback: CallbackQuery, session: AsyncSession):
         parse_mode="HTML",
         reply_markup=back_to_home_keyboard()
     )
-    await callback.answer("Ertaga ham qo'shildi! 🔁")
\ No newline at end of file
+    await callback.answer("Ertaga ham qo'shildi! 🔁")
+
+
+# ─────────────────────────────────────────
+#  KUN OXIRIDAGI TEKSHIRUV (bitta xabar)
+# ─────────────────────────────────────────
+
+def parse_check_date(raw: str) -> date:
+    return datetime.strptime(raw, "%Y%m%d").date()
+
+
+async def refresh_pending_check(callback: CallbackQuery, session: AsyncSession, user, check_date: date):
+    """Tekshiruv kunidagi qolgan pending rejalar bilan xabarni yangilaydi"""
+    plans = await get_pending_plans_on(session, user, check_date)
+
+    if plans:
+        await callback.message.edit_text(
+            format_pending_check(plans),
+            parse_mode="HTML",
+            reply_markup=pending_check_keyboard(plans, check_date)
+        )
+    else:
+        await callback.message.edit_text(
+            f"🌙 <b>Kun yakunlandi!</b>\n\n"
+            f"🏆 Umumiy ball: <b>{user.total_score}</b>\n"
+            f"🔥 Streak: <b>{user.streak} kun</b>",
+            parse_mode="HTML",
+            reply_markup=back_to_home_keyboard()
+        )
+
+
+@router.callback_query(F.data.regexp(r"^p(done|fail|tom)_\d+_\d{8}$"))
+async def pending_check_action(callback: CallbackQuery, session: AsyncSession):
+    action, plan_id, day = callback.data.split("_")
+    check_date = parse_check_date(day)
+
+    user = await get_user_by_telegram_id(session, callback.from_user.id)
+    if not user:
+        await callback.answer("Iltimos /start bosing.", show_alert=True)
+        return
+
+    plan = await get_plan_by_id(session, int(plan_id))
+    if not plan or plan.user_id != user.id:
+        await callback.answer("Reja topilmadi!", show_alert=True)
+        return
+    if plan.plan_date != check_date:
+        # Allaqachon boshqa kunga ko'chirilgan — bu tekshiruvga tegishli emas
+        await callback.answer("Reja boshqa kunga ko'chirilgan", show_alert=True)
+        await refresh_pending_check(callback, session, user, check_date)
+        return
+
+    if action == "ptom":
+        if plan.status == PlanStatus.pending:
+            await move_plan_to_tomorrow(session, plan)
+        await callback.answer("Ertaga ko'chirildi! 📅")
+    else:
+        score = await process_plan_result(session, user, plan, is_done=action == "pdone")
+        await callback.answer(f"{score:+d} ball" if score else "Allaqachon belgilangan")
+
+    await refresh_pending_check(callback, session, user, check_date)
+
+
+@router.callback_query(F.data.regexp(r"^all_(done|failed)_\d{8}$"))
+async def pending_check_all(callback: CallbackQuery, session: AsyncSession):
+    _, action, day = callback.data.split("_")
+    check_date = parse_check_date(day)
+
+    user = await get_user_by_telegram_id(session, callback.from_user.id)
+    if not user:
+        await callback.answer("Iltimos /start bosing.", show_alert=True)
+        return
+
+    # Faqat tekshiruv kunidagi rejalar — yarim tundan keyin bosilsa ham yangi kun tegilmaydi
+    plans = await get_pending_plans_on(session, user, check_date)
+    score = await process_all_pending(session, user, plans, is_done=action == "done")
+
+    await callback.answer(f"{len(plans)} ta reja belgilandi: {score:+d} ball")
+    await refresh_pending_check(callback, session, user, check_date)
\ No newline at end of file
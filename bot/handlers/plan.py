@@ -4,9 +4,11 @@ from aiogram.fsm.context import FSMContext
 from aiogram.fsm.state import State, StatesGroup
 from sqlalchemy.ext.asyncio import AsyncSession
 import logging
+from io import BytesIO
 
 from bot.services.user_service import get_user_by_telegram_id
 from bot.services.ai_service import transcribe_voice, extract_plans_from_text
+from bot.services.transcript_cache import get_cached_transcript, cache_transcript
 from bot.services.plan_service import create_plans, get_today_plans, get_plan_by_id, delete_plan
 from bot.keyboards.plan_keys import (
     confirm_plans_keyboard, plans_list_keyboard,
@@ -146,6 +148,22 @@ async def add_plan_callback(callback: CallbackQuery, state: FSMContext):
 #  OVOZ — istalgan vaqt
 # ─────────────────────────────────────────
 
+async def transcribe_message_voice(message: Message) -> str:
+    """Ovoz → matn: avval file_unique_id bo'yicha cache, keyin xotiraga yuklab Whisper"""
+    voice = message.voice
+    text = await get_cached_transcript(voice.file_unique_id)
+    if text is not None:
+        logger.info(f"🗄 Transcript cache: {voice.file_unique_id}")
+        return text
+
+    audio = BytesIO()
+    await message.bot.download(voice, destination=audio)
+    text = await transcribe_voice(audio)
+    if text:
+        await cache_transcript(voice.file_unique_id, text)
+    return text
+
+
 @router.message(F.voice)
 async def handle_voice_any(message: Message, state: FSMContext, session: AsyncSession):
     current_state = await state.get_state()
@@ -158,11 +176,7 @@ async def handle_voice_any(message: Message, state: FSMContext, session: AsyncSe
     processing_msg = await message.answer("⏳ Tahlil qilinmoqda...")
 
     try:
-        file = await message.bot.get_file(message.voice.file_id)
-        file_bytes = await message.bot.download_file(file.file_path)
-        audio_data = file_bytes.read()
-
-        text = await transcribe_voice(audio_data)
+        text = await transcribe_message_voice(message)
         logger.info(f"🎤 Transcribed: '{text}'")
 
         if not text:
@@ -199,11 +213,7 @@ async def handle_voice_for_time(message: Message, state: FSMContext):
     """Vaqt so'raganda ovoz kelsa"""
     processing_msg = await message.answer("⏳ Vaqt aniqlanmoqda...")
     try:
-        file = await message.bot.get_file(message.voice.file_id)
-        file_bytes = await message.bot.download_file(file.file_path)
-        audio_data = file_bytes.read()
-
-        text = await transcribe_voice(audio_data)
+        text = await transcribe_message_voice(message)
         await processing_msg.delete()
         await process_time_input(message, state, text)
     except Exception:
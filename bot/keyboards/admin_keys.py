@@ -1,5 +1,7 @@
 from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
 
+from bot.models.broadcast import BroadcastStatus
+
 
 def admin_main_keyboard() -> InlineKeyboardMarkup:
     return InlineKeyboardMarkup(inline_keyboard=[
@@ -28,14 +30,13 @@ def admin_users_keyboard() -> InlineKeyboardMarkup:
     ])
 
 
-def admin_users_list_keyboard(users: list, page: int = 0, per_page: int = 8) -> InlineKeyboardMarkup:
-    """Userlar listini pagination bilan ko'rsatadi"""
+def admin_users_list_keyboard(users: list, has_prev: bool = False, has_next: bool = False) -> InlineKeyboardMarkup:
+    """Userlar sahifasi — keyset pagination bilan"""
+    from bot.services.admin_service import encode_user_cursor
+
     buttons = []
-    start = page * per_page
-    end = start + per_page
-    page_users = users[start:end]
 
-    for user in page_users:
+    for user in users:
         name = user.full_name or "Noma'lum"
         buttons.append([
             InlineKeyboardButton(
@@ -46,10 +47,14 @@ def admin_users_list_keyboard(users: list, page: int = 0, per_page: int = 8) ->
 
     # Pagination
     nav = []
-    if page > 0:
-        nav.append(InlineKeyboardButton(text="⬅️", callback_data=f"admin_users_page_{page - 1}"))
-    if end < len(users):
-        nav.append(InlineKeyboardButton(text="➡️", callback_data=f"admin_users_page_{page + 1}"))
+    if has_prev and users:
+        nav.append(InlineKeyboardButton(
+            text="⬅️", callback_data=f"admin_users_page_p_{encode_user_cursor(users[0])}"
+        ))
+    if has_next and users:
+        nav.append(InlineKeyboardButton(
+            text="➡️", callback_data=f"admin_users_page_n_{encode_user_cursor(users[-1])}"
+        ))
     if nav:
         buttons.append(nav)
 
@@ -81,4 +86,23 @@ def back_to_admin_keyboard() -> InlineKeyboardMarkup:
 def back_to_users_keyboard() -> InlineKeyboardMarkup:
     return InlineKeyboardMarkup(inline_keyboard=[
         [InlineKeyboardButton(text="🔙 Orqaga", callback_data="admin_users_list")]
-    ])
\ No newline at end of file
+    ])
+
+
+def broadcast_progress_keyboard(broadcast_id: int, status: BroadcastStatus) -> InlineKeyboardMarkup:
+    """Broadcast progress xabaridagi boshqaruv tugmalari"""
+    if status == BroadcastStatus.running:
+        return InlineKeyboardMarkup(inline_keyboard=[
+            [
+                InlineKeyboardButton(text="⏸ Pauza", callback_data=f"bc_pause_{broadcast_id}"),
+                InlineKeyboardButton(text="⛔ Bekor qilish", callback_data=f"bc_cancel_{broadcast_id}"),
+            ]
+        ])
+    if status == BroadcastStatus.paused:
+        return InlineKeyboardMarkup(inline_keyboard=[
+            [
+                InlineKeyboardButton(text="▶️ Davom ettirish", callback_data=f"bc_resume_{broadcast_id}"),
+                InlineKeyboardButton(text="⛔ Bekor qilish", callback_data=f"bc_cancel_{broadcast_id}"),
+            ]
+        ])
+    return back_to_admin_keyboard()
\ No newline at end of file
@@ -1,3 +1,5 @@
+from datetime import date
+
 from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
 
 
@@ -76,4 +78,27 @@ def done_failed_keyboard(plan_id: int) -> InlineKeyboardMarkup:
             InlineKeyboardButton(text="✅ Bajardim +5⭐", callback_data=f"done_{plan_id}"),
             InlineKeyboardButton(text="❌ Bajara olmadim -3⭐", callback_data=f"failed_{plan_id}"),
         ]
-    ])
\ No newline at end of file
+    ])
+
+
+def pending_check_keyboard(plans: list, check_date: date) -> InlineKeyboardMarkup:
+    """Kun oxiridagi tekshiruv — har bir reja uchun ixcham tugmalar + hammasini belgilash.
+
+    Tekshiruv sanasi callback_data da — yarim tundan keyin bosilsa ham o'sha kun belgilanadi.
+    """
+    day = check_date.strftime("%Y%m%d")
+    buttons = []
+
+    # Telegram bitta xabarda 100 tadan ko'p tugma qabul qilmaydi
+    for i, plan in enumerate(plans[:30], 1):
+        buttons.append([
+            InlineKeyboardButton(text=f"{i}. ✅", callback_data=f"pdone_{plan.id}_{day}"),
+            InlineKeyboardButton(text=f"{i}. ❌", callback_data=f"pfail_{plan.id}_{day}"),
+            InlineKeyboardButton(text=f"{i}. 📅", callback_data=f"ptom_{plan.id}_{day}"),
+        ])
+
+    buttons.append([
+        InlineKeyboardButton(text="✅ Hammasini bajardim", callback_data=f"all_done_{day}"),
+        InlineKeyboardButton(text="❌ Hammasini bajarmadim", callback_data=f"all_failed_{day}"),
+    ])
+    return InlineKeyboardMarkup(inline_keyboard=buttons)
\ No newline at end of file
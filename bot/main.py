@@ -5,10 +5,10 @@ from aiogram import Bot, Dispatcher
 from aiogram.fsm.storage.memory import MemoryStorage
 from aiogram.types import BotCommand
 
-from bot.config import BOT_TOKEN
+from bot.config import BOT_TOKEN, BOT_MODE, FSM_STORAGE, FSM_STATE_TTL_HOURS
 from bot.handlers import start, plan, callback, report, admin, status
 from bot.services.scheduler import start_scheduler
-from database.db import create_tables
+from database.db import check_schema
 
 logging.basicConfig(
     level=logging.INFO,
@@ -25,21 +25,43 @@ async def set_commands(bot: Bot):
     await bot.set_my_commands(commands)
 
 
+def create_storage():
+    """FSM storage — postgres bo'lsa holatlar restart va replikalar orasida saqlanadi"""
+    if FSM_STORAGE == "memory":
+        return MemoryStorage()
+
+    from datetime import timedelta
+    from database.db import AsyncSessionLocal
+    from database.fsm_storage import PostgresStorage
+    return PostgresStorage(AsyncSessionLocal, ttl=timedelta(hours=FSM_STATE_TTL_HOURS))
+
+
 async def main():
-    # DB jadvallarini yaratish
-    await create_tables()
+    # Jadvallar alembic migratsiyalari bilan yaratiladi (Procfile: release)
+    await check_schema()
     logger.info("✅ Database tayyor")
 
     bot = Bot(token=BOT_TOKEN)
-    dp = Dispatcher(storage=MemoryStorage())
+    storage = create_storage()
+    dp = Dispatcher(storage=storage)
 
     # Middleware — session
     from database.db import AsyncSessionLocal
     from aiogram import BaseMiddleware
     from typing import Callable, Dict, Any, Awaitable
     from aiogram.types import TelegramObject
+    from aiogram.exceptions import TelegramAPIError
 
     class DbSessionMiddleware(BaseMiddleware):
+        """Har bir update — bitta unit of work.
+
+        AsyncSession pooldan ulanishni faqat birinchi query da oladi, shuning
+        uchun DBga tegmaydigan handlerlar ulanish ham, pre-ping ham sarflamaydi.
+        Servislar commit qilmaydi: handler muvaffaqiyatli tugasa bitta commit,
+        xato bo'lsa — rollback. Telegram xatosi (masalan "message is not
+        modified") DB yozuvlaridan keyin keladi — user amali saqlanadi.
+        """
+
         async def __call__(
             self,
             handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
@@ -48,7 +70,21 @@ async def main():
         ) -> Any:
             async with AsyncSessionLocal() as session:
                 data["session"] = session
-                return await handler(event, data)
+                try:
+                    result = await handler(event, data)
+                    if session.in_transaction():
+                        await session.commit()
+                except TelegramAPIError as e:
+                    if session.in_transaction():
+                        await session.commit()
+                    logger.warning(f"⚠️ Telegram xatosi (DB o'zgarishlari saqlandi): {type(e).__name__}: {e}")
+                    return None
+                except Exception:
+                    await session.rollback()
+                    raise
+                finally:
+                    logger.debug(f"Pool checkouts: {session.sync_session.info.get('checkouts', 0)}")
+            return result
 
     dp.message.middleware(DbSessionMiddleware())
     dp.callback_query.middleware(DbSessionMiddleware())
@@ -63,14 +99,26 @@ async def main():
     # Buyruqlarni sozlash
     await set_commands(bot)
 
+    # Admin, user va status cache lari — boshqa replikalardagi o'zgarishlarni tinglash
+    from bot.services.admin_service import listen_admin_changes
+    from bot.services.user_service import listen_user_changes
+    from bot.services.status_service import listen_status_changes
+    listen_admin_changes()
+    listen_user_changes()
+    listen_status_changes()
+
     # Schedulerni ishga tushirish
-    start_scheduler(bot)
+    start_scheduler(bot, storage)
     logger.info("✅ Scheduler ishga tushdi")
 
     logger.info("🚀 Intizom AI bot ishga tushdi!")
 
     try:
-        await dp.start_polling(bot, allowed_updates=dp.resolve_used_update_types())
+        if BOT_MODE == "webhook":
+            from bot.webhook import run_webhook
+            await run_webhook(bot, dp)
+        else:
+            await dp.start_polling(bot, allowed_updates=dp.resolve_used_update_types())
     finally:
         await bot.session.close()
 
@@ -2,5 +2,16 @@ from .user import User
 from .plan import Plan, PlanStatus
 from .score_log import ScoreLog
 from .admin import Admin
+from .scheduler_state import SchedulerState
+from .broadcast import Broadcast, BroadcastStatus, BroadcastDelivery
+from .user_daily_stats import UserDailyStats
+from .fsm_state import FsmState
+from .job_run import JobRun
+from .worker_heartbeat import WorkerHeartbeat
+from .plan_extraction import PlanExtraction
+from .voice_transcript import VoiceTranscript
 
-__all__ = ["User", "Plan", "PlanStatus", "ScoreLog", "Admin"]
\ No newline at end of file
+__all__ = ["User", "Plan", "PlanStatus", "ScoreLog", "Admin", "SchedulerState",
+           "Broadcast", "BroadcastStatus", "BroadcastDelivery", "UserDailyStats",
+           "FsmState", "JobRun", "WorkerHeartbeat", "PlanExtraction",
+           "VoiceTranscript"]
\ No newline at end of file
@@ -0,0 +1,40 @@
+from sqlalchemy import Column, Integer, BigInteger, String, DateTime, ForeignKey, Enum, Text
+from datetime import datetime
+import enum
+from database.db import Base
+
+
+class BroadcastStatus(enum.Enum):
+    running = "running"
+    paused = "paused"
+    cancelled = "cancelled"
+    done = "done"
+
+
+class Broadcast(Base):
+    __tablename__ = "broadcasts"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    text = Column(Text, nullable=False)
+    admin_chat_id = Column(BigInteger, nullable=False)
+    progress_message_id = Column(Integer, nullable=True)   # Admin ko'radigan progress xabari
+    status = Column(Enum(BroadcastStatus), default=BroadcastStatus.running)
+    last_user_id = Column(Integer, default=0)              # Qayerga yetib kelgani (users.id bo'yicha)
+    owner = Column(String(128), nullable=True)              # Ishlayotgan worker (NODE_ID)
+    lease_until = Column(DateTime, nullable=True)           # Egasi shu vaqtgacha yangilab turadi
+    total = Column(Integer, default=0)
+    sent = Column(Integer, default=0)
+    failed = Column(Integer, default=0)
+    blocked = Column(Integer, default=0)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    finished_at = Column(DateTime, nullable=True)
+
+
+class BroadcastDelivery(Base):
+    """Har bir qabul qiluvchi uchun holat: queued → sent / failed / blocked"""
+    __tablename__ = "broadcast_deliveries"
+
+    broadcast_id = Column(Integer, ForeignKey("broadcasts.id", ondelete="CASCADE"), primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    status = Column(String(16), nullable=False, default="queued")
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
\ No newline at end of file
@@ -0,0 +1,16 @@
+from sqlalchemy import Column, String, Text, DateTime, Index
+from database.db import Base
+
+
+class FsmState(Base):
+    """aiogram FSM holati va ma'lumotlari (bir nechta replika uchun umumiy)"""
+    __tablename__ = "fsm_states"
+
+    key = Column(String(255), primary_key=True)
+    state = Column(String(255), nullable=True)
+    data = Column(Text, nullable=True)           # Ixcham JSON
+    expires_at = Column(DateTime, nullable=False)
+
+    __table_args__ = (
+        Index("ix_fsm_states_expires_at", "expires_at"),
+    )
@@ -0,0 +1,20 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime, Index
+from datetime import datetime
+from database.db import Base
+
+
+class JobRun(Base):
+    """Scheduler joblarining qaysi node da qachon ishlagani"""
+    __tablename__ = "job_runs"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    job_id = Column(String(64), nullable=False)
+    node_id = Column(String(128), nullable=False)
+    status = Column(String(16), nullable=False, default="running")   # running / ok / error
+    error = Column(Text, nullable=True)
+    started_at = Column(DateTime, default=datetime.utcnow)
+    finished_at = Column(DateTime, nullable=True)
+
+    __table_args__ = (
+        Index("ix_job_runs_job_id_started_at", "job_id", "started_at"),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Enum, Date
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Enum, Date, Index, text
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import enum
@@ -13,6 +13,18 @@ class PlanStatus(enum.Enum):
 
 class Plan(Base):
     __tablename__ = "plans"
+    __table_args__ = (
+        # Har daqiqalik eslatma query'si uchun (plan_date, scheduled_time, status)
+        Index("ix_plans_date_time_status", "plan_date", "scheduled_time", "status"),
+        # Faqat hali eslatilmagan pending rejalar — kichik partial index
+        Index(
+            "ix_plans_notify_pending",
+            "plan_date", "scheduled_time",
+            postgresql_where=text("status = 'pending' AND notified_at IS NULL"),
+        ),
+        # User bo'yicha so'rovlar (bugungi rejalar, "rejasi bor" userlar) uchun
+        Index("ix_plans_user_id_plan_date", "user_id", "plan_date"),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
@@ -0,0 +1,15 @@
+from sqlalchemy import Column, String, Text, DateTime, Index
+from database.db import Base
+
+
+class PlanExtraction(Base):
+    """GPT reja tahlili natijasi — normallashtirilgan matn bo'yicha cache (replikalar uchun umumiy)"""
+    __tablename__ = "plan_extractions"
+
+    key = Column(String(64), primary_key=True)   # sha256(normalize(matn))
+    plans = Column(Text, nullable=False)          # Ixcham JSON, nisbiy vaqtlar offset sifatida
+    expires_at = Column(DateTime, nullable=False)
+
+    __table_args__ = (
+        Index("ix_plan_extractions_expires_at", "expires_at"),
+    )
@@ -0,0 +1,12 @@
+from sqlalchemy import Column, String, DateTime
+from datetime import datetime
+from database.db import Base
+
+
+class SchedulerState(Base):
+    """Scheduler jobs uchun saqlanadigan kichik key/value holat (masalan, watermark)"""
+    __tablename__ = "scheduler_state"
+
+    key = Column(String(64), primary_key=True)
+    value = Column(String(255), nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
\ No newline at end of file
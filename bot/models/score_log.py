@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from database.db import Base
@@ -6,6 +6,12 @@ from database.db import Base
 
 class ScoreLog(Base):
     __tablename__ = "score_logs"
+    __table_args__ = (
+        # Kunlik ball: user_id + created_at oralig'i
+        Index("ix_score_logs_user_id_created_at", "user_id", "created_at"),
+        # Reja o'chirilganda uning loglarini topish / cascade
+        Index("ix_score_logs_plan_id", "plan_id"),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, BigInteger, String, Integer, DateTime, Boolean
+from sqlalchemy import Column, BigInteger, String, Integer, Date, DateTime, Boolean, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from database.db import Base
@@ -6,6 +6,12 @@ from database.db import Base
 
 class User(Base):
     __tablename__ = "users"
+    __table_args__ = (
+        # Admin panelidagi keyset pagination uchun
+        Index("ix_users_created_at_id", "created_at", "id"),
+        # Admin statistikasidagi top userlar uchun
+        Index("ix_users_total_score", "total_score"),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     telegram_id = Column(BigInteger, unique=True, nullable=False)
@@ -13,6 +19,10 @@ class User(Base):
     username = Column(String(255), nullable=True)
     streak = Column(Integer, default=0)
     total_score = Column(Integer, default=0)
+    # Streak oxirgi marta qaysi kun uchun yangilangan — kunlik summary ikki marta hisoblamasin
+    last_streak_date = Column(Date, nullable=True)
+    # Kechki pending tekshiruvi oxirgi marta qaysi kun uchun yuborilgan
+    last_pending_check_date = Column(Date, nullable=True)
     is_active = Column(Boolean, default=True)
     created_at = Column(DateTime, default=datetime.utcnow)
     last_active = Column(DateTime, default=datetime.utcnow)
@@ -0,0 +1,18 @@
+from sqlalchemy import Column, Integer, Date, ForeignKey
+from database.db import Base
+
+
+class UserDailyStats(Base):
+    """User + kun bo'yicha tayyor hisoblangan statistika (plans va score_logs dan rollup)"""
+    __tablename__ = "user_daily_stats"
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    date = Column(Date, primary_key=True)   # Tashkent kuni
+    planned = Column(Integer, nullable=False, default=0)
+    done = Column(Integer, nullable=False, default=0)
+    failed = Column(Integer, nullable=False, default=0)
+    score_delta = Column(Integer, nullable=False, default=0)
+
+    @property
+    def pending(self) -> int:
+        return self.planned - self.done - self.failed
\ No newline at end of file
@@ -0,0 +1,15 @@
+from sqlalchemy import Column, String, Text, DateTime, Index
+from database.db import Base
+
+
+class VoiceTranscript(Base):
+    """Whisper natijasi — Telegram file_unique_id bo'yicha (forward/qayta yuborilgan ovozlar uchun)"""
+    __tablename__ = "voice_transcripts"
+
+    file_unique_id = Column(String(64), primary_key=True)
+    text = Column(Text, nullable=False)
+    expires_at = Column(DateTime, nullable=False)
+
+    __table_args__ = (
+        Index("ix_voice_transcripts_expires_at", "expires_at"),
+    )
@@ -0,0 +1,12 @@
+from sqlalchemy import Column, String, DateTime
+from datetime import datetime
+from database.db import Base
+
+
+class WorkerHeartbeat(Base):
+    """Sharded scheduler rejimida tirik workerlar ro'yxati"""
+    __tablename__ = "worker_heartbeats"
+
+    node_id = Column(String(128), primary_key=True)
+    started_at = Column(DateTime, default=datetime.utcnow)
+    last_seen = Column(DateTime, nullable=False)
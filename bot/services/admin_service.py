@@ -1,9 +1,20 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, and_
+from sqlalchemy import select, func, and_, tuple_, case, exists
+from datetime import datetime
 from bot.models.admin import Admin
 from bot.models.user import User
 from bot.models.plan import Plan, PlanStatus
 from bot.config import ADMIN_ID
+from bot.utils.cache import TTLCache
+from database.db import after_commit
+
+# Userlar soni — har bir sahifa uchun COUNT(*) qilmaslik uchun
+_users_count_cache = TTLCache(maxsize=1, ttl=60)
+
+# Adminlar telegram_id lari — har bir admin tugmasida DBga bormaslik uchun.
+# add/remove darhol tozalaydi, boshqa replikalar NOTIFY orqali; TTL — zaxira.
+_admin_ids_cache = TTLCache(maxsize=1, ttl=300)
+ADMINS_CHANNEL = "admins_changed"
 
 
 def get_user_status(total_score: int, streak: int) -> str:
@@ -22,24 +33,97 @@ def get_user_status(total_score: int, streak: int) -> str:
         return "😴 Harakatsiz"
 
 
+def user_status_case():
+    """get_user_status ning SQL varianti (CASE) — shartlar ikkalasida bir xil bo'lishi kerak"""
+    return case(
+        (and_(User.total_score >= 500, User.streak >= 14), "🏆 Ustoz"),
+        (and_(User.total_score >= 300, User.streak >= 7), "💎 Intizomli"),
+        (and_(User.total_score >= 150, User.streak >= 3), "🔥 Focused"),
+        (User.total_score >= 50, "📈 O'sishda"),
+        (User.total_score > 0, "🌱 Yangi boshlovchi"),
+        else_="😴 Harakatsiz",
+    )
+
+
 async def is_admin(session: AsyncSession, telegram_id: int) -> bool:
     """Userning admin ekanligini tekshiradi"""
     if telegram_id == ADMIN_ID:
         return True
-    result = await session.execute(
-        select(Admin).where(Admin.telegram_id == telegram_id)
-    )
-    return result.scalar_one_or_none() is not None
+    admin_ids = _admin_ids_cache.get("ids")
+    if admin_ids is None:
+        result = await session.execute(select(Admin.telegram_id))
+        admin_ids = frozenset(result.scalars().all())
+        _admin_ids_cache.set("ids", admin_ids)
+    return telegram_id in admin_ids
 
 
-async def get_all_users(session: AsyncSession) -> list[User]:
-    result = await session.execute(select(User).order_by(User.created_at.desc()))
-    return result.scalars().all()
+def invalidate_admins():
+    _admin_ids_cache.clear()
+
+
+async def _on_admins_changed(payload: str):
+    invalidate_admins()
+
+
+def listen_admin_changes():
+    """Boshqa replikada admin qo'shilsa/o'chirilsa — bu yerdagi cache ham tozalanadi"""
+    from database.listener import listener
+    listener.on(ADMINS_CHANNEL, _on_admins_changed)
+
+
+async def _admins_changed(session: AsyncSession):
+    # NOTIFY tranzaksiya bilan birga commitda yetkaziladi
+    await session.execute(select(func.pg_notify(ADMINS_CHANNEL, "")))
+    after_commit(session, invalidate_admins)
+
+
+def encode_user_cursor(user: User) -> str:
+    """(created_at, id) → callback_data ga sig'adigan satr"""
+    return f"{user.created_at.strftime('%Y%m%d%H%M%S%f')}_{user.id}"
+
+
+def decode_user_cursor(cursor: str) -> tuple[datetime, int]:
+    created_at, user_id = cursor.split("_")
+    return datetime.strptime(created_at, "%Y%m%d%H%M%S%f"), int(user_id)
+
+
+async def get_users_page(
+    session: AsyncSession, cursor: str | None = None, direction: str = "next", per_page: int = 8
+) -> tuple[list[User], bool, bool]:
+    """Keyset pagination: (created_at, id) bo'yicha yangilari birinchi.
+
+    Faqat per_page + 1 qator o'qiladi — sahifa narxi jadval hajmiga bog'liq emas.
+    cursor: "next" uchun — joriy sahifaning oxirgi useri, "prev" uchun — birinchisi.
+    Qaytaradi: (users, has_prev, has_next)
+    """
+    key = tuple_(User.created_at, User.id)
+    query = select(User)
+
+    if cursor and direction == "prev":
+        query = query.where(key > decode_user_cursor(cursor)).order_by(User.created_at.asc(), User.id.asc())
+    else:
+        if cursor:
+            query = query.where(key < decode_user_cursor(cursor))
+        query = query.order_by(User.created_at.desc(), User.id.desc())
+
+    result = await session.execute(query.limit(per_page + 1))
+    users = list(result.scalars().all())
+    has_more = len(users) > per_page
+    users = users[:per_page]
+
+    if cursor and direction == "prev":
+        users.reverse()
+        return users, has_more, True
+    return users, cursor is not None, has_more
 
 
 async def get_users_count(session: AsyncSession) -> int:
-    result = await session.execute(select(func.count(User.id)))
-    return result.scalar()
+    count = _users_count_cache.get("count")
+    if count is None:
+        result = await session.execute(select(func.count(User.id)))
+        count = result.scalar()
+        _users_count_cache.set("count", count)
+    return count
 
 
 async def get_all_admins(session: AsyncSession) -> list[Admin]:
@@ -53,8 +137,8 @@ async def add_admin(session: AsyncSession, telegram_id: int, full_name: str = "N
         return None
     admin = Admin(telegram_id=telegram_id, full_name=full_name)
     session.add(admin)
-    await session.commit()
-    await session.refresh(admin)
+    await session.flush()
+    await _admins_changed(session)
     return admin
 
 
@@ -64,40 +148,18 @@ async def remove_admin(session: AsyncSession, telegram_id: int) -> bool:
     if not admin:
         return False
     await session.delete(admin)
-    await session.commit()
+    await _admins_changed(session)
     return True
 
 
 async def get_user_plan_stats(session: AsyncSession, user: User) -> dict:
-    """User haqida to'liq statistika"""
-    result = await session.execute(
-        select(Plan).where(Plan.user_id == user.id)
-    )
-    plans = result.scalars().all()
-
-    return {
-        "total_plans": len(plans),
-        "done": len([p for p in plans if p.status == PlanStatus.done]),
-        "failed": len([p for p in plans if p.status == PlanStatus.failed]),
-        "pending": len([p for p in plans if p.status == PlanStatus.pending]),
-    }
-
-
-async def get_detailed_users_stats(session: AsyncSession) -> dict:
-    """Userlar haqida to'liq statistika"""
-    users_result = await session.execute(select(User))
-    users = users_result.scalars().all()
-
-    total = len(users)
+    """User haqida to'liq statistika — user_daily_stats yig'indisi"""
+    from bot.services.stats_service import get_user_totals
+    return await get_user_totals(session, user.id)
 
-    # Active userlar — kamida 1 ta rejasi borlar
-    active_ids_result = await session.execute(
-        select(Plan.user_id).distinct()
-    )
-    active_ids = set(active_ids_result.scalars().all())
-    active = len(active_ids)
-    inactive = total - active
 
+async def get_detailed_users_stats(session: AsyncSession, top_n: int = 3) -> dict:
+    """Userlar haqida to'liq statistika — hisob-kitob SQL tomonida, xotira userlar soniga bog'liq emas"""
     # Statuslarga ko'ra ajratish
     status_counts = {
         "🏆 Ustoz": 0,
@@ -108,13 +170,30 @@ async def get_detailed_users_stats(session: AsyncSession) -> dict:
         "😴 Harakatsiz": 0,
     }
 
-    for user in users:
-        status = get_user_status(user.total_score, user.streak)
-        if status in status_counts:
-            status_counts[status] += 1
+    # CASE subquery ichida — aks holda GROUP BY dagi bind parametrlar SELECT dagisi bilan mos kelmaydi
+    statuses = select(user_status_case().label("status")).subquery()
+    status_result = await session.execute(
+        select(statuses.c.status, func.count()).group_by(statuses.c.status)
+    )
+    for name, count in status_result.all():
+        status_counts[name] = count
+
+    total = sum(status_counts.values())
 
-    # Top 3 user (ball bo'yicha)
-    top_users = sorted(users, key=lambda u: u.total_score, reverse=True)[:3]
+    # Active userlar — kamida 1 ta rejasi borlar
+    active_result = await session.execute(
+        select(func.count(User.id)).where(
+            exists().where(Plan.user_id == User.id)
+        )
+    )
+    active = active_result.scalar() or 0
+    inactive = total - active
+
+    # Top userlar (ball bo'yicha) — ix_users_total_score dan
+    top_result = await session.execute(
+        select(User).order_by(User.total_score.desc()).limit(top_n)
+    )
+    top_users = top_result.scalars().all()
 
     return {
         "total": total,
@@ -1,28 +1,30 @@
 import json
-import os
-import tempfile
+import re
 import logging
 from datetime import datetime, timedelta
+from typing import BinaryIO
 from openai import AsyncOpenAI
-from bot.config import OPENAI_API_KEY, TIMEZONE
+from bot.config import OPENAI_API_KEY, TIMEZONE, PLAN_EXTRACT_CONFIDENCE
+from bot.services.time_parser import parse_time
+from bot.services.plan_extractor import extract_plans_local
+from bot.services.extraction_cache import get_cached_plans, cache_plans
+from bot.utils.translit import has_cyrillic, is_uzbek_cyrillic, to_latin
 
 logger = logging.getLogger(__name__)
 
 client = AsyncOpenAI(api_key=OPENAI_API_KEY)
 
+# Reja tahlili: lokal qoidalar / cache bilan hal bo'lganlar va GPT ga ketganlar
+_extract_stats = {"local": 0, "cache": 0, "gpt": 0}
 
-async def transcribe_voice(file_bytes: bytes) -> str:
-    tmp_path = None
-    try:
-        with tempfile.NamedTemporaryFile(suffix=".ogg", delete=False) as tmp:
-            tmp.write(file_bytes)
-            tmp_path = tmp.name
 
-        with open(tmp_path, "rb") as audio_file:
-            transcript = await client.audio.transcriptions.create(
-                model="whisper-1",
-                file=audio_file,
-            )
+async def transcribe_voice(audio: BinaryIO | bytes, filename: str = "voice.ogg") -> str:
+    """Whisper — audio xotiradan to'g'ridan-to'g'ri yuboriladi (vaqtinchalik fayl yo'q)"""
+    try:
+        transcript = await client.audio.transcriptions.create(
+            model="whisper-1",
+            file=(filename, audio),
+        )
 
         result = transcript.text.strip()
         logger.info(f"✅ Whisper natija: '{result}'")
@@ -32,15 +34,39 @@ async def transcribe_voice(file_bytes: bytes) -> str:
         logger.error(f"❌ Whisper xatosi: {type(e).__name__}: {str(e)}")
         raise e
 
-    finally:
-        if tmp_path and os.path.exists(tmp_path):
-            os.remove(tmp_path)
+
+def extract_stats() -> dict:
+    total = sum(_extract_stats.values())
+    saved = _extract_stats["local"] + _extract_stats["cache"]
+    return {**_extract_stats, "hit_rate": saved / total if total else 0.0}
 
 
 async def extract_plans_from_text(text: str) -> list[dict]:
+    """Matndan rejalar — oddiy xabarlar lokal, takrorlanganlari cache dan, qolganlari GPT orqali"""
+    now = datetime.now(TIMEZONE)
+    local = extract_plans_local(text, now)
+    if local.plans and local.confidence >= PLAN_EXTRACT_CONFIDENCE:
+        _extract_stats["local"] += 1
+        logger.info(f"⚡ Lokal tahlil ({local.confidence:.1f}): '{text}' → {local.plans}")
+        return local.plans
+
+    cached = await get_cached_plans(text, now)
+    if cached is not None:
+        _extract_stats["cache"] += 1
+        logger.info(f"🗄 Cache: '{text}' → {cached}")
+        return cached
+
+    _extract_stats["gpt"] += 1
+    plans = await extract_plans_gpt(text, now)
+    if plans:
+        await cache_plans(text, plans, now)
+    return plans
+
+
+async def extract_plans_gpt(text: str, now: datetime | None = None) -> list[dict]:
     try:
         # O'zbekiston vaqti
-        now = datetime.now(TIMEZONE)
+        now = now or datetime.now(TIMEZONE)
         current_time = now.strftime("%H:%M")
         current_date = now.strftime("%d.%m.%Y")
         
@@ -192,26 +218,23 @@ FAQAT JSON QAYTAR, BOSHQA HECH NARSA YOZMA!"""
         data = json.loads(content)
         plans = data.get("plans", [])
         
-        # Kirill harflar → O'zbek
+        # Kirill harflar → O'zbek: o'zbekcha — lokal translit, ruscha — bitta so'rovda tarjima
+        russian = []
         for plan in plans:
-            title = plan.get("title", "")
-            # Kirill tekshirish
-            if any(ord(c) >= 0x0400 and ord(c) <= 0x04FF for c in title):
-                logger.warning(f"⚠️ Kirill topildi: '{title}' - tarjima qilamiz")
-                tr_resp = await client.chat.completions.create(
-                    model="gpt-4o-mini",
-                    messages=[
-                        {"role": "system", "content": "Sen tarjimon. FAQAT o'zbek tilida lotin harflarida javob ber."},
-                        {"role": "user", "content": f"Bu matnni o'zbek tiliga (lotin harflarida) tarjima qil. Faqat tarjimani yoz, boshqa hech narsa: '{title}'"}
-                    ],
-                    temperature=0.05,
-                )
-                uzbek_title = tr_resp.choices[0].message.content.strip()
-                # Kirill qaytgan bo'lsa — fallback
-                if any(ord(c) >= 0x0400 and ord(c) <= 0x04FF for c in uzbek_title):
-                    uzbek_title = "Reja"
+            title = plan.get("title") or ""
+            if not has_cyrillic(title):
+                continue
+            if is_uzbek_cyrillic(title):
+                plan["title"] = to_latin(title)
+                logger.info(f"🔤 Translit: '{title}' → '{plan['title']}'")
+            else:
+                russian.append(plan)
+        if russian:
+            logger.warning(f"⚠️ Ruscha sarlavhalar: {[p['title'] for p in russian]} - tarjima qilamiz")
+            translated = await translate_titles([p["title"] for p in russian])
+            for plan, uzbek_title in zip(russian, translated):
+                logger.info(f"✅ Tarjima: '{plan['title']}' → '{uzbek_title}'")
                 plan["title"] = uzbek_title
-                logger.info(f"✅ Tarjima: '{title}' → '{uzbek_title}'")
 
         logger.info(f"✅ Final rejalar: {plans}")
         return plans
@@ -221,4 +244,68 @@ FAQAT JSON QAYTAR, BOSHQA HECH NARSA YOZMA!"""
         return []
     except Exception as e:
         logger.error(f"❌ GPT xatosi: {type(e).__name__}: {str(e)}")
-        raise e
\ No newline at end of file
+        raise e
+
+
+async def translate_titles(titles: list[str]) -> list[str]:
+    """Ruscha sarlavhalar → o'zbek (lotin), hammasi bitta so'rovda; tarjima bo'lmaganlar "Reja" """
+    try:
+        response = await client.chat.completions.create(
+            model="gpt-4o-mini",
+            messages=[
+                {"role": "system", "content": "Sen tarjimon. FAQAT o'zbek tilida lotin harflarida javob ber."},
+                {"role": "user", "content": (
+                    "Har bir sarlavhani o'zbek tiliga (lotin harflarida) tarjima qil. "
+                    'Faqat JSON qaytar: {"titles": [...]} — tartib va soni bir xil.\n'
+                    + json.dumps(titles, ensure_ascii=False)
+                )},
+            ],
+            temperature=0.05,
+            response_format={"type": "json_object"},
+        )
+        translated = json.loads(response.choices[0].message.content).get("titles", [])
+    except Exception as e:
+        logger.error(f"❌ Tarjima xatosi: {type(e).__name__}: {str(e)}")
+        translated = []
+
+    result = []
+    for index, title in enumerate(titles):
+        uzbek_title = translated[index].strip() if index < len(translated) and isinstance(translated[index], str) else ""
+        # Kirill qaytgan bo'lsa — fallback
+        if not uzbek_title or has_cyrillic(uzbek_title):
+            uzbek_title = "Reja"
+        result.append(uzbek_title)
+    return result
+
+
+async def extract_time_gpt(text: str) -> str | None:
+    """Qoidalar tushunmagan javoblar uchun — kichik prompt, faqat "HH:MM" yoki null"""
+    now = datetime.now(TIMEZONE)
+    response = await client.chat.completions.create(
+        model="gpt-4o-mini",
+        messages=[
+            {"role": "system", "content": "Matndan vaqtni chiqar. FAQAT HH:MM yoki null qaytar."},
+            {"role": "user", "content": f"Tashkent vaqti: {now.strftime('%H:%M')}\nMatn: \"{text}\""}
+        ],
+        temperature=0,
+        max_tokens=8,
+    )
+    content = response.choices[0].message.content.strip()
+    match = re.search(r"\b([01]?\d|2[0-3]):([0-5]\d)\b", content)
+    return f"{int(match.group(1)):02d}:{match.group(2)}" if match else None
+
+
+async def extract_time_only(text: str) -> str | None:
+    """Vaqt so'ralganda user javobidan "HH:MM" — avval lokal qoidalar, keyin GPT"""
+    scheduled_time = parse_time(text)
+    if scheduled_time:
+        logger.info(f"🕐 Vaqt (lokal): '{text}' → {scheduled_time}")
+        return scheduled_time
+
+    try:
+        scheduled_time = await extract_time_gpt(text)
+        logger.info(f"🕐 Vaqt (GPT): '{text}' → {scheduled_time}")
+        return scheduled_time
+    except Exception as e:
+        logger.error(f"❌ GPT vaqt xatosi: {type(e).__name__}: {str(e)}")
+        return None
@@ -0,0 +1,283 @@
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import select, update, func, and_, or_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from database.db import AsyncSessionLocal
+from bot.models.broadcast import Broadcast, BroadcastStatus, BroadcastDelivery
+from bot.models.user import User
+from bot.services.delivery import delivery, DeliveryStatus
+from bot.config import BROADCAST_BATCH_SIZE, BROADCAST_PROGRESS_SECONDS, BROADCAST_LEASE_SECONDS, NODE_ID
+
+logger = logging.getLogger(__name__)
+
+# broadcast_id → ishlayotgan worker task
+_workers: dict[int, asyncio.Task] = {}
+
+
+async def create_broadcast(session: AsyncSession, admin_chat_id: int, progress_message_id: int, text: str) -> Broadcast:
+    total = await session.scalar(select(func.count(User.id)).where(User.is_active == True))
+    broadcast = Broadcast(
+        text=text,
+        admin_chat_id=admin_chat_id,
+        progress_message_id=progress_message_id,
+        status=BroadcastStatus.running,
+        total=total or 0,
+    )
+    session.add(broadcast)
+    # Worker boshqa sessiyada o'qiydi — handler oxirini kutmasdan commit qilinadi
+    await session.commit()
+    await session.refresh(broadcast)
+    return broadcast
+
+
+async def get_broadcast(session: AsyncSession, broadcast_id: int) -> Broadcast | None:
+    return await session.get(Broadcast, broadcast_id)
+
+
+async def set_broadcast_status(session: AsyncSession, broadcast: Broadcast, status: BroadcastStatus):
+    """Pauza / davom ettirish / bekor qilish — worker keyingi batchda ko'radi"""
+    broadcast.status = status
+    if status == BroadcastStatus.cancelled:
+        broadcast.finished_at = datetime.utcnow()
+    # Worker boshqa sessiyada o'qiydi — handler oxirini kutmasdan commit qilinadi
+    await session.commit()
+
+
+def start_broadcast(bot, broadcast_id: int):
+    """Worker ni fon rejimida ishga tushiradi (allaqachon ishlayotgan bo'lsa — hech narsa qilmaydi)"""
+    task = _workers.get(broadcast_id)
+    if task is None or task.done():
+        _workers[broadcast_id] = asyncio.create_task(run_broadcast(bot, broadcast_id))
+
+
+def _lease_free():
+    """Egasi yo'q yoki egasi lease ni o'z vaqtida yangilamagan (o'lgan) broadcast"""
+    return or_(Broadcast.owner.is_(None), Broadcast.lease_until < datetime.utcnow())
+
+
+async def _acquire_lease(session: AsyncSession, broadcast_id: int) -> bool:
+    """Broadcastni shu replikaga oladi yoki lease ni uzaytiradi — bir vaqtda faqat bitta worker"""
+    result = await session.execute(
+        update(Broadcast)
+        .where(
+            and_(
+                Broadcast.id == broadcast_id,
+                Broadcast.status == BroadcastStatus.running,
+                or_(Broadcast.owner == NODE_ID, _lease_free())
+            )
+        )
+        .values(owner=NODE_ID, lease_until=datetime.utcnow() + timedelta(seconds=BROADCAST_LEASE_SECONDS))
+        .returning(Broadcast.id)
+    )
+    acquired = result.scalar_one_or_none() is not None
+    await session.commit()
+    return acquired
+
+
+async def _release_lease(broadcast_id: int):
+    async with AsyncSessionLocal() as session:
+        await session.execute(
+            update(Broadcast)
+            .where(and_(Broadcast.id == broadcast_id, Broadcast.owner == NODE_ID))
+            .values(owner=None, lease_until=None)
+        )
+        await session.commit()
+
+
+async def _keep_lease(broadcast_id: int, lost: asyncio.Event):
+    """Worker ishlayotganda lease ni yangilab turadi; boshqa replika olib qo'ysa — `lost`"""
+    while True:
+        await asyncio.sleep(BROADCAST_LEASE_SECONDS / 3)
+        try:
+            async with AsyncSessionLocal() as session:
+                if not await _acquire_lease(session, broadcast_id):
+                    lost.set()
+                    return
+        except Exception as e:
+            logger.warning(f"Broadcast #{broadcast_id} lease yangilanmadi: {e}")
+
+
+async def resume_broadcasts(bot):
+    """Egasiz qolgan (worker o'lgan) broadcastlarni davom ettiradi — liderda davriy ishlaydi"""
+    async with AsyncSessionLocal() as session:
+        result = await session.execute(
+            select(Broadcast.id).where(and_(Broadcast.status == BroadcastStatus.running, _lease_free()))
+        )
+        ids = result.scalars().all()
+
+    for broadcast_id in ids:
+        logger.info(f"📢 Broadcast #{broadcast_id} davom ettirilmoqda")
+        start_broadcast(bot, broadcast_id)
+
+
+async def _report_progress(bot, broadcast: Broadcast):
+    from bot.utils.formatters import format_broadcast_progress
+    from bot.keyboards.admin_keys import broadcast_progress_keyboard
+
+    if not broadcast.progress_message_id:
+        return
+    try:
+        await bot.edit_message_text(
+            chat_id=broadcast.admin_chat_id,
+            message_id=broadcast.progress_message_id,
+            text=format_broadcast_progress(broadcast),
+            parse_mode="HTML",
+            reply_markup=broadcast_progress_keyboard(broadcast.id, broadcast.status),
+        )
+    except Exception as e:
+        # "message is not modified" va h.k. — progress uchun muhim emas
+        logger.debug(f"Broadcast progress edit: {e}")
+
+
+async def _recover_queued(session: AsyncSession, broadcast: Broadcast):
+    """Crash paytida "queued" bo'lib qolganlar — yetib borgani noma'lum, qayta yuborilmaydi"""
+    result = await session.execute(
+        update(BroadcastDelivery)
+        .where(
+            and_(
+                BroadcastDelivery.broadcast_id == broadcast.id,
+                BroadcastDelivery.status == "queued"
+            )
+        )
+        .values(status="failed")
+    )
+    if result.rowcount:
+        broadcast.failed += result.rowcount
+    await session.commit()
+
+
+async def _claim_batch(session: AsyncSession, broadcast_id: int, batch: list) -> list:
+    """Batchni "queued" deb yozadi; faqat shu chaqiruvda yangi yozilganlarni qaytaradi"""
+    result = await session.execute(
+        insert(BroadcastDelivery)
+        .values([{"broadcast_id": broadcast_id, "user_id": row.id, "status": "queued"} for row in batch])
+        .on_conflict_do_nothing()
+        .returning(BroadcastDelivery.user_id)
+    )
+    claimed = set(result.scalars().all())
+    await session.execute(
+        update(Broadcast).where(Broadcast.id == broadcast_id).values(last_user_id=batch[-1].id)
+    )
+    await session.commit()
+    return [row for row in batch if row.id in claimed]
+
+
+async def _record_results(session: AsyncSession, broadcast_id: int, recipients: list, results: list[DeliveryStatus]):
+    by_status: dict[DeliveryStatus, list[int]] = {}
+    for row, status in zip(recipients, results):
+        by_status.setdefault(status, []).append(row.id)
+
+    for status, user_ids in by_status.items():
+        await session.execute(
+            update(BroadcastDelivery)
+            .where(
+                and_(
+                    BroadcastDelivery.broadcast_id == broadcast_id,
+                    BroadcastDelivery.user_id.in_(user_ids)
+                )
+            )
+            .values(status=status.value)
+        )
+
+    # Botni bloklaganlarga keyingi safar yubormaymiz
+    blocked_ids = by_status.get(DeliveryStatus.blocked, [])
+    if blocked_ids:
+        await session.execute(
+            update(User).where(User.id.in_(blocked_ids)).values(is_active=False)
+        )
+        from bot.services.user_service import users_changed
+        await users_changed(session)
+
+    await session.execute(
+        update(Broadcast)
+        .where(Broadcast.id == broadcast_id)
+        .values(
+            sent=Broadcast.sent + len(by_status.get(DeliveryStatus.sent, [])),
+            failed=Broadcast.failed + len(by_status.get(DeliveryStatus.failed, [])),
+            blocked=Broadcast.blocked + len(blocked_ids),
+        )
+    )
+    await session.commit()
+
+
+async def run_broadcast(bot, broadcast_id: int):
+    """Broadcast worker.
+
+    Qabul qiluvchilar server-side cursor orqali users.id tartibida o'qiladi.
+    Har bir batch avval broadcast_deliveries ga "queued" deb yoziladi va
+    cursor (last_user_id) suriladi, keyin yuboriladi — restartdan keyin
+    worker shu joydan davom etadi va hech kimga ikki marta yubormaydi.
+
+    Worker broadcastni lease bilan egallaydi (owner + lease_until) va uni
+    yangilab turadi; egasi o'lsa, lider resume_broadcasts jobida boshqa
+    replikada davom ettiradi.
+    """
+    async with AsyncSessionLocal() as session:
+        # Boshqa replika ishlayotgan bo'lsa — uning "queued" yozuvlariga tegmaymiz
+        if not await _acquire_lease(session, broadcast_id):
+            _workers.pop(broadcast_id, None)
+            return
+        broadcast = await get_broadcast(session, broadcast_id)
+        await _recover_queued(session, broadcast)
+        text = f"📢 <b>Intizom AI:</b>\n\n{broadcast.text}"
+        start_after = broadcast.last_user_id or 0
+
+    last_report = time.monotonic()
+    lost = asyncio.Event()
+    keeper = asyncio.create_task(_keep_lease(broadcast_id, lost))
+
+    try:
+        async with AsyncSessionLocal() as reader:
+            result = await reader.stream(
+                select(User.id, User.telegram_id)
+                .where(and_(User.is_active == True, User.id > start_after))
+                .order_by(User.id)
+                .execution_options(yield_per=BROADCAST_BATCH_SIZE)
+            )
+
+            async for batch in result.partitions(BROADCAST_BATCH_SIZE):
+                if lost.is_set():
+                    logger.warning(f"📢 Broadcast #{broadcast_id} boshqa replikaga o'tdi")
+                    return
+                async with AsyncSessionLocal() as session:
+                    broadcast = await get_broadcast(session, broadcast_id)
+                    if broadcast.status != BroadcastStatus.running:
+                        # Pauza yoki bekor qilindi
+                        await _report_progress(bot, broadcast)
+                        return
+                    recipients = await _claim_batch(session, broadcast_id, batch)
+
+                if recipients:
+                    results = await delivery.send_many(bot, [
+                        {"chat_id": row.telegram_id, "text": text, "parse_mode": "HTML"}
+                        for row in recipients
+                    ])
+                    async with AsyncSessionLocal() as session:
+                        await _record_results(session, broadcast_id, recipients, results)
+
+                if time.monotonic() - last_report >= BROADCAST_PROGRESS_SECONDS:
+                    last_report = time.monotonic()
+                    async with AsyncSessionLocal() as session:
+                        await _report_progress(bot, await get_broadcast(session, broadcast_id))
+
+        async with AsyncSessionLocal() as session:
+            broadcast = await get_broadcast(session, broadcast_id)
+            if broadcast.status == BroadcastStatus.running:
+                broadcast.status = BroadcastStatus.done
+                broadcast.finished_at = datetime.utcnow()
+                await session.commit()
+            await _report_progress(bot, broadcast)
+    except Exception as e:
+        logger.error(f"❌ Broadcast #{broadcast_id} xatosi: {type(e).__name__}: {e}")
+    finally:
+        keeper.cancel()
+        _workers.pop(broadcast_id, None)
+        try:
+            await _release_lease(broadcast_id)
+        except Exception as e:
+            logger.warning(f"Broadcast #{broadcast_id} lease bo'shatilmadi: {e}")
@@ -0,0 +1,140 @@
+import asyncio
+import enum
+import logging
+import time
+from typing import Any, Iterable
+
+from aiogram.exceptions import (
+    TelegramRetryAfter, TelegramForbiddenError, TelegramNetworkError, TelegramServerError, RestartingTelegram
+)
+
+from bot.config import SEND_CONCURRENCY, SEND_GLOBAL_RATE, SEND_PER_CHAT_RATE, SEND_MAX_RETRIES
+
+logger = logging.getLogger(__name__)
+
+
+class DeliveryStatus(enum.Enum):
+    sent = "sent"
+    blocked = "blocked"    # User botni bloklagan / o'chirilgan
+    failed = "failed"
+
+
+def _not_delivered(error: Exception) -> bool:
+    """Xabar Telegramga aniq yetmagan: ulanish o'rnatilmagan yoki Telegram restart bo'lyapti"""
+    if isinstance(error, RestartingTelegram):
+        return True
+    return isinstance(error, TelegramNetworkError) and error.message.startswith("ClientConnector")
+
+
+class TokenBucket:
+    """Umumiy tezlik limiti — sekundiga `rate` ta token, `capacity` gacha yig'iladi"""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def pause(self, seconds: float):
+        """RetryAfter kelganda hamma yuborishlarni to'xtatib turadi"""
+        self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+        self.tokens = 0
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self.paused_until:
+                    await asyncio.sleep(self.paused_until - now)
+                    continue
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class Delivery:
+    """Telegramga xabar yuborish — cheklangan parallellik, umumiy va har bir chat uchun limit"""
+
+    def __init__(
+        self,
+        concurrency: int = SEND_CONCURRENCY,
+        global_rate: float = SEND_GLOBAL_RATE,
+        per_chat_rate: float = SEND_PER_CHAT_RATE,
+        max_retries: int = SEND_MAX_RETRIES,
+    ):
+        self.concurrency = concurrency
+        self.bucket = TokenBucket(global_rate, global_rate)
+        self.chat_interval = 1 / per_chat_rate
+        self.max_retries = max_retries
+        self._chat_next: dict[int, float] = {}
+        self._chat_locks: dict[int, asyncio.Lock] = {}
+
+    async def _wait_chat(self, chat_id: int):
+        lock = self._chat_locks.setdefault(chat_id, asyncio.Lock())
+        async with lock:
+            now = time.monotonic()
+            ready_at = self._chat_next.get(chat_id, 0.0)
+            if ready_at > now:
+                await asyncio.sleep(ready_at - now)
+            self._chat_next[chat_id] = max(now, ready_at) + self.chat_interval
+
+        # Eski yozuvlarni tozalash — dict cheksiz o'smasin
+        if len(self._chat_next) > 10_000:
+            now = time.monotonic()
+            for key in [k for k, t in self._chat_next.items() if t < now]:
+                self._chat_next.pop(key, None)
+                lock = self._chat_locks.get(key)
+                if lock and not lock.locked():
+                    self._chat_locks.pop(key, None)
+
+    async def send(self, bot, chat_id: int, text: str, **kwargs: Any) -> DeliveryStatus:
+        """Bitta xabar — RetryAfter yoki ulanish xatosida kutib qayta urinadi"""
+        for attempt in range(self.max_retries + 1):
+            await self._wait_chat(chat_id)
+            await self.bucket.acquire()
+            try:
+                await bot.send_message(chat_id=chat_id, text=text, **kwargs)
+                return DeliveryStatus.sent
+            except TelegramRetryAfter as e:
+                logger.warning(f"⏳ RetryAfter {e.retry_after}s (chat {chat_id})")
+                self.bucket.pause(e.retry_after)
+                self._chat_next[chat_id] = time.monotonic() + e.retry_after
+            except TelegramForbiddenError:
+                return DeliveryStatus.blocked
+            except (TelegramNetworkError, TelegramServerError) as e:
+                if not _not_delivered(e):
+                    # So'rov Telegramga yetib, javob yo'qolgan bo'lishi mumkin — qayta
+                    # yuborsak xabar ikki marta ketadi. Chaqiruvchi keyingi siklga qoldiradi.
+                    logger.warning(f"⚠️ Yuborish natijasi noma'lum (chat {chat_id}): {e}")
+                    return DeliveryStatus.failed
+                logger.warning(f"⚠️ Yuborishda tarmoq xatosi (chat {chat_id}): {e}")
+                await asyncio.sleep(2 ** attempt)
+            except Exception as e:
+                logger.error(f"❌ Yuborish xatosi (chat {chat_id}): {type(e).__name__}: {e}")
+                return DeliveryStatus.failed
+        return DeliveryStatus.failed
+
+    async def send_many(self, bot, messages: Iterable[dict]) -> list[DeliveryStatus]:
+        """Ko'p xabar — `concurrency` ta worker bilan. Natijalar kirish tartibida qaytadi.
+
+        Har bir element send_message argumentlari: {"chat_id": ..., "text": ..., ...}
+        """
+        messages = list(messages)
+        results = [DeliveryStatus.failed] * len(messages)
+        queue = iter(enumerate(messages))
+
+        async def worker():
+            for index, message in queue:
+                message = dict(message)
+                results[index] = await self.send(bot, message.pop("chat_id"), message.pop("text"), **message)
+
+        await asyncio.gather(*(worker() for _ in range(min(self.concurrency, len(messages)))))
+        return results
+
+
+delivery = Delivery()
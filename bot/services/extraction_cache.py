@@ -0,0 +1,138 @@
+import hashlib
+import json
+import logging
+from datetime import datetime, timedelta
+
+from sqlalchemy import select, delete, and_
+from sqlalchemy.dialects.postgresql import insert
+
+from bot.config import TIMEZONE, EXTRACT_CACHE_STORAGE, EXTRACT_CACHE_SIZE, EXTRACT_CACHE_TTL_HOURS
+from bot.services.time_parser import normalize, find_times
+from bot.utils.cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+# Bir xil iboralar ("har kuni 6 da turaman") uchun GPT qayta chaqirilmaydi.
+# Yozuvlar shablon: nisbiy vaqtlar ("30 minutdan keyin") offset_minutes
+# sifatida saqlanadi va har bir hitda hozirgi Tashkent vaqtiga qo'yiladi.
+_TTL = timedelta(hours=EXTRACT_CACHE_TTL_HOURS)
+_memory = TTLCache(maxsize=EXTRACT_CACHE_SIZE, ttl=_TTL.total_seconds())
+PERSIST = EXTRACT_CACHE_STORAGE == "postgres"
+
+
+def cache_key(normalized: str) -> str:
+    return hashlib.sha256(normalized.encode()).hexdigest()
+
+
+def to_template(normalized: str, plans: list[dict], now: datetime) -> list[dict] | None:
+    """GPT natijasidagi nisbiy vaqtlarni `now` ga nisbatan offsetga aylantiradi.
+
+    Matndan tushuntirib bo'lmaydigan vaqt ("hozir", "через полтора часа" —
+    parser tanimaydi) `now` ga bog'liq bo'lishi mumkin — bunday natija
+    cache qilinmaydi (None).
+    """
+    times = find_times(normalized)
+    # Matnda aniq aytilgan soatlar ("9 da") absolut bo'lib qoladi
+    absolute = {t.resolve(now) for t in times if t.at is not None}
+    relative = {t.resolve(now) for t in times if t.offset is not None}
+    current = now.hour * 60 + now.minute
+    template = []
+    for plan in plans:
+        plan = dict(plan)
+        scheduled_time = plan.get("scheduled_time")
+        if scheduled_time and scheduled_time not in absolute:
+            if scheduled_time not in relative:
+                return None
+            at = datetime.strptime(scheduled_time, "%H:%M")
+            plan["scheduled_time"] = None
+            plan["offset_minutes"] = (at.hour * 60 + at.minute - current) % (24 * 60)
+        template.append(plan)
+    return template
+
+
+def from_template(template: list[dict], now: datetime) -> list[dict]:
+    plans = []
+    for plan in template:
+        plan = dict(plan)
+        offset = plan.pop("offset_minutes", None)
+        if offset is not None:
+            plan["scheduled_time"] = (now + timedelta(minutes=offset)).strftime("%H:%M")
+        plans.append(plan)
+    return plans
+
+
+async def get_cached_plans(text: str, now: datetime | None = None) -> list[dict] | None:
+    now = now or datetime.now(TIMEZONE)
+    key = cache_key(normalize(text))
+    template = _memory.get(key)
+    if template is None and PERSIST:
+        template = await _load(key)
+        if template is not None:
+            _memory.set(key, template)
+    return from_template(template, now) if template is not None else None
+
+
+async def cache_plans(text: str, plans: list[dict], now: datetime):
+    """`now` — GPT ga yuborilgan promptdagi vaqt (nisbiy vaqtlar shunga nisbatan hisoblangan)"""
+    normalized = normalize(text)
+    key = cache_key(normalized)
+    template = to_template(normalized, plans, now)
+    if template is None:
+        return
+    _memory.set(key, template)
+    if PERSIST:
+        await _store(key, template)
+
+
+def extraction_cache_stats() -> dict:
+    return _memory.stats()
+
+
+async def _load(key: str) -> list[dict] | None:
+    from database.db import AsyncSessionLocal
+    from bot.models.plan_extraction import PlanExtraction
+
+    try:
+        async with AsyncSessionLocal() as session:
+            result = await session.execute(
+                select(PlanExtraction.plans).where(
+                    and_(PlanExtraction.key == key, PlanExtraction.expires_at > datetime.utcnow())
+                )
+            )
+            raw = result.scalar_one_or_none()
+    except Exception as e:
+        # Cache ixtiyoriy — DB xatosi GPT yo'lini to'xtatmasin
+        logger.warning(f"⚠️ Extraction cache o'qish xatosi: {type(e).__name__}: {e}")
+        return None
+    return json.loads(raw) if raw else None
+
+
+async def _store(key: str, template: list[dict]):
+    from database.db import AsyncSessionLocal
+    from bot.models.plan_extraction import PlanExtraction
+
+    raw = json.dumps(template, separators=(",", ":"), ensure_ascii=False)
+    expires_at = datetime.utcnow() + _TTL
+    stmt = insert(PlanExtraction).values(key=key, plans=raw, expires_at=expires_at)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[PlanExtraction.key],
+        set_={"plans": raw, "expires_at": expires_at},
+    )
+    try:
+        async with AsyncSessionLocal() as session:
+            await session.execute(stmt)
+            await session.commit()
+    except Exception as e:
+        logger.warning(f"⚠️ Extraction cache yozish xatosi: {type(e).__name__}: {e}")
+
+
+async def cleanup_expired() -> int:
+    from database.db import AsyncSessionLocal
+    from bot.models.plan_extraction import PlanExtraction
+
+    async with AsyncSessionLocal() as session:
+        result = await session.execute(
+            delete(PlanExtraction).where(PlanExtraction.expires_at <= datetime.utcnow())
+        )
+        await session.commit()
+        return result.rowcount
@@ -0,0 +1,37 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import select, update, and_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from bot.models.job_run import JobRun
+
+
+async def start_job_run(session: AsyncSession, job_id: str, node_id: str) -> int:
+    run = JobRun(job_id=job_id, node_id=node_id, status="running")
+    session.add(run)
+    await session.commit()
+    return run.id
+
+
+async def finish_job_run(session: AsyncSession, run_id: int, status: str, error: str | None = None):
+    await session.execute(
+        update(JobRun)
+        .where(JobRun.id == run_id)
+        .values(status=status, error=error, finished_at=datetime.utcnow())
+    )
+    await session.commit()
+
+
+async def has_recent_job_run(session: AsyncSession, job_id: str, seconds: int) -> bool:
+    """Oxirgi `seconds` ichida bu job (xatosiz) ishga tushganmi — failoverdan keyin qayta ishlamaslik uchun"""
+    since = datetime.utcnow() - timedelta(seconds=seconds)
+    result = await session.execute(
+        select(JobRun.id).where(
+            and_(
+                JobRun.job_id == job_id,
+                JobRun.started_at >= since,
+                JobRun.status != "error"
+            )
+        ).limit(1)
+    )
+    return result.scalar_one_or_none() is not None
@@ -0,0 +1,104 @@
+import asyncio
+import logging
+from typing import Awaitable, Callable
+
+from sqlalchemy import select, func, text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from database.db import engine
+from bot.config import NODE_ID, LEADER_LOCK_KEY, LEADER_RENEW_SECONDS
+
+logger = logging.getLogger(__name__)
+
+
+class LeaderElector:
+    """Postgres advisory lock orqali lider saylash.
+
+    Lock alohida ulanishda session darajasida ushlanadi. Lider har
+    `renew_seconds` da lock hali o'zida ekanini tekshiradi (lease
+    renewal); tekshiruv xato bersa yoki vaqtida javob kelmasa — darhol
+    liderlikdan tushadi. Lider jarayoni o'lsa ulanish yopiladi va lock
+    bo'shaydi; qolgan replikalar keyingi urinishda (renew_seconds ichida)
+    uni oladi. Tarmoq uzilganda server ulanishni TCP keepalive orqali
+    tezroq yopishi uchun keepalive sozlamalari qisqartiriladi.
+    """
+
+    def __init__(self, engine: AsyncEngine, node_id: str, lock_key: int, renew_seconds: float = 5):
+        self.engine = engine
+        self.node_id = node_id
+        self.lock_key = lock_key
+        self.renew_seconds = renew_seconds
+        self._conn: AsyncConnection | None = None
+        self._runner: asyncio.Task | None = None
+
+    @property
+    def is_leader(self) -> bool:
+        return self._conn is not None
+
+    async def _try_acquire(self) -> bool:
+        conn = await self.engine.connect()
+        try:
+            await conn.execution_options(isolation_level="AUTOCOMMIT")
+            await conn.execute(text("SET tcp_keepalives_idle = 10"))
+            await conn.execute(text("SET tcp_keepalives_interval = 2"))
+            await conn.execute(text("SET tcp_keepalives_count = 3"))
+            acquired = await conn.scalar(select(func.pg_try_advisory_lock(self.lock_key)))
+        except Exception:
+            await conn.invalidate()
+            await conn.close()
+            raise
+        if not acquired:
+            await conn.close()
+            return False
+        self._conn = conn
+        return True
+
+    async def _still_held(self) -> bool:
+        held = await self._conn.scalar(
+            text(
+                "SELECT count(*) FROM pg_locks WHERE locktype = 'advisory' AND granted "
+                "AND pid = pg_backend_pid() AND classid = 0 AND objid = :key"
+            ),
+            {"key": self.lock_key},
+        )
+        return bool(held)
+
+    async def _release_connection(self):
+        conn, self._conn = self._conn, None
+        if conn is not None:
+            # Ulanish poolga qaytmaydi — lock u bilan birga bo'shaydi
+            await conn.invalidate()
+            await conn.close()
+
+    def start(self, on_elected: Callable[[], Awaitable[None]], on_demoted: Callable[[], Awaitable[None]]):
+        if self._runner is None or self._runner.done():
+            self._runner = asyncio.create_task(self.run(on_elected, on_demoted))
+
+    async def run(self, on_elected, on_demoted):
+        while True:
+            try:
+                if not self.is_leader:
+                    if await self._try_acquire():
+                        logger.info(f"👑 {self.node_id} lider bo'ldi")
+                        await on_elected()
+                elif not await asyncio.wait_for(self._still_held(), timeout=self.renew_seconds):
+                    raise RuntimeError("advisory lock yo'qolgan")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                if self.is_leader:
+                    logger.warning(f"⚠️ {self.node_id} liderlikdan tushdi: {type(e).__name__}: {e}")
+                    await self._release_connection()
+                    await on_demoted()
+                else:
+                    logger.warning(f"Lider saylovi xatosi: {type(e).__name__}: {e}")
+            await asyncio.sleep(self.renew_seconds)
+
+    async def stop(self):
+        if self._runner is not None:
+            self._runner.cancel()
+            await asyncio.gather(self._runner, return_exceptions=True)
+        await self._release_connection()
+
+
+elector = LeaderElector(engine, NODE_ID, LEADER_LOCK_KEY, LEADER_RENEW_SECONDS)
@@ -0,0 +1,188 @@
+import re
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime
+
+from bot.config import TIMEZONE
+from bot.services.time_parser import normalize, find_times
+
+logger = logging.getLogger(__name__)
+
+# ─────────────────────────────────────────
+#  Kanonik faoliyatlar — GPT promptidagi ro'yxat bilan bir xil
+#  (kalit so'z regex, sarlavha, (miqdorli sarlavha, o'lchov birliklari), ball)
+# ─────────────────────────────────────────
+
+ACTIVITIES = [
+    (r"turnik\w*|турник\w*|pull-?ups?", "Turnikda tortish", ("Turnikda {n} ta tortish", "ta|marta|раз|times|reps"), 5),
+    (r"yugur\w*|бег\w*|пробеж\w*|running|run|jog\w*", "Yugurish", ("{n} km yugurish", "km|км"), 5),
+    (r"fitnes\w*|фитнес\w*|спортзал\w*|gym|зал\w*", "Fitnes mashg'uloti", None, 5),
+    (r"sport\w*|mashq\w*|спорт\w*|workout|exercise", "Sport mashg'uloti", None, 5),
+    (r"imtihon\w*|экзамен\w*|exams?", "Imtihonga tayyorgarlik", None, 5),
+    (r"ingliz\w*|английск\w*|english", "Ingliz tili darsi", None, 5),
+    (r"dars\w*|урок\w*|lessons?|homework", "Darsga tayyorgarlik", None, 5),
+    (r"kitob\w*|книг\w*|чита\w*|books?|read\w*", "Kitob o'qish", ("{n} sahifa kitob o'qish", "sahifa|bet|страниц|page"), 5),
+    (r"meditatsiya\w*|медитац\w*|meditat\w*", "Meditatsiya", ("{n} daqiqa meditatsiya", "daqiqa|minut|минут|minute"), 5),
+    (r"sovuq dush\w*|холодн\w* душ\w*|cold shower", "Sovuq dush", None, 6),
+    (r"uyg'on\w*|turaman|turish|turib|просну\w*|встать|встану|wake up|get up", "Uyg'onish", None, 6),
+    (r"nonushta\w*|завтрак\w*|breakfast", "Nonushta", None, 3),
+    (r"uxla\w*|спать|сон|sleep\w*", "Uxlash", None, 3),
+    (r"suv ich\w*|вод\w*|water", "Suv ichish", ("{n} stakan suv ichish", "stakan|стакан"), 3),
+    (r"namoz\w*|намаз\w*", "Namoz o'qish", None, 5),
+    (r"proyekt\w*|loyiha\w*|проект\w*|project\w*", "Proyekt ustida ishlash", None, 8),
+    (r"yurish|sayr\w*|прогулк\w*|гуля\w*|walk\w*", "Yurish", None, 3),
+]
+_ACTIVITIES = [(re.compile(rf"(?<![\w'])(?:{pattern})(?![\w'])"), *rest) for pattern, *rest in ACTIVITIES]
+
+# "matematikadan", "AI fanidan" → "[Fan nomi] darsi"
+_SUBJECT = re.compile(r"(?<![\w'])([\w']+?)\s*(?:fanidan|fani)(?![\w'])|(?<![\w'])(matematika|fizika|kimyo|biologiya|tarix)\w*")
+
+_QUANTITY = re.compile(
+    r"(?<!\d)(\d{1,4})\s*(ta|km|км|sahifa|bet|страниц\w*|pages?|daqiqa\w*|minut\w*|минут\w*|minutes?|marta|раз\w*|times|reps|stakan\w*|стакан\w*)?(?![\w'])"
+)
+_TOMORROW = re.compile(r"(?<![\w'])(?:ertaga|ertadan|завтра|tomorrow)(?![\w'])")
+# "keyin"/"so'ng" — bo'lak chegarasi, lekin "30 minutdan keyin" / "tushdan keyin" vaqtning bir qismi
+_SPLIT = re.compile(
+    r"\s*(?:[,;\n]|\.(?!\d)|\s(?:va|hamda|keyin esa|и|а потом|потом|затем|and|then)\s|(?<!dan)\s(?:keyin|so'ng)\s)\s*"
+)
+# "2 soat kitob o'qiyman" — son davomiylik, miqdor emas
+_DURATION = re.compile(r"\s*(?:yarim\s*)?(?:soat|час|hours?|hrs?)(?![\w'])")
+
+# Inkor va o'tgan zamon — reja emas yoki teskari ma'no: GPT hal qiladi.
+# "yugurmayman", "o'qimayman", "bajarmadim", "qilmagan", "emas" / "не", "нет" / "not", "won't"
+_NEGATION = re.compile(
+    r"(?<![\w'])(?:[\w']{2,}ma(?:y(?:man|miz|san|siz|di|apman)|dim|dik|di|gan\w*|sman|smiz|slik|ng)"
+    r"|emas\w*|yo'q|hech|не|нет|никогда|not|never|no|[\w]+n't)(?![\w'])"
+)
+# "yugurdim", "o'qidi", "qilganman", "kecha" / "вчера" / "yesterday", "did"
+_PAST = re.compile(
+    r"(?<![\w'])(?:[\w']{2,}(?:dim|dik|ding|di|gan(?:man|miz)?)|edi\w*|kecha|вчера|yesterday|did|was|were)(?![\w'])"
+)
+_PAST_EXCEPTIONS = {"endi", "hozirdi"}
+# "1.5 soat", "1,5 soatdan keyin" — o'nli davomiylik; vergul bo'yicha bo'lsak "1" yolg'iz qoladi
+_DECIMAL_DURATION = re.compile(r"\d[.,]\d+\s*(?:soat|час|hours?|hrs?|minut|daqiqa|мин|min)")
+
+# Ma'no bermaydigan so'zlar — "tushunilmagan so'z" hisobiga kirmaydi
+_FILLER = {
+    "men", "man", "soat", "da", "ga", "bugun", "ertaga", "ertalab", "kechqurun", "kech", "tushda",
+    "qilaman", "qilish", "qilib", "boraman", "borib", "o'qiyman", "o'qish", "ichaman", "yugiraman",
+    "tortaman", "tayyorlanaman", "tayyorgarlik", "keyin", "so'ng", "dan", "bilan", "ham",
+    "kerak", "bor", "ta", "km", "kechasi", "tunda", "ustida", "ishlayman",
+    "bomdod", "peshin", "asr", "shom", "xufton",
+    "я", "в", "на", "с", "буду", "утром", "вечером", "днём", "завтра", "сегодня", "час", "часов",
+    "утра", "дня", "вечера", "ночи",
+    "пойду", "делать", "заниматься", "немного",
+    "i", "will", "to", "at", "the", "a", "an", "go", "do", "some", "my", "in", "morning", "evening",
+    "tomorrow", "today", "pm", "am",
+}
+
+
+@dataclass
+class LocalExtraction:
+    plans: list[dict] = field(default_factory=list)
+    confidence: float = 0.0
+
+
+def split_clauses(text: str) -> list[str]:
+    return [c for c in _SPLIT.split(text) if c and c.strip()]
+
+
+def _leftover_words(clause: str, spans: list[tuple[int, int]]) -> list[str]:
+    for start, end in sorted(spans, reverse=True):
+        clause = clause[:start] + " " + clause[end:]
+    words = re.findall(r"[\w']+", clause)
+    return [w for w in words if w not in _FILLER and not w.isdigit()]
+
+
+def _extract_clause(clause: str, now: datetime) -> tuple[dict | None, float]:
+    spans = []
+    times = find_times(clause)
+    if len(times) > 1:
+        # "7 da turaman 8 da sport" — qaysi vaqt qaysi ishga tegishli, aniq emas
+        return None, 0.0
+    scheduled_time = times[0].resolve(now) if times else None
+    spans += [(t.start, t.end) for t in times]
+
+    activity = None
+    for regex, title, title_n, score in _ACTIVITIES:
+        match = regex.search(clause)
+        if match:
+            activity = (title, title_n, score)
+            # "читать книгу", "read a book" — bir faoliyatning ikkinchi so'zi ham tushunilgan
+            spans += [m.span() for m in regex.finditer(clause)]
+            break
+
+    subject = _SUBJECT.search(clause)
+    if subject and (activity is None or activity[0] == "Darsga tayyorgarlik"):
+        name = subject.group(1) or subject.group(2)
+        # Qisqa nomlar qisqartma: "ai fanidan" → "AI darsi"
+        name = name.upper() if len(name) <= 3 else name.capitalize()
+        activity = (f"{name} darsi", None, 5)
+        spans.append(subject.span())
+
+    if activity is None:
+        return None, 0.0
+
+    title, title_n, score = activity
+    quantity = None
+    for m in _QUANTITY.finditer(clause):
+        if not any(start <= m.start() < end for start, end in spans):
+            quantity = m
+            spans.append(m.span())
+            break
+    if quantity:
+        # Shablon yo'q yoki birlik boshqa ("kitob 30 daqiqa") — GPT yaxshiroq yozadi
+        unit = quantity.group(2)
+        if unit is None and _DURATION.match(clause, quantity.end()):
+            return None, 0.0
+        if title_n is None or (unit and not re.match(title_n[1], unit)):
+            return None, 0.0
+        title = title_n[0].format(n=quantity.group(1))
+
+    # Har bir so'z tushunilgan bo'lishi kerak — "yugurishni yomon ko'raman" reja emas
+    leftover = _leftover_words(clause, spans + [m.span() for m in _TOMORROW.finditer(clause)])
+    confidence = 0.0 if leftover else 1.0
+
+    return {
+        "title": title,
+        "description": None,
+        "scheduled_time": scheduled_time,
+        "score_value": score,
+        "for_tomorrow": False,
+    }, confidence
+
+
+def extract_plans_local(text: str, now: datetime | None = None) -> LocalExtraction:
+    """Oddiy xabarlarni ("soat 7 da turaman, 9 da kitob o'qiyman") tarmoqsiz rejaga aylantiradi.
+
+    confidence — eng "ishonchsiz" bo'lak bo'yicha; bitta bo'lak ham
+    tanilmasa 0 qaytadi va chaqiruvchi GPT ga o'tadi.
+    """
+    now = now or datetime.now(TIMEZONE)
+    normalized = normalize(text)
+    if _NEGATION.search(normalized) or _DECIMAL_DURATION.search(normalized) or any(
+        m.group(0) not in _PAST_EXCEPTIONS for m in _PAST.finditer(normalized)
+    ):
+        return LocalExtraction()
+    clauses = split_clauses(normalized)
+    if not clauses:
+        return LocalExtraction()
+
+    plans, confidences = [], []
+    for_tomorrow = False
+    for clause in clauses:
+        # "ertaga" keyingi bo'laklarga ham tegishli: "ertaga 6 da turaman, 7 da yuguraman"
+        for_tomorrow = for_tomorrow or bool(_TOMORROW.search(clause))
+        plan, confidence = _extract_clause(clause, now)
+        if plan is None:
+            # Son qolgan bo'lak ("1") ham tushunilmagan — jim tashlab ketilmaydi
+            if _leftover_words(clause, []) or re.search(r"\d", clause):
+                return LocalExtraction()
+            continue  # Faqat "ertaga" kabi bo'lak
+        plan["for_tomorrow"] = for_tomorrow
+        plans.append(plan)
+        confidences.append(confidence)
+
+    if not plans:
+        return LocalExtraction()
+    return LocalExtraction(plans, min(confidences))
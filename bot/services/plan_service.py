@@ -1,9 +1,20 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_
+from sqlalchemy import select, update, func, and_, tuple_
+from sqlalchemy.dialects.postgresql import insert
+from database.db import after_commit
 from bot.models.plan import Plan, PlanStatus
 from bot.models.user import User
+from bot.models.scheduler_state import SchedulerState
+from bot.models.score_log import ScoreLog
+from bot.models.user_daily_stats import UserDailyStats
 from datetime import date, timedelta, datetime
 from bot.config import TIMEZONE
+from bot.utils.timeutils import tashkent_date
+from bot.services.reminders import reminders
+from bot.services.stats_service import bump_daily_stats, status_deltas
+from bot.services.shards import in_shard, Shard
+from bot.services.user_service import get_telegram_id
+from collections import Counter
 
 
 async def create_plans(session: AsyncSession, user: User, plans_data: list[dict]) -> list[Plan]:
@@ -25,10 +36,13 @@ async def create_plans(session: AsyncSession, user: User, plans_data: list[dict]
         )
         session.add(plan)
         plans.append(plan)
+
+    for plan_date, count in Counter(p.plan_date for p in plans).items():
+        await bump_daily_stats(session, user.id, plan_date, planned=count)
     
-    await session.commit()
-    for plan in plans:
-        await session.refresh(plan)
+    await session.flush()
+    telegram_id = user.telegram_id
+    after_commit(session, lambda: [reminders.add(plan, telegram_id) for plan in plans])
     return plans
 
 
@@ -47,53 +61,194 @@ async def get_today_plans(session: AsyncSession, user: User) -> list[Plan]:
     return result.scalars().all()
 
 
+async def get_pending_plans_on(session: AsyncSession, user: User, plan_date: date) -> list[Plan]:
+    """Berilgan kundagi pending rejalar (kun oxiridagi tekshiruv o'z sanasi bilan ishlaydi)"""
+    result = await session.execute(
+        select(Plan).where(
+            and_(
+                Plan.user_id == user.id,
+                Plan.plan_date == plan_date,
+                Plan.status == PlanStatus.pending
+            )
+        ).order_by(Plan.scheduled_time)
+    )
+    return result.scalars().all()
+
+
 async def get_plan_by_id(session: AsyncSession, plan_id: int) -> Plan | None:
     result = await session.execute(select(Plan).where(Plan.id == plan_id))
     return result.scalar_one_or_none()
 
 
 async def update_plan_status(session: AsyncSession, plan: Plan, status: PlanStatus):
+    if plan.status != status:
+        await bump_daily_stats(session, plan.user_id, plan.plan_date, **status_deltas(plan.status, -1))
+        await bump_daily_stats(session, plan.user_id, plan.plan_date, **status_deltas(status))
     plan.status = status
-    await session.commit()
+    if status != PlanStatus.pending:
+        plan_id = plan.id
+        after_commit(session, lambda: reminders.discard(plan_id))
 
 
 async def delete_plan(session: AsyncSession, plan: Plan):
+    plan_id = plan.id
+    await bump_daily_stats(session, plan.user_id, plan.plan_date, planned=-1, **status_deltas(plan.status, -1))
+
+    # Reja bilan birga uning score_log lari ham o'chadi — o'sha kunlarning ballidan ayiramiz
+    logs = await session.execute(
+        select(ScoreLog.score_change, ScoreLog.created_at).where(ScoreLog.plan_id == plan_id)
+    )
+    for score_change, created_at in logs.all():
+        await bump_daily_stats(session, plan.user_id, tashkent_date(created_at), score_delta=-score_change)
+
     await session.delete(plan)
-    await session.commit()
+    after_commit(session, lambda: reminders.discard(plan_id))
 
 
-async def get_pending_plans_to_notify(session: AsyncSession) -> list[Plan]:
-    """Vaqti kelgan va hali notification yuborilmagan rejalarni qaytaradi"""
-    now_tashkent = datetime.now(TIMEZONE)
-    now_time = now_tashkent.strftime("%H:%M")
-    today = now_tashkent.date()
-    
+async def get_pending_plans_to_notify(
+    session: AsyncSession, since: datetime, until: datetime, shard: Shard | None = None
+) -> list[tuple[Plan, int]]:
+    """(since, until] oralig'ida vaqti kelgan, hali eslatilmagan rejalar + egasining telegram_id si.
+
+    since/until — Tashkent vaqtidagi daqiqalar (tzinfo siz).
+    """
+    since_key = (since.date(), since.strftime("%H:%M"))
+    until_key = (until.date(), until.strftime("%H:%M"))
+
     result = await session.execute(
-        select(Plan).where(
+        select(Plan, User.telegram_id)
+        .join(User, User.id == Plan.user_id)
+        .where(
             and_(
-                Plan.scheduled_time == now_time,
+                tuple_(Plan.plan_date, Plan.scheduled_time) > since_key,
+                tuple_(Plan.plan_date, Plan.scheduled_time) <= until_key,
                 Plan.status == PlanStatus.pending,
                 Plan.notified_at == None,
-                Plan.plan_date == today
+                in_shard(Plan.user_id, shard)
             )
         )
     )
-    return result.scalars().all()
+    return result.all()
 
 
-async def get_all_pending_plans_today(session: AsyncSession) -> list[Plan]:
-    """Bugungi barcha pending rejalarni qaytaradi"""
-    today = datetime.now(TIMEZONE).date()
-    
+async def claim_plans_for_notify(session: AsyncSession, plan_ids: list[int]) -> set[int]:
+    """Eslatmani yuborishdan oldin rejalarni band qiladi.
+
+    notified_at faqat hali NULL bo'lgan qatorlarga yoziladi, shuning uchun
+    bir vaqtda ishlagan ikki run bitta rejani ikki marta ololmaydi.
+    Yuborishdan oldin chaqiruvchi commit qilishi kerak.
+    """
+    if not plan_ids:
+        return set()
+    # Database timezone-naive datetime kutadi
+    now = datetime.now(TIMEZONE).replace(tzinfo=None)
     result = await session.execute(
-        select(Plan).where(
+        update(Plan)
+        .where(
             and_(
+                Plan.id.in_(plan_ids),
                 Plan.status == PlanStatus.pending,
-                Plan.plan_date == today
+                Plan.notified_at == None
             )
         )
+        .values(notified_at=now)
+        .returning(Plan.id)
     )
-    return result.scalars().all()
+    return set(result.scalars().all())
+
+
+async def release_plans_notify(session: AsyncSession, plan_ids: list[int]):
+    """Yuborilmagan eslatmalarni qaytadan "eslatilmagan" holatiga o'tkazadi"""
+    await session.execute(
+        update(Plan).where(Plan.id.in_(plan_ids)).values(notified_at=None)
+    )
+
+
+async def get_notify_watermark(session: AsyncSession) -> datetime | None:
+    """Eslatmalar oxirgi marta qaysi daqiqagacha qayta ishlangani (Tashkent vaqti)"""
+    result = await session.execute(
+        select(SchedulerState.value).where(SchedulerState.key == "notify_watermark")
+    )
+    value = result.scalar_one_or_none()
+    return datetime.strptime(value, "%Y-%m-%d %H:%M") if value else None
+
+
+async def advance_notify_watermark(session: AsyncSession, until: datetime):
+    """Watermark faqat oldinga suriladi — kechikkan run uni orqaga qaytarmaydi"""
+    stmt = insert(SchedulerState).values(key="notify_watermark", value=until.strftime("%Y-%m-%d %H:%M"))
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[SchedulerState.key],
+        set_={"value": func.greatest(SchedulerState.value, stmt.excluded.value), "updated_at": func.now()},
+    )
+    await session.execute(stmt)
+
+
+async def get_all_pending_plans_today(
+    session: AsyncSession, shard: Shard | None = None, day: date | None = None
+) -> list[tuple[Plan, int]]:
+    """Bugungi (yoki `day`) barcha pending rejalar + egasining telegram_id si, user bo'yicha tartiblangan"""
+    today = day or datetime.now(TIMEZONE).date()
+
+    result = await session.execute(
+        select(Plan, User.telegram_id)
+        .join(User, User.id == Plan.user_id)
+        .where(
+            and_(
+                Plan.status == PlanStatus.pending,
+                Plan.plan_date == today,
+                in_shard(Plan.user_id, shard)
+            )
+        )
+        .order_by(Plan.user_id, Plan.scheduled_time, Plan.id)
+    )
+    return result.all()
+
+
+async def get_daily_plan_counts(session: AsyncSession, day: date, shard: Shard | None = None) -> list[tuple]:
+    """Kun bo'yicha har bir aktiv user uchun done/failed/pending soni — user_daily_stats dan bitta query
+
+    Qaytaradi: (user_id, telegram_id, total_score, streak, done, failed, pending)
+    """
+    result = await session.execute(
+        select(
+            User.id, User.telegram_id, User.total_score, User.streak,
+            UserDailyStats.done,
+            UserDailyStats.failed,
+            (UserDailyStats.planned - UserDailyStats.done - UserDailyStats.failed).label("pending"),
+        )
+        .join(UserDailyStats, and_(UserDailyStats.user_id == User.id, UserDailyStats.date == day))
+        .where(and_(User.is_active == True, UserDailyStats.planned > 0, in_shard(User.id, shard)))
+    )
+    return result.all()
+
+
+async def get_upcoming_reminders(
+    session: AsyncSession, plan_ids: list[int] | None = None, shard: Shard | None = None
+) -> list[tuple]:
+    """Bugun va ertaga uchun hali eslatilmagan vaqtli rejalar (reminder queue uchun)"""
+    today = datetime.now(TIMEZONE).date()
+
+    query = (
+        select(
+            Plan.id, User.telegram_id, Plan.title,
+            Plan.scheduled_time, Plan.score_value, Plan.plan_date
+        )
+        .join(User, User.id == Plan.user_id)
+        .where(
+            and_(
+                Plan.plan_date >= today,
+                Plan.plan_date <= today + timedelta(days=1),
+                Plan.status == PlanStatus.pending,
+                Plan.notified_at == None,
+                Plan.scheduled_time != None,
+                in_shard(Plan.user_id, shard)
+            )
+        )
+    )
+    if plan_ids is not None:
+        query = query.where(Plan.id.in_(plan_ids))
+    result = await session.execute(query)
+    return result.all()
 
 
 async def move_plan_to_tomorrow(session: AsyncSession, plan: Plan) -> Plan:
@@ -110,10 +265,16 @@ async def move_plan_to_tomorrow(session: AsyncSession, plan: Plan) -> Plan:
         status=PlanStatus.pending,
     )
     session.add(new_plan)
-    
+    await bump_daily_stats(session, new_plan.user_id, tomorrow, planned=1)
+
+    if plan.status != PlanStatus.failed:
+        await bump_daily_stats(session, plan.user_id, plan.plan_date, failed=1, **status_deltas(plan.status, -1))
     plan.status = PlanStatus.failed
-    await session.commit()
-    await session.refresh(new_plan)
+    await session.flush()
+
+    old_plan_id = plan.id
+    telegram_id = await get_telegram_id(session, new_plan.user_id)
+    after_commit(session, lambda: (reminders.discard(old_plan_id), reminders.add(new_plan, telegram_id)))
     return new_plan
 
 
@@ -131,6 +292,9 @@ async def duplicate_plan_for_tomorrow(session: AsyncSession, plan: Plan) -> Plan
         status=PlanStatus.pending,
     )
     session.add(new_plan)
-    await session.commit()
-    await session.refresh(new_plan)
+    await bump_daily_stats(session, new_plan.user_id, tomorrow, planned=1)
+    await session.flush()
+
+    telegram_id = await get_telegram_id(session, new_plan.user_id)
+    after_commit(session, lambda: reminders.add(new_plan, telegram_id))
     return new_plan
\ No newline at end of file
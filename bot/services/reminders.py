@@ -0,0 +1,210 @@
+import asyncio
+import heapq
+import logging
+from datetime import datetime
+from typing import Awaitable, Callable, NamedTuple
+
+from bot.config import TIMEZONE
+
+logger = logging.getLogger(__name__)
+
+
+class Reminder(NamedTuple):
+    plan_id: int
+    telegram_id: int
+    title: str
+    scheduled_time: str
+    score_value: int
+    fire_at: datetime
+
+
+def reminder_fire_at(plan_date, scheduled_time: str | None) -> datetime | None:
+    """plan_date + "HH:MM" → Tashkent vaqtidagi aniq moment"""
+    if not scheduled_time or not plan_date:
+        return None
+    try:
+        at = datetime.strptime(scheduled_time, "%H:%M").time()
+    except ValueError:
+        return None
+    return TIMEZONE.localize(datetime.combine(plan_date, at))
+
+
+def _from_row(row) -> Reminder | None:
+    plan_id, telegram_id, title, scheduled_time, score_value, plan_date = row
+    fire_at = reminder_fire_at(plan_date, scheduled_time)
+    if fire_at is None:
+        return None
+    return Reminder(plan_id, telegram_id, title, scheduled_time, score_value, fire_at)
+
+
+class ReminderQueue:
+    """Yaqin eslatmalar uchun xotiradagi heap.
+
+    Startupda va reconciliation jobida DBdan to'liq yuklanadi, reja
+    yaratish/o'chirish/ko'chirishda esa shu yerning o'zida yangilanadi.
+    O'chirilgan yozuvlar heapdan darhol olinmaydi — pop qilinganda
+    `_entries` bilan solishtirib tashlab yuboriladi.
+
+    Navbat faqat lider replikada (sharded rejimda — har bir workerda, faqat
+    o'z shardi uchun) ishlaydi. Navbat bu rejani boshqarmasa, add/discard
+    `on_change` orqali plan_id ni tegishli replikaga uzatadi.
+    """
+
+    def __init__(self):
+        self._heap: list[tuple[datetime, int]] = []
+        self._entries: dict[int, Reminder] = {}
+        self._touched: dict[int, int] = {}   # plan_id → o'zgarish versiyasi
+        self._version = 0
+        self._wakeup = asyncio.Event()
+        self._tasks: set[asyncio.Task] = set()
+        self._runner: asyncio.Task | None = None
+        self.on_change: Callable[[int], None] | None = None
+        self.owns: Callable[[int], bool] | None = None   # sharded rejim: user_id shu workerdami
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def running(self) -> bool:
+        return self._runner is not None and not self._runner.done()
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def _touch(self, plan_id: int):
+        self._version += 1
+        self._touched[plan_id] = self._version
+
+    def _push(self, reminder: Reminder) -> bool:
+        # Joriy daqiqadan oldingi vaqtlar eslatilmaydi
+        now = datetime.now(TIMEZONE).replace(second=0, microsecond=0)
+        if reminder.fire_at < now:
+            self._entries.pop(reminder.plan_id, None)
+            return False
+        self._entries[reminder.plan_id] = reminder
+        heapq.heappush(self._heap, (reminder.fire_at, reminder.plan_id))
+        if self._heap[0][1] == reminder.plan_id:
+            self._wakeup.set()
+        return True
+
+    def _forward(self, plan_id: int, user_id: int | None = None) -> bool:
+        """Reja bu navbatga tegishli bo'lmasa — o'zgarishni boshqa replikaga uzatadi"""
+        local = self.running and (self.owns is None or user_id is None or self.owns(user_id))
+        # Sharded rejimda discard qaysi shardga tegishli ekani noma'lum — hammaga uzatiladi
+        if (not local or (self.owns is not None and user_id is None)) and self.on_change is not None:
+            self.on_change(plan_id)
+        return not local
+
+    def add(self, plan, telegram_id: int):
+        """Yangi/ko'chirilgan reja uchun eslatma qo'shadi (vaqti bo'lsa)"""
+        if self._forward(plan.id, plan.user_id):
+            return
+        self._touch(plan.id)
+        fire_at = reminder_fire_at(plan.plan_date, plan.scheduled_time)
+        if fire_at is None:
+            self._entries.pop(plan.id, None)
+            return
+        self._push(Reminder(plan.id, telegram_id, plan.title, plan.scheduled_time, plan.score_value, fire_at))
+
+    def discard(self, plan_id: int):
+        if self._forward(plan_id):
+            return
+        self._touch(plan_id)
+        self._entries.pop(plan_id, None)
+
+    def load(self, rows, since_version: int):
+        """DBdagi holat bilan almashtiradi.
+
+        `since_version` — query boshlangandagi versiya. Undan keyin
+        add/discard qilingan rejalar xotiradagi holatida qoladi, chunki
+        query natijasi ular uchun allaqachon eskirgan.
+        """
+        entries = {}
+        for row in rows:
+            reminder = _from_row(row)
+            if reminder is not None:
+                entries[reminder.plan_id] = reminder
+
+        for plan_id, version in self._touched.items():
+            if version > since_version:
+                if plan_id in self._entries:
+                    entries[plan_id] = self._entries[plan_id]
+                else:
+                    entries.pop(plan_id, None)
+        self._touched = {k: v for k, v in self._touched.items() if v > since_version}
+
+        self._entries = {}
+        self._heap = []
+        for reminder in entries.values():
+            self._push(reminder)
+        self._wakeup.set()
+
+    def apply(self, plan_ids, rows, since_version: int):
+        """Faqat `plan_ids` rejalarini DBdagi holat bilan yangilaydi (boshqa replikadagi o'zgarishlar)"""
+        found = {row[0]: row for row in rows}
+        for plan_id in plan_ids:
+            if self._touched.get(plan_id, 0) > since_version:
+                continue  # Query davomida shu yerda o'zgargan
+            self._entries.pop(plan_id, None)
+            reminder = _from_row(found[plan_id]) if plan_id in found else None
+            if reminder is not None:
+                self._push(reminder)
+
+    def pop_due(self, now: datetime) -> list[Reminder]:
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            fire_at, plan_id = heapq.heappop(self._heap)
+            reminder = self._entries.get(plan_id)
+            if reminder is None or reminder.fire_at != fire_at:
+                continue  # o'chirilgan yoki vaqti o'zgargan
+            del self._entries[plan_id]
+            due.append(reminder)
+        return due
+
+    def _next_fire_at(self) -> datetime | None:
+        while self._heap:
+            fire_at, plan_id = self._heap[0]
+            reminder = self._entries.get(plan_id)
+            if reminder is not None and reminder.fire_at == fire_at:
+                return fire_at
+            heapq.heappop(self._heap)
+        return None
+
+    def start(self, on_due: Callable[[list[Reminder]], Awaitable[None]]):
+        if not self.running:
+            self._runner = asyncio.create_task(self.run(on_due))
+
+    async def stop(self):
+        """Liderlik yo'qolganda — navbat to'xtaydi va tozalanadi"""
+        if self._runner is not None:
+            self._runner.cancel()
+            await asyncio.gather(self._runner, return_exceptions=True)
+            self._runner = None
+        self._entries = {}
+        self._heap = []
+        self._touched = {}
+
+    async def run(self, on_due: Callable[[list[Reminder]], Awaitable[None]]):
+        """Eslatmalarni aniq vaqtida `on_due` ga beradi"""
+        while True:
+            self._wakeup.clear()
+            now = datetime.now(TIMEZONE)
+            due = self.pop_due(now)
+            if due:
+                task = asyncio.create_task(on_due(due))
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+
+            next_at = self._next_fire_at()
+            # Soat o'zgarishlaridan himoya — eng ko'pi bilan 30 sekund uxlaydi
+            timeout = 30.0
+            if next_at is not None:
+                timeout = min(timeout, max((next_at - datetime.now(TIMEZONE)).total_seconds(), 0))
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
+
+
+reminders = ReminderQueue()
@@ -1,188 +1,470 @@
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
-from sqlalchemy import select, and_
-from datetime import datetime
+from apscheduler.triggers.interval import IntervalTrigger
+from datetime import datetime, timedelta
+
+import asyncio
+from functools import wraps
 
 from database.db import AsyncSessionLocal
-from bot.models.plan import Plan, PlanStatus
-from bot.models.user import User
-from bot.config import SUMMARY_HOUR, SUMMARY_MINUTE, PENDING_CHECK_HOUR, PENDING_CHECK_MINUTE, TIMEZONE
+from database.listener import listener
+from bot.services.delivery import delivery, DeliveryStatus
+from bot.services.reminders import reminders, reminder_fire_at, Reminder
+from bot.services.leader import elector
+from bot.services.shards import membership
+from bot.config import (
+    SUMMARY_HOUR, SUMMARY_MINUTE, PENDING_CHECK_HOUR, PENDING_CHECK_MINUTE,
+    REMINDER_RECONCILE_MINUTES, REMINDER_CATCHUP_MAX_MINUTES, TIMEZONE, NODE_ID, SCHEDULER_MODE,
+    EXTRACT_CACHE_STORAGE, BROADCAST_LEASE_SECONDS
+)
 
 scheduler = AsyncIOScheduler(timezone=str(TIMEZONE))
 
+# Kunlik joblar failoverdan keyin ham ishlashi uchun (lekin ikki marta emas)
+DAILY_JOB_GRACE_SECONDS = 300
 
-async def send_plan_notifications(bot):
-    """Har daqiqada — vaqti kelgan rejalarni eslatadi (Tashkent vaqti)"""
-    async with AsyncSessionLocal() as session:
-        from bot.services.plan_service import get_pending_plans_to_notify
-        plans = await get_pending_plans_to_notify(session)
+# Sharded kunlik joblardan keyin lider chetda qolgan userlarni shuncha daqiqadan so'ng qamraydi
+DAILY_SWEEP_DELAY_MINUTES = 5
+
+REMINDERS_CHANNEL = "plan_reminders"
+
+
+SHARDED = SCHEDULER_MODE == "sharded"
+
+
+def current_shard():
+    """Sharded rejimda shu workerning (index, count) i, aks holda None — hamma userlar"""
+    return membership.shard if SHARDED else None
+
+
+def leader_job(job_id: str, func, dedupe_seconds: int | None = None, sharded: bool = False):
+    """Jobni faqat liderda ishlatadi va har bir ishga tushishni job_runs ga yozadi.
+
+    `sharded=True` joblar sharded rejimda har bir workerda o'z shardi bilan ishlaydi.
+    """
+    @wraps(func)
+    async def run(*args):
+        from bot.services.job_run_service import start_job_run, finish_job_run, has_recent_job_run
+
+        run_key = job_id
+        if sharded and SHARDED:
+            shard = membership.shard
+            if shard is None:
+                return
+            run_key = f"{job_id}:{shard[0]}/{shard[1]}"
+        elif not elector.is_leader:
+            return
+
+        async with AsyncSessionLocal() as session:
+            if dedupe_seconds and await has_recent_job_run(session, run_key, dedupe_seconds):
+                return
+            run_id = await start_job_run(session, run_key, NODE_ID)
 
-        for plan in plans:
-            user_result = await session.execute(
-                select(User).where(User.id == plan.user_id)
-            )
-            user = user_result.scalar_one_or_none()
-            if not user:
-                continue
+        status, error = "ok", None
+        try:
+            await func(*args)
+        except Exception as e:
+            status, error = "error", f"{type(e).__name__}: {e}"
+            print(f"Job {job_id} error: {error}")
+        finally:
+            async with AsyncSessionLocal() as session:
+                await finish_job_run(session, run_id, status, error)
 
-            from bot.keyboards.plan_keys import done_failed_keyboard
+    return run
 
+
+async def send_reminders(bot, due: list[Reminder]):
+    """Vaqti kelgan eslatmalarni yuboradi.
+
+    Avval rejalar band qilinadi (claim), keyin faqat band qilinganlari
+    yuboriladi — reminder queue va catch-up bir vaqtda ishlasa ham
+    eslatma ikki marta ketmaydi. Yuborilmaganlari qaytarib qo'yiladi.
+    """
+    from bot.services.plan_service import claim_plans_for_notify, release_plans_notify
+    from bot.keyboards.plan_keys import done_failed_keyboard
+
+    async with AsyncSessionLocal() as session:
+        claimed = await claim_plans_for_notify(session, [r.plan_id for r in due])
+        await session.commit()
+    due = [r for r in due if r.plan_id in claimed]
+    if not due:
+        return
+
+    results = await delivery.send_many(bot, [
+        {
+            "chat_id": r.telegram_id,
+            "text": (
+                f"⏰ <b>Vaqt bo'ldi!</b>\n\n"
+                f"📌 <b>{r.title}</b>\n"
+                f"🕐 {r.scheduled_time}\n\n"
+                f"✅ Bajarsangiz <b>+{r.score_value} ball</b>\n"
+                f"❌ Bajarmasangiz <b>-3 ball</b>"
+            ),
+            "parse_mode": "HTML",
+            "reply_markup": done_failed_keyboard(r.plan_id),
+        }
+        for r in due
+    ])
+    undelivered = [r.plan_id for r, status in zip(due, results) if status != DeliveryStatus.sent]
+
+    if undelivered:
+        async with AsyncSessionLocal() as session:
             try:
-                await bot.send_message(
-                    chat_id=user.telegram_id,
-                    text=(
-                        f"⏰ <b>Vaqt bo'ldi!</b>\n\n"
-                        f"📌 <b>{plan.title}</b>\n"
-                        f"🕐 {plan.scheduled_time}\n\n"
-                        f"✅ Bajarsangiz <b>+{plan.score_value} ball</b>\n"
-                        f"❌ Bajarmasangiz <b>-3 ball</b>"
-                    ),
-                    parse_mode="HTML",
-                    reply_markup=done_failed_keyboard(plan.id)
-                )
-                # Database timezone-naive datetime kutadi
-                plan.notified_at = datetime.now(TIMEZONE).replace(tzinfo=None)
+                await release_plans_notify(session, undelivered)
                 await session.commit()
             except Exception as e:
                 await session.rollback()
                 print(f"Notification error: {e}")
 
 
+async def send_plan_notifications(bot):
+    """Catch-up — oxirgi qayta ishlangan daqiqadan hozirgacha eslatilmay qolgan rejalar.
+
+    Jarayon o'chib qolgan, kechikkan yoki misfire bo'lgan daqiqalarni
+    yopadi. Watermark DBda saqlanadi, shuning uchun restartdan keyin ham ishlaydi;
+    oyna REMINDER_CATCHUP_MAX_MINUTES bilan cheklangan.
+    """
+    from bot.services.plan_service import (
+        get_pending_plans_to_notify, get_notify_watermark, advance_notify_watermark
+    )
+
+    now_minute = datetime.now(TIMEZONE).replace(second=0, microsecond=0, tzinfo=None)
+
+    shard = current_shard()
+    async with AsyncSessionLocal() as session:
+        since = await get_notify_watermark(session)
+        if since is None:
+            since = now_minute - timedelta(minutes=REMINDER_RECONCILE_MINUTES)
+        if SHARDED:
+            # Watermark umumiy — boshqa shard uni bizdan oldin surib qo'ygan bo'lishi mumkin
+            since = min(since, now_minute - timedelta(minutes=2 * REMINDER_RECONCILE_MINUTES))
+        # Soatlab to'xtab qolgan bo'lsak ham hamma eski eslatmalar birdan yuborilmasin
+        since = max(since, now_minute - timedelta(minutes=REMINDER_CATCHUP_MAX_MINUTES))
+        rows = await get_pending_plans_to_notify(session, since, now_minute, shard)
+
+    due = []
+    for plan, telegram_id in rows:
+        fire_at = reminder_fire_at(plan.plan_date, plan.scheduled_time)
+        if fire_at is not None:
+            due.append(Reminder(plan.id, telegram_id, plan.title, plan.scheduled_time, plan.score_value, fire_at))
+    if due:
+        await send_reminders(bot, due)
+
+    async with AsyncSessionLocal() as session:
+        await advance_notify_watermark(session, now_minute)
+        await session.commit()
+
+
+async def reconcile_reminders(bot):
+    """Reminder queue ni DB bilan solishtiradi va o'tib ketgan daqiqalarni yopadi"""
+    from bot.services.plan_service import get_upcoming_reminders
+
+    since_version = reminders.version
+    async with AsyncSessionLocal() as session:
+        rows = await get_upcoming_reminders(session, shard=current_shard())
+    reminders.load(rows, since_version)
+
+    await send_plan_notifications(bot)
+
+
+async def refresh_reminders(payload: str):
+    """Boshqa replikada o'zgargan rejalar — shu yerdagi navbatda yangilanadi"""
+    from bot.services.plan_service import get_upcoming_reminders
+
+    if not reminders.running:
+        return
+    plan_ids = [int(x) for x in payload.split(",") if x]
+    since_version = reminders.version
+    async with AsyncSessionLocal() as session:
+        rows = await get_upcoming_reminders(session, plan_ids, current_shard())
+    reminders.apply(plan_ids, rows, since_version)
+
+
+_changed_plan_ids: set[int] = set()
+_publish_task: asyncio.Task | None = None
+
+
+def publish_reminder_change(plan_id: int):
+    """Reja boshqa replikaning navbatiga tegishli — plan_id lar to'planib NOTIFY qilinadi"""
+    global _publish_task
+    _changed_plan_ids.add(plan_id)
+    if _publish_task is None or _publish_task.done():
+        _publish_task = asyncio.create_task(_flush_reminder_changes())
+
+
+async def _flush_reminder_changes():
+    await asyncio.sleep(0)
+    while _changed_plan_ids:
+        # NOTIFY payload 8000 baytdan oshmasin
+        batch = [_changed_plan_ids.pop() for _ in range(min(500, len(_changed_plan_ids)))]
+        try:
+            await listener.notify(REMINDERS_CHANNEL, ",".join(map(str, batch)))
+        except Exception as e:
+            # Lider baribir reconcile da DBdan qayta yuklaydi
+            print(f"Reminder notify error: {e}")
+
+
 async def send_daily_summary(bot):
     """Har kuni 23:59 da kunlik hisobot (Tashkent vaqti)"""
+    await _summarize_day(bot, datetime.now(TIMEZONE).date(), current_shard())
+
+
+async def sweep_daily_summary(bot):
+    """Sharded rejimda summarydan keyin liderda — hech bir shardga tushmay qolgan userlar.
+
+    Workerlar shardlar bo'yicha kelisha olmagan paytda ba'zi userlar hech
+    kimga tushmaydi; streak kuniga bir marta yangilangani uchun bu yerda
+    faqat o'shalar hisoblanadi.
+    """
+    day = (datetime.now(TIMEZONE) - timedelta(minutes=DAILY_SWEEP_DELAY_MINUTES)).date()
+    await _summarize_day(bot, day, None)
+
+
+async def _summarize_day(bot, day, shard):
+    from bot.services.plan_service import get_daily_plan_counts
+    from bot.services.user_service import bulk_update_streaks
+
     async with AsyncSessionLocal() as session:
-        today = datetime.now(TIMEZONE).date()
-        
-        users_result = await session.execute(
-            select(User).where(User.is_active == True)
-        )
-        users = users_result.scalars().all()
-
-        for user in users:
-            plans_result = await session.execute(
-                select(Plan).where(
-                    and_(
-                        Plan.user_id == user.id,
-                        Plan.plan_date == today
-                    )
-                )
-            )
-            plans = plans_result.scalars().all()
-
-            if not plans:
-                continue
-
-            done = [p for p in plans if p.status == PlanStatus.done]
-            failed = [p for p in plans if p.status == PlanStatus.failed]
-            pending = [p for p in plans if p.status == PlanStatus.pending]
-
-            # Streak yangilash
-            if done:
-                user.streak += 1
-            elif failed and not done:
-                user.streak = 0
-            
-            try:
-                await session.commit()
-            except Exception:
-                await session.rollback()
+        rows = await get_daily_plan_counts(session, day, shard)
 
-            from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
-            keyboard = InlineKeyboardMarkup(inline_keyboard=[
-                [InlineKeyboardButton(text="📊 Batafsil hisobot", callback_data="report")]
-            ])
+        # Streak yangilash: bajargan bo'lsa +1, faqat bajarmagan bo'lsa — 0.
+        # Shu kun uchun boshqa worker allaqachon yangilagan userlar qaytmaydi
+        # va ularga hisobot ikkinchi marta yuborilmaydi.
+        increment_ids = [row.id for row in rows if row.done]
+        reset_ids = [row.id for row in rows if row.failed and not row.done]
+        keep_ids = [row.id for row in rows if not row.done and not row.failed]
+        try:
+            streaks = await bulk_update_streaks(session, day, increment_ids, reset_ids, keep_ids)
+            await session.commit()
+        except Exception as e:
+            await session.rollback()
+            print(f"Summary error: {e}")
+            return
 
-            try:
-                await bot.send_message(
-                    chat_id=user.telegram_id,
-                    text=(
-                        f"🌙 <b>Kunlik hisobot</b>\n\n"
-                        f"✅ Bajarildi: <b>{len(done)} ta</b>\n"
-                        f"❌ Bajarilmadi: <b>{len(failed)} ta</b>\n"
-                        f"⏳ Eslatilmadi: <b>{len(pending)} ta</b>\n\n"
-                        f"🏆 Umumiy ball: <b>{user.total_score}</b>\n"
-                        f"🔥 Streak: <b>{user.streak} kun</b>"
-                    ),
-                    parse_mode="HTML",
-                    reply_markup=keyboard
-                )
-            except Exception as e:
-                print(f"Summary error: {e}")
+    from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
+    keyboard = InlineKeyboardMarkup(inline_keyboard=[
+        [InlineKeyboardButton(text="📊 Batafsil hisobot", callback_data="report")]
+    ])
+    messages = []
+
+    for row in rows:
+        if row.id not in streaks:
+            continue
+
+        messages.append({
+            "chat_id": row.telegram_id,
+            "text": (
+                f"🌙 <b>Kunlik hisobot</b>\n\n"
+                f"✅ Bajarildi: <b>{row.done} ta</b>\n"
+                f"❌ Bajarilmadi: <b>{row.failed} ta</b>\n"
+                f"⏳ Eslatilmadi: <b>{row.pending} ta</b>\n\n"
+                f"🏆 Umumiy ball: <b>{row.total_score}</b>\n"
+                f"🔥 Streak: <b>{streaks[row.id]} kun</b>"
+            ),
+            "parse_mode": "HTML",
+            "reply_markup": keyboard,
+        })
+
+    await delivery.send_many(bot, messages)
 
 
 async def check_pending_plans(bot):
-    """Har kuni 23:00 da pending rejalarni tekshiradi (Tashkent vaqti)"""
+    """Har kuni 23:00 da pending rejalarni tekshiradi (Tashkent vaqti) — har bir userga bitta xabar"""
+    await _check_pending_day(bot, datetime.now(TIMEZONE).date(), current_shard())
+
+
+async def sweep_pending_check(bot):
+    """Sharded rejimda pending checkdan keyin liderda — hech bir shardga tushmay qolgan userlar"""
+    day = (datetime.now(TIMEZONE) - timedelta(minutes=DAILY_SWEEP_DELAY_MINUTES)).date()
+    await _check_pending_day(bot, day, None)
+
+
+async def _check_pending_day(bot, day, shard):
+    from itertools import groupby
+    from bot.services.plan_service import get_all_pending_plans_today
+    from bot.services.user_service import claim_pending_check, release_pending_check
+    from bot.keyboards.plan_keys import pending_check_keyboard
+    from bot.utils.formatters import format_pending_check
+
+    # (user, kun) avval band qilinadi — shardlar kelisha olmagan paytda
+    # ikki worker bitta userga tekshiruvni ikki marta yubormaydi
     async with AsyncSessionLocal() as session:
-        today = datetime.now(TIMEZONE).date()
-        
-        result = await session.execute(
-            select(Plan).where(
-                and_(
-                    Plan.status == PlanStatus.pending,
-                    Plan.plan_date == today
-                )
-            )
-        )
-        pending_plans = result.scalars().all()
-
-        for plan in pending_plans:
-            user_result = await session.execute(
-                select(User).where(User.id == plan.user_id)
-            )
-            user = user_result.scalar_one_or_none()
-            if not user:
-                continue
-
-            from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
-            keyboard = InlineKeyboardMarkup(inline_keyboard=[
-                [
-                    InlineKeyboardButton(text="✅ Bajardim", callback_data=f"done_{plan.id}"),
-                    InlineKeyboardButton(text="❌ Bajarmadim", callback_data=f"failed_{plan.id}"),
-                ],
-                [
-                    InlineKeyboardButton(text="📅 Ertaga", callback_data=f"tomorrow_{plan.id}"),
-                ]
-            ])
+        rows = await get_all_pending_plans_today(session, shard, day)
+        claimed = await claim_pending_check(session, day, sorted({plan.user_id for plan, _ in rows}))
+        await session.commit()
+
+    user_ids, messages = [], []
+    for telegram_id, group in groupby(rows, key=lambda row: row[1]):
+        plans = [plan for plan, _ in group]
+        if plans[0].user_id not in claimed:
+            continue
+        user_ids.append(plans[0].user_id)
+        messages.append({
+            "chat_id": telegram_id,
+            "text": format_pending_check(plans),
+            "parse_mode": "HTML",
+            "reply_markup": pending_check_keyboard(plans, plans[0].plan_date),
+        })
 
+    results = await delivery.send_many(bot, messages)
+    undelivered = [user_id for user_id, status in zip(user_ids, results) if status == DeliveryStatus.failed]
+
+    if undelivered:
+        async with AsyncSessionLocal() as session:
             try:
-                await bot.send_message(
-                    chat_id=user.telegram_id,
-                    text=(
-                        f"🌙 <b>Kun tugadi</b>\n\n"
-                        f"📌 <b>{plan.title}</b>\n"
-                        f"{f'🕐 {plan.scheduled_time}' if plan.scheduled_time else '🕐 Vaqtsiz'}\n\n"
-                        f"Bu rejani bajardingizmi?"
-                    ),
-                    parse_mode="HTML",
-                    reply_markup=keyboard
-                )
+                await release_pending_check(session, day, undelivered)
+                await session.commit()
             except Exception as e:
+                await session.rollback()
                 print(f"Pending check error: {e}")
 
 
-def start_scheduler(bot):
-    # Har daqiqa — vaqti kelgan rejalar
+async def cleanup_fsm_states(storage):
+    """Tashlab ketilgan FSM holatlarini tozalaydi"""
+    try:
+        deleted = await storage.cleanup_expired()
+        if deleted:
+            print(f"🧹 {deleted} ta eskirgan FSM holati o'chirildi")
+    except Exception as e:
+        print(f"FSM cleanup error: {e}")
+
+
+async def cleanup_ai_cache():
+    """Muddati o'tgan GPT/Whisper natijalari (reja tahlili va transcript cache)"""
+    from bot.services import extraction_cache, transcript_cache
+    try:
+        deleted = await extraction_cache.cleanup_expired()
+        if deleted:
+            print(f"🧹 {deleted} ta eskirgan reja tahlili o'chirildi")
+        deleted = await transcript_cache.cleanup_expired()
+        if deleted:
+            print(f"🧹 {deleted} ta eskirgan transcript o'chirildi")
+    except Exception as e:
+        print(f"AI cache cleanup error: {e}")
+
+
+async def resume_orphaned_broadcasts(bot):
+    from bot.services.broadcast_service import resume_broadcasts
+    await resume_broadcasts(bot)
+
+
+async def _on_elected(bot):
+    from bot.services.broadcast_service import resume_broadcasts
+
+    if not SHARDED:
+        reminders.start(lambda due: send_reminders(bot, due))
+        # Navbatni darhol DBdan yuklaymiz (eski lider to'xtagan joydan catch-up)
+        scheduler.modify_job("reminder_reconcile", next_run_time=datetime.now(TIMEZONE))
+        scheduler.resume()
+    # Chala qolgan broadcastlar — darhol, keyin broadcast_resume jobida davriy
+    await resume_broadcasts(bot)
+
+
+async def _on_demoted():
+    if not SHARDED:
+        scheduler.pause()
+        await reminders.stop()
+
+
+async def _on_rebalance(bot):
+    """Workerlar soni o'zgardi — navbat yangi shard bo'yicha qayta yuklanadi"""
+    if membership.shard is None:
+        await reminders.stop()
+        return
+    reminders.start(lambda due: send_reminders(bot, due))
+    # Yangi olingan shard uchun o'tib ketgan eslatmalar ham shu yerda yuboriladi;
+    # eski egasi bilan ustma-ust tushsa claim ikki marta yuborishga yo'l qo'ymaydi
+    await reconcile_reminders(bot)
+
+
+def start_scheduler(bot, storage=None):
+    """Joblar hamma replikada ro'yxatdan o'tadi.
+
+    "leader" rejimida scheduler pauzada boshlanadi va faqat saylangan
+    liderda davom ettiriladi. "sharded" rejimida eslatmalar, summary va
+    pending check har bir workerda o'z shardi bilan ishlaydi; lider faqat
+    yakka ishlarni (FSM tozalash, broadcastlarni davom ettirish) bajaradi.
+    """
+    # Boshqa replikalardagi reja o'zgarishlari → tegishli reminder queue
+    reminders.on_change = publish_reminder_change
+    if SHARDED:
+        reminders.owns = membership.owns
+    listener.on(REMINDERS_CHANNEL, refresh_reminders)
+    listener.start()
+
+    # Har N daqiqada — navbatni DB bilan solishtirish
     scheduler.add_job(
-        send_plan_notifications,
-        trigger=CronTrigger(minute="*", timezone=str(TIMEZONE)),
+        leader_job("reminder_reconcile", reconcile_reminders, sharded=True),
+        trigger=IntervalTrigger(minutes=REMINDER_RECONCILE_MINUTES, timezone=str(TIMEZONE)),
         args=[bot],
-        id="plan_notifications"
+        id="reminder_reconcile"
     )
     
     # 23:59 (Tashkent) — kunlik summary
     scheduler.add_job(
-        send_daily_summary,
+        leader_job("daily_summary", send_daily_summary, dedupe_seconds=DAILY_JOB_GRACE_SECONDS, sharded=True),
         trigger=CronTrigger(hour=SUMMARY_HOUR, minute=SUMMARY_MINUTE, timezone=str(TIMEZONE)),
         args=[bot],
-        id="daily_summary"
+        id="daily_summary",
+        misfire_grace_time=DAILY_JOB_GRACE_SECONDS
     )
+
+    if SHARDED:
+        # Shardlar kelisha olmagan paytda chetda qolgan userlar — liderda
+        sweep_at = (SUMMARY_HOUR * 60 + SUMMARY_MINUTE + DAILY_SWEEP_DELAY_MINUTES) % (24 * 60)
+        scheduler.add_job(
+            leader_job("daily_summary_sweep", sweep_daily_summary, dedupe_seconds=DAILY_JOB_GRACE_SECONDS),
+            trigger=CronTrigger(hour=sweep_at // 60, minute=sweep_at % 60, timezone=str(TIMEZONE)),
+            args=[bot],
+            id="daily_summary_sweep",
+            misfire_grace_time=DAILY_JOB_GRACE_SECONDS
+        )
     
     # 23:00 (Tashkent) — pending check
     scheduler.add_job(
-        check_pending_plans,
+        leader_job("pending_check", check_pending_plans, dedupe_seconds=DAILY_JOB_GRACE_SECONDS, sharded=True),
         trigger=CronTrigger(hour=PENDING_CHECK_HOUR, minute=PENDING_CHECK_MINUTE, timezone=str(TIMEZONE)),
         args=[bot],
-        id="pending_check"
+        id="pending_check",
+        misfire_grace_time=DAILY_JOB_GRACE_SECONDS
+    )
+
+    if SHARDED:
+        sweep_at = (PENDING_CHECK_HOUR * 60 + PENDING_CHECK_MINUTE + DAILY_SWEEP_DELAY_MINUTES) % (24 * 60)
+        scheduler.add_job(
+            leader_job("pending_check_sweep", sweep_pending_check, dedupe_seconds=DAILY_JOB_GRACE_SECONDS),
+            trigger=CronTrigger(hour=sweep_at // 60, minute=sweep_at % 60, timezone=str(TIMEZONE)),
+            args=[bot],
+            id="pending_check_sweep",
+            misfire_grace_time=DAILY_JOB_GRACE_SECONDS
+        )
+
+    # Egasi o'lgan (lease muddati o'tgan) broadcastlarni davom ettirish
+    scheduler.add_job(
+        leader_job("broadcast_resume", resume_orphaned_broadcasts),
+        trigger=IntervalTrigger(seconds=BROADCAST_LEASE_SECONDS, timezone=str(TIMEZONE)),
+        args=[bot],
+        id="broadcast_resume"
     )
+
+    # Har soatda — muddati o'tgan FSM holatlari (faqat Postgres storage)
+    if hasattr(storage, "cleanup_expired"):
+        scheduler.add_job(
+            leader_job("fsm_cleanup", cleanup_fsm_states),
+            trigger=IntervalTrigger(hours=1, timezone=str(TIMEZONE)),
+            args=[storage],
+            id="fsm_cleanup"
+        )
     
-    scheduler.start()
\ No newline at end of file
+    # Har soatda — muddati o'tgan reja tahlili va transcript cache yozuvlari
+    if EXTRACT_CACHE_STORAGE == "postgres":
+        scheduler.add_job(
+            leader_job("ai_cache_cleanup", cleanup_ai_cache),
+            trigger=IntervalTrigger(hours=1, timezone=str(TIMEZONE)),
+            id="ai_cache_cleanup"
+        )
+
+    scheduler.start(paused=not SHARDED)
+    elector.start(on_elected=lambda: _on_elected(bot), on_demoted=_on_demoted)
+    if SHARDED:
+        membership.start(on_rebalance=lambda: _on_rebalance(bot))
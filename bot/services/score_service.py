@@ -1,9 +1,12 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, and_
+from database.db import after_commit
 from bot.models.score_log import ScoreLog
 from bot.models.plan import Plan, PlanStatus
 from bot.models.user import User
-from datetime import date
+from bot.services.reminders import reminders
+from bot.services.stats_service import bump_daily_stats, status_deltas
+from bot.services.user_service import add_to_score
+from bot.utils.timeutils import tashkent_today
 
 
 async def add_score_log(session: AsyncSession, user: User, plan: Plan, score_change: int, reason: str):
@@ -14,8 +17,8 @@ async def add_score_log(session: AsyncSession, user: User, plan: Plan, score_cha
         reason=reason
     )
     session.add(log)
-    user.total_score += score_change
-    await session.commit()
+    await add_to_score(session, user, score_change)
+    await bump_daily_stats(session, user.id, tashkent_today(), score_delta=score_change)
 
 
 async def process_plan_result(session: AsyncSession, user: User, plan: Plan, is_done: bool) -> int:
@@ -31,18 +34,16 @@ async def process_plan_result(session: AsyncSession, user: User, plan: Plan, is_
         reason = f"❌ '{plan.title}' bajarilmadi"
         plan.status = PlanStatus.failed
 
-    await session.commit()
+    await bump_daily_stats(session, plan.user_id, plan.plan_date, **status_deltas(plan.status))
+    plan_id = plan.id
+    after_commit(session, lambda: reminders.discard(plan_id))
     await add_score_log(session, user, plan, score_change, reason)
     return score_change
 
 
-async def get_today_score(session: AsyncSession, user: User) -> int:
-    result = await session.execute(
-        select(func.sum(ScoreLog.score_change)).where(
-            and_(
-                ScoreLog.user_id == user.id,
-                func.date(ScoreLog.created_at) == date.today()
-            )
-        )
-    )
-    return result.scalar() or 0
\ No newline at end of file
+async def process_all_pending(session: AsyncSession, user: User, plans: list[Plan], is_done: bool) -> int:
+    """Bir nechta pending rejani birdan belgilaydi, umumiy ball o'zgarishini qaytaradi"""
+    total = 0
+    for plan in plans:
+        total += await process_plan_result(session, user, plan, is_done)
+    return total
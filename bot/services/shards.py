@@ -0,0 +1,112 @@
+import asyncio
+import logging
+from datetime import timedelta
+from typing import Awaitable, Callable
+
+from sqlalchemy import select, delete, func, true
+from sqlalchemy.dialects.postgresql import insert
+
+from database.db import AsyncSessionLocal
+from bot.models.worker_heartbeat import WorkerHeartbeat
+from bot.config import NODE_ID, SHARD_HEARTBEAT_SECONDS, SHARD_TTL_SECONDS
+
+logger = logging.getLogger(__name__)
+
+Shard = tuple[int, int]   # (index, count)
+
+
+def in_shard(column, shard: Shard | None):
+    """SQL sharti: `column % count == index` (shard yo'q bo'lsa — hamma qatorlar)"""
+    if shard is None or shard[1] <= 1:
+        return true()
+    index, count = shard
+    return column % count == index
+
+
+def _utcnow():
+    # Vaqt DB soatidan olinadi — replikalar soati farq qilsa ham heartbeat to'g'ri ishlaydi
+    return func.timezone("UTC", func.now())
+
+
+class ShardMembership:
+    """Heartbeat jadvali orqali user_id larni tirik workerlar o'rtasida bo'lish.
+
+    Har bir worker har `heartbeat_seconds` da o'zini yozadi va oxirgi
+    `ttl_seconds` ichida ko'ringan workerlarni node_id bo'yicha tartiblab
+    oladi. Shard — shu ro'yxatdagi o'rni: `user_id % count == index`.
+    Worker qo'shilsa yoki o'lsa, keyingi heartbeatda hamma qayta bo'linadi.
+    """
+
+    def __init__(self, node_id: str, heartbeat_seconds: float = 5, ttl_seconds: float = 15):
+        self.node_id = node_id
+        self.heartbeat_seconds = heartbeat_seconds
+        self.ttl_seconds = ttl_seconds
+        self.members: list[str] = []
+        self._runner: asyncio.Task | None = None
+
+    @property
+    def shard(self) -> Shard | None:
+        if self.node_id not in self.members:
+            return None
+        return self.members.index(self.node_id), len(self.members)
+
+    def owns(self, user_id: int) -> bool:
+        shard = self.shard
+        return shard is not None and user_id % shard[1] == shard[0]
+
+    async def beat(self) -> list[str]:
+        async with AsyncSessionLocal() as session:
+            stmt = insert(WorkerHeartbeat).values(node_id=self.node_id, started_at=_utcnow(), last_seen=_utcnow())
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[WorkerHeartbeat.node_id], set_={"last_seen": _utcnow()}
+            )
+            await session.execute(stmt)
+
+            expired = _utcnow() - timedelta(seconds=self.ttl_seconds)
+            # O'lgan workerlarning eski yozuvlari
+            await session.execute(
+                delete(WorkerHeartbeat).where(WorkerHeartbeat.last_seen < _utcnow() - timedelta(days=1))
+            )
+            result = await session.execute(
+                select(WorkerHeartbeat.node_id)
+                .where(WorkerHeartbeat.last_seen >= expired)
+                .order_by(WorkerHeartbeat.node_id)
+            )
+            members = list(result.scalars().all())
+            await session.commit()
+        return members
+
+    def start(self, on_rebalance: Callable[[], Awaitable[None]]):
+        if self._runner is None or self._runner.done():
+            self._runner = asyncio.create_task(self.run(on_rebalance))
+
+    async def run(self, on_rebalance):
+        last_ok = asyncio.get_running_loop().time()
+        while True:
+            try:
+                members = await self.beat()
+                last_ok = asyncio.get_running_loop().time()
+            except Exception as e:
+                logger.warning(f"Heartbeat xatosi: {type(e).__name__}: {e}")
+                # TTL dan ko'p yozolmagan bo'lsak — boshqalar shardimizni allaqachon olgan
+                members = [] if asyncio.get_running_loop().time() - last_ok > self.ttl_seconds else self.members
+
+            if members != self.members:
+                self.members = members
+                logger.info(f"🔀 Shardlar qayta bo'lindi: {self.node_id} → {self.shard}")
+                try:
+                    await on_rebalance()
+                except Exception as e:
+                    logger.error(f"Rebalance xatosi: {type(e).__name__}: {e}")
+            await asyncio.sleep(self.heartbeat_seconds)
+
+    async def stop(self):
+        if self._runner is not None:
+            self._runner.cancel()
+            await asyncio.gather(self._runner, return_exceptions=True)
+        async with AsyncSessionLocal() as session:
+            await session.execute(delete(WorkerHeartbeat).where(WorkerHeartbeat.node_id == self.node_id))
+            await session.commit()
+
+
+membership = ShardMembership(NODE_ID, SHARD_HEARTBEAT_SECONDS, SHARD_TTL_SECONDS)
@@ -0,0 +1,69 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, func
+from sqlalchemy.dialects.postgresql import insert
+from datetime import date
+
+from bot.models.user_daily_stats import UserDailyStats
+from bot.models.plan import PlanStatus
+from bot.services.status_service import mark_status_dirty
+
+
+async def bump_daily_stats(
+    session: AsyncSession, user_id: int, day: date,
+    planned: int = 0, done: int = 0, failed: int = 0, score_delta: int = 0
+):
+    """user_daily_stats qatorini atomik oshiradi/kamaytiradi.
+
+    Commit qilmaydi — chaqiruvchi xom ma'lumot (plans / score_logs) bilan
+    bitta tranzaksiyada commit qiladi.
+    """
+    stmt = insert(UserDailyStats).values(
+        user_id=user_id, date=day,
+        planned=planned, done=done, failed=failed, score_delta=score_delta,
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[UserDailyStats.user_id, UserDailyStats.date],
+        set_={
+            "planned": UserDailyStats.planned + stmt.excluded.planned,
+            "done": UserDailyStats.done + stmt.excluded.done,
+            "failed": UserDailyStats.failed + stmt.excluded.failed,
+            "score_delta": UserDailyStats.score_delta + stmt.excluded.score_delta,
+        },
+    )
+    await session.execute(stmt)
+    mark_status_dirty(session, user_id)
+
+
+def status_deltas(status: PlanStatus | None, sign: int = 1) -> dict:
+    """Reja holati → bump_daily_stats uchun done/failed argumentlari"""
+    if status == PlanStatus.done:
+        return {"done": sign}
+    if status == PlanStatus.failed:
+        return {"failed": sign}
+    return {}
+
+
+async def get_daily_stats(session: AsyncSession, user_id: int, day: date) -> UserDailyStats:
+    """Bitta kunlik qator; hali yo'q bo'lsa — nollar bilan"""
+    stats = await session.get(UserDailyStats, (user_id, day), populate_existing=True)
+    if stats is None:
+        stats = UserDailyStats(user_id=user_id, date=day, planned=0, done=0, failed=0, score_delta=0)
+    return stats
+
+
+async def get_user_totals(session: AsyncSession, user_id: int) -> dict:
+    """User ning barcha kunlari bo'yicha yig'indi"""
+    result = await session.execute(
+        select(
+            func.coalesce(func.sum(UserDailyStats.planned), 0),
+            func.coalesce(func.sum(UserDailyStats.done), 0),
+            func.coalesce(func.sum(UserDailyStats.failed), 0),
+        ).where(UserDailyStats.user_id == user_id)
+    )
+    planned, done, failed = result.one()
+    return {
+        "total_plans": planned,
+        "done": done,
+        "failed": failed,
+        "pending": planned - done - failed,
+    }
@@ -0,0 +1,153 @@
+import asyncio
+import logging
+from dataclasses import dataclass
+from datetime import date
+
+from sqlalchemy import select, func, and_
+from sqlalchemy.orm import aliased
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from database.db import after_commit
+from bot.config import NODE_ID
+from bot.models.user import User
+from bot.models.user_daily_stats import UserDailyStats
+from bot.utils.cache import TTLCache
+from bot.utils.timeutils import tashkent_today
+
+logger = logging.getLogger(__name__)
+
+# user_id → (kun, StatusSnapshot); telegram_id → user_id — faqat qidirish indeksi.
+# Invalidatsiya user_id bo'yicha to'g'ridan-to'g'ri — indeks evict bo'lsa ham
+# eskirgan snapshot qolmaydi (faqat keyingi so'rov DBdan qayta o'qiydi).
+_snapshots = TTLCache(maxsize=10_000, ttl=300)
+_user_ids = TTLCache(maxsize=10_000, ttl=300)
+
+# Boshqa replikalar NOTIFY orqali tozalaydi; TTL — zaxira
+STATUSES_CHANNEL = "statuses_changed"
+_changed: set[str] = set()
+_publish_task: asyncio.Task | None = None
+
+
+@dataclass(frozen=True)
+class StatusSnapshot:
+    """"📊 Mening statusim" ekraniga kerak bo'lgan hamma narsa"""
+    user_id: int
+    full_name: str | None
+    total_score: int
+    streak: int
+    total_today: int
+    done_today: int
+    today_score: int
+    all_done: int
+
+
+def _drop(user_id: int):
+    _snapshots.pop(user_id)
+
+
+def _drop_all():
+    _snapshots.clear()
+    _user_ids.clear()
+
+
+def _publish(target: str):
+    """O'zgargan user_id lar to'planib bitta NOTIFY bilan yuboriladi"""
+    global _publish_task
+    _changed.add(target)
+    if _publish_task is None or _publish_task.done():
+        _publish_task = asyncio.create_task(_flush_changes())
+
+
+async def _flush_changes():
+    from database.listener import listener
+
+    await asyncio.sleep(0)
+    while _changed:
+        # NOTIFY payload 8000 baytdan oshmasin
+        if "*" in _changed:
+            _changed.clear()   # Hammasi tozalanadi — alohida id lar keraksiz
+            batch = ["*"]
+        else:
+            batch = [_changed.pop() for _ in range(min(500, len(_changed)))]
+        try:
+            await listener.notify(STATUSES_CHANNEL, f"{NODE_ID}|{','.join(batch)}")
+        except Exception as e:
+            logger.warning(f"Status NOTIFY xatosi: {e}")
+
+
+async def _on_statuses_changed(payload: str):
+    node_id, _, targets = payload.rpartition("|")
+    if node_id == NODE_ID:
+        return
+    if targets == "*":
+        _drop_all()
+        return
+    for user_id in targets.split(","):
+        if user_id:
+            _drop(int(user_id))
+
+
+def listen_status_changes():
+    """Boshqa replikada reja/ball o'zgarsa — bu yerdagi status cache ham tozalanadi"""
+    from database.listener import listener
+    listener.on(STATUSES_CHANNEL, _on_statuses_changed)
+
+
+def invalidate_status(user_id: int):
+    """Reja yoki ball o'zgarganda (commitdan keyin) chaqiriladi — shu yerda va boshqa replikalarda"""
+    _drop(user_id)
+    _publish(str(user_id))
+
+
+def mark_status_dirty(session: AsyncSession, user_id: int):
+    """Darhol (lokal) va commitdan keyin yana invalidatsiya qiladi.
+
+    Commitgacha boshqa so'rov eski qiymatni cache ga qaytarib yozib qo'yishi
+    mumkin — commitdan keyingi ikkinchi invalidatsiya buni tozalaydi.
+    """
+    _drop(user_id)
+    after_commit(session, lambda: invalidate_status(user_id))
+
+
+def invalidate_all_statuses():
+    """Ko'p userga tegadigan bulk o'zgarishlardan keyin (masalan, streaklar)"""
+    _drop_all()
+    _publish("*")
+
+
+async def _load_snapshot(session: AsyncSession, telegram_id: int, day: date) -> StatusSnapshot | None:
+    today = aliased(UserDailyStats)
+    all_done = (
+        select(func.coalesce(func.sum(UserDailyStats.done), 0))
+        .where(UserDailyStats.user_id == User.id)
+        .scalar_subquery()
+    )
+
+    result = await session.execute(
+        select(
+            User.id, User.full_name, User.total_score, User.streak,
+            func.coalesce(today.planned, 0),
+            func.coalesce(today.done, 0),
+            func.coalesce(today.score_delta, 0),
+            all_done,
+        )
+        .outerjoin(today, and_(today.user_id == User.id, today.date == day))
+        .where(User.telegram_id == telegram_id)
+    )
+    row = result.one_or_none()
+    return StatusSnapshot(*row) if row else None
+
+
+async def get_status_snapshot(session: AsyncSession, telegram_id: int) -> StatusSnapshot | None:
+    """Bitta query (user + bugungi rollup + jami bajarilgan), natija per-user cache da"""
+    day = tashkent_today()
+    user_id = _user_ids.get(telegram_id)
+    cached = _snapshots.get(user_id) if user_id is not None else None
+    if cached is not None and cached[0] == day:
+        return cached[1]
+
+    snapshot = await _load_snapshot(session, telegram_id, day)
+    if snapshot is not None:
+        _snapshots.set(snapshot.user_id, (day, snapshot))
+        _user_ids.set(telegram_id, snapshot.user_id)
+    return snapshot
@@ -0,0 +1,193 @@
+import re
+from dataclasses import dataclass
+from datetime import datetime, time, timedelta
+
+from bot.config import TIMEZONE
+from bot.utils.translit import has_cyrillic, is_uzbek_cyrillic, to_latin
+
+# ─────────────────────────────────────────
+#  Son so'zlar (uz / ru / en) → raqam
+# ─────────────────────────────────────────
+
+_UNITS = {
+    # uz
+    "bir": 1, "ikki": 2, "uch": 3, "to'rt": 4, "tort": 4, "besh": 5, "olti": 6,
+    "yetti": 7, "sakkiz": 8, "to'qqiz": 9, "toqqiz": 9,
+    # ru
+    "один": 1, "одну": 1, "одна": 1, "два": 2, "две": 2, "три": 3, "четыре": 4,
+    "пять": 5, "шесть": 6, "семь": 7, "восемь": 8, "девять": 9,
+    # en
+    "one": 1, "two": 2, "three": 3, "four": 4, "five": 5, "six": 6,
+    "seven": 7, "eight": 8, "nine": 9,
+}
+_TENS = {
+    "o'n": 10, "yigirma": 20, "o'ttiz": 30, "ottiz": 30, "qirq": 40, "ellik": 50,
+    "десять": 10, "двадцать": 20, "тридцать": 30, "сорок": 40, "пятьдесят": 50,
+    "ten": 10, "twenty": 20, "thirty": 30, "forty": 40, "fifty": 50,
+}
+_TEENS = {
+    "одиннадцать": 11, "двенадцать": 12, "пятнадцать": 15,
+    "eleven": 11, "twelve": 12, "fifteen": 15,
+}
+
+_NUMBER_WORDS = {**_UNITS, **_TENS, **_TEENS}
+_NUMBER_RE = re.compile(
+    r"(?<![\w'])(" + "|".join(sorted(map(re.escape, _NUMBER_WORDS), key=len, reverse=True)) + r")"
+    r"(?=(?:da|ga|dan|ta|chi)?(?![\w']))"
+)
+_COMPOUND_RE = re.compile(r"(?<!\d)([1-5]0) ([1-9])(?!\d)")
+
+
+def normalize(text: str) -> str:
+    """Kichik harf, o'zbek kirill → lotin, apostroflar bir xil, son so'zlar raqamga ("o'n besh" → "15")"""
+    text = text.lower().strip()
+    if has_cyrillic(text) and is_uzbek_cyrillic(text):
+        text = to_latin(text)
+    text = re.sub(r"[ʻʼ’‘`´]", "'", text)
+    text = _NUMBER_RE.sub(lambda m: str(_NUMBER_WORDS[m.group(1)]), text)
+    text = _COMPOUND_RE.sub(lambda m: str(int(m.group(1)) + int(m.group(2))), text)
+    return re.sub(r"\s+", " ", text)
+
+
+# ─────────────────────────────────────────
+#  Qoidalar
+# ─────────────────────────────────────────
+
+_PM = r"(?:kechqurun|kechki|kech|tushdan keyin|kunduzi|вечера|вечером|дня|днём|днем|pm|p\.m\.|evening|tonight|afternoon)"
+_AM = r"(?:ertalab|tongda|erta|утра|утром|am|a\.m\.|morning)"
+# "kechasi 2 da" — tun (02:00), "kechasi 11 da" — 23:00; "kech" dan oldin tekshiriladi
+_NIGHT = r"(?:kechasi|tunda|yarim tunda|ночи|ночью|(?<!to)night)"
+
+_MIN = r"(?:minut|minute|daqiqa|min|мин|минут|минуты|минуту|mins|minutes)"
+_HOUR = r"(?:soat|час|часа|часов|hour|hours|hr|hrs)"
+
+# "30 minutdan keyin", "1 soatdan so'ng", "yarim soatdan keyin", "1 yarim soatdan keyin",
+# "2 soat 30 minutdan keyin". "1.5 soatdan keyin" — o'nli son, "5 soat" deb o'qilmaydi
+_REL_UZ = re.compile(
+    rf"(?<!\d)(?<!\d[.,])(?:(\d+)\s*soat\s+(?=\d+\s*{_MIN}))?(?:(\d+)\s*)?(yarim\s*)?({_MIN}|soat)\w*\s*(?:dan|o'tib|keyin|so'ng)"
+)
+# "через 15 минут", "через час", "через полчаса", "через 2 часа", "через 2 часа 30 минут"
+_REL_RU = re.compile(rf"через\s*(?:(\d+)\s*)?(пол)?\s*({_MIN}\w*|{_HOUR}\w*)(?:\s+(\d+)\s*{_MIN}\w*)?")
+# "in 20 minutes", "in an hour", "in half an hour", "in 2 hours 30 minutes", "20 minutes later"
+_REL_EN = re.compile(
+    rf"(?:in\s+(?:(\d+)|an?|(half an?))\s*({_MIN}|hours?|hrs?)\b(?:\s+(?:and\s+)?(\d+)\s*{_MIN}\b)?"
+    rf"|(\d+)\s*({_MIN}|hours?)\s+later)"
+)
+# Nisbiy vaqt oldida qo'shib olinmagan davomiylik ("2 soat va 30 minutdan keyin") —
+# yig'indini taxmin qilmaymiz, vaqt topilmadi deb GPT ga qoldiramiz
+_DURATION_BEFORE = re.compile(rf"(?:\d+|yarim)\s*(?:{_HOUR}|{_MIN})\w*\s*(?:va|и|and|,)?\s*$")
+
+_HHMM = re.compile(r"(?<!\d)([01]?\d|2[0-3])[:.]([0-5]\d)(?!\d)")
+_HALF_PAST = re.compile(r"(?<!\d)(\d{1,2})\s*yarim(?:da|ga)?\b")
+# "soat 15", "в 7", "at 9", "15 da" — "2 soat" esa davomiylik, vaqt emas
+_HOUR_WORD = re.compile(
+    rf"(?:\bsoat\s*(\d{{1,2}})\b"
+    rf"|(?:^|\s)(?:в|к|at)\s+(\d{{1,2}})\b(?!\s*{_MIN})"
+    rf"|(?<!\d)(\d{{1,2}})\s*-?\s*(?:da|ga|larda|ларда)\b"
+    rf"|(?<!\d)(\d{{1,2}})\s*час\w*\s+(?=утра|дня|вечера|ночи))"
+)
+_AMPM_ONLY = re.compile(rf"(?<!\d)(\d{{1,2}})\s*(am|pm|a\.m\.|p\.m\.)")
+_NOON = re.compile(r"\b(?:noon|полдень|полдня|peshin)\b")
+_MIDNIGHT = re.compile(r"\b(?:midnight|полночь|yarim tun)\b")
+
+
+@dataclass(frozen=True)
+class TimeMatch:
+    """Matndagi bitta vaqt ifodasi.
+
+    `at` — aniq soat, `offset` — nisbiy vaqt ("30 minutdan keyin");
+    nisbiy vaqt har doim `resolve(now)` paytida hisoblanadi.
+    """
+    start: int
+    end: int
+    at: time | None = None
+    offset: timedelta | None = None
+
+    def resolve(self, now: datetime | None = None) -> str:
+        if self.at is not None:
+            return self.at.strftime("%H:%M")
+        now = now or datetime.now(TIMEZONE)
+        return (now + self.offset).strftime("%H:%M")
+
+
+def _apply_day_part(hour: int, context: str) -> int | None:
+    if hour > 23:
+        return None
+    if re.search(_NIGHT, context):
+        if hour == 12:
+            return 0
+        return hour + 12 if 6 <= hour < 12 else hour
+    if hour < 12 and re.search(_PM, context):
+        return hour + 12
+    if hour == 12 and re.search(_AM, context):
+        return 0
+    return hour
+
+
+def _relative(amount: str | None, half: bool, unit: str, extra_minutes: str | None = None) -> timedelta:
+    minutes = 60 if unit.startswith(("soat", "час", "hour", "hr")) else 1
+    value = int(amount) if amount else (0 if half else 1)
+    total = value * minutes + (minutes // 2 if half else 0) + int(extra_minutes or 0)
+    return timedelta(minutes=total)
+
+
+def find_times(text: str) -> list[TimeMatch]:
+    """Matndagi barcha vaqt ifodalari, matndagi tartibda (`text` — normalize() qilingan)"""
+    found: list[TimeMatch] = []
+    taken: list[tuple[int, int]] = []
+
+    def add(m: re.Match, **kw):
+        if any(m.start() < end and start < m.end() for start, end in taken):
+            return
+        if kw.get("offset") is not None and _DURATION_BEFORE.search(text, 0, m.start()):
+            # Ifodaning bir qismi o'qilmay qoldi — noto'g'ri offset dan ko'ra yo'q yaxshi
+            taken.append((m.start(), m.end()))
+            return
+        taken.append((m.start(), m.end()))
+        found.append(TimeMatch(m.start(), m.end(), **kw))
+
+    def context(m: re.Match) -> str:
+        # Kun qismi ("kechqurun", "вечера", "pm") odatda vaqt yonida turadi
+        return text[max(0, m.start() - 20): m.end() + 15]
+
+    for m in _REL_UZ.finditer(text):
+        if m.group(2) or m.group(3):
+            offset = _relative(m.group(2), bool(m.group(3)), m.group(4))
+            add(m, offset=offset + timedelta(hours=int(m.group(1) or 0)))
+    for m in _REL_RU.finditer(text):
+        add(m, offset=_relative(m.group(1), bool(m.group(2)), m.group(3), m.group(4)))
+    for m in _REL_EN.finditer(text):
+        if m.group(5):
+            add(m, offset=_relative(m.group(5), False, m.group(6)))
+        else:
+            add(m, offset=_relative(m.group(1), bool(m.group(2)), m.group(3), m.group(4)))
+
+    for m in _HHMM.finditer(text):
+        hour = _apply_day_part(int(m.group(1)), context(m))
+        if hour is not None:
+            add(m, at=time(hour, int(m.group(2))))
+    for m in _HALF_PAST.finditer(text):
+        hour = _apply_day_part(int(m.group(1)), context(m))
+        if hour is not None:
+            add(m, at=time(hour, 30))
+    for m in _AMPM_ONLY.finditer(text):
+        hour = int(m.group(1)) % 12 + (12 if m.group(2).startswith("p") else 0)
+        if hour <= 23:
+            add(m, at=time(hour, 0))
+    for m in _HOUR_WORD.finditer(text):
+        raw = next(g for g in m.groups() if g is not None)
+        hour = _apply_day_part(int(raw), context(m))
+        if hour is not None:
+            add(m, at=time(hour, 0))
+    for m in _NOON.finditer(text):
+        add(m, at=time(12, 0))
+    for m in _MIDNIGHT.finditer(text):
+        add(m, at=time(0, 0))
+
+    return sorted(found, key=lambda t: t.start)
+
+
+def parse_time(text: str, now: datetime | None = None) -> str | None:
+    """Matndagi birinchi vaqt → "HH:MM" (Tashkent vaqti bo'yicha), topilmasa None"""
+    times = find_times(normalize(text))
+    return times[0].resolve(now) if times else None
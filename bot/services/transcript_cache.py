@@ -0,0 +1,86 @@
+import logging
+from datetime import datetime, timedelta
+
+from sqlalchemy import select, delete, and_
+from sqlalchemy.dialects.postgresql import insert
+
+from bot.config import EXTRACT_CACHE_STORAGE, TRANSCRIPT_CACHE_SIZE, TRANSCRIPT_CACHE_TTL_HOURS
+from bot.utils.cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+# Telegram file_unique_id fayl mazmuniga bog'liq — forward qilingan yoki
+# qayta yuborilgan ovoz bir xil id bilan keladi va Whisper ga qayta ketmaydi.
+_TTL = timedelta(hours=TRANSCRIPT_CACHE_TTL_HOURS)
+_memory = TTLCache(maxsize=TRANSCRIPT_CACHE_SIZE, ttl=_TTL.total_seconds())
+PERSIST = EXTRACT_CACHE_STORAGE == "postgres"
+
+
+async def get_cached_transcript(file_unique_id: str) -> str | None:
+    text = _memory.get(file_unique_id)
+    if text is None and PERSIST:
+        text = await _load(file_unique_id)
+        if text is not None:
+            _memory.set(file_unique_id, text)
+    return text
+
+
+async def cache_transcript(file_unique_id: str, text: str):
+    _memory.set(file_unique_id, text)
+    if PERSIST:
+        await _store(file_unique_id, text)
+
+
+def transcript_cache_stats() -> dict:
+    return _memory.stats()
+
+
+async def _load(file_unique_id: str) -> str | None:
+    from database.db import AsyncSessionLocal
+    from bot.models.voice_transcript import VoiceTranscript
+
+    try:
+        async with AsyncSessionLocal() as session:
+            result = await session.execute(
+                select(VoiceTranscript.text).where(
+                    and_(
+                        VoiceTranscript.file_unique_id == file_unique_id,
+                        VoiceTranscript.expires_at > datetime.utcnow(),
+                    )
+                )
+            )
+            return result.scalar_one_or_none()
+    except Exception as e:
+        # Cache ixtiyoriy — DB xatosi Whisper yo'lini to'xtatmasin
+        logger.warning(f"⚠️ Transcript cache o'qish xatosi: {type(e).__name__}: {e}")
+        return None
+
+
+async def _store(file_unique_id: str, text: str):
+    from database.db import AsyncSessionLocal
+    from bot.models.voice_transcript import VoiceTranscript
+
+    expires_at = datetime.utcnow() + _TTL
+    stmt = insert(VoiceTranscript).values(file_unique_id=file_unique_id, text=text, expires_at=expires_at)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[VoiceTranscript.file_unique_id],
+        set_={"text": text, "expires_at": expires_at},
+    )
+    try:
+        async with AsyncSessionLocal() as session:
+            await session.execute(stmt)
+            await session.commit()
+    except Exception as e:
+        logger.warning(f"⚠️ Transcript cache yozish xatosi: {type(e).__name__}: {e}")
+
+
+async def cleanup_expired() -> int:
+    from database.db import AsyncSessionLocal
+    from bot.models.voice_transcript import VoiceTranscript
+
+    async with AsyncSessionLocal() as session:
+        result = await session.execute(
+            delete(VoiceTranscript).where(VoiceTranscript.expires_at <= datetime.utcnow())
+        )
+        await session.commit()
+        return result.rowcount
@@ -1,12 +1,90 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, update, func, case, bindparam, any_, Integer, inspect
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.orm import make_transient_to_detached
+from sqlalchemy.orm.attributes import set_committed_value
+from database.db import after_commit
 from bot.models.user import User
-from datetime import datetime
+from bot.utils.cache import TTLCache
+from bot.config import USER_CACHE_SIZE, USER_CACHE_TTL, NODE_ID
+from datetime import date, datetime
+
+# telegram_id → users qatorining ustunlari (ORM obyekt emas — sessiyalar o'rtasida ulashilmaydi)
+_user_cache = TTLCache(maxsize=USER_CACHE_SIZE, ttl=USER_CACHE_TTL)
+# user_id → telegram_id (scheduler va reja servislaridagi lookup lar uchun)
+_telegram_ids = TTLCache(maxsize=USER_CACHE_SIZE, ttl=USER_CACHE_TTL)
+USERS_CHANNEL = "users_changed"
+
+_COLUMNS = [c.key for c in inspect(User).column_attrs]
+
+
+def _remember(user: User):
+    _user_cache.set(user.telegram_id, {key: getattr(user, key) for key in _COLUMNS})
+    _telegram_ids.set(user.id, user.telegram_id)
+
+
+def forget_user(telegram_id: int):
+    _user_cache.pop(telegram_id)
+
+
+def forget_all_users():
+    _user_cache.clear()
+
+
+def user_cache_stats() -> dict:
+    return _user_cache.stats()
+
+
+async def _on_users_changed(payload: str):
+    node_id, _, telegram_id = payload.rpartition("|")
+    if node_id == NODE_ID:
+        return  # O'zimiz allaqachon write-through qilganmiz
+    if telegram_id == "*":
+        forget_all_users()
+    else:
+        forget_user(int(telegram_id))
+
+
+def listen_user_changes():
+    """Boshqa replikada user o'zgarsa — bu yerdagi cache dan ham olib tashlanadi"""
+    from database.listener import listener
+    listener.on(USERS_CHANNEL, _on_users_changed)
+
+
+async def users_changed(session: AsyncSession, user: User | None = None):
+    """User(lar) o'zgardi: commitdan keyin shu yerda write-through, boshqa replikalarga NOTIFY.
+
+    `user=None` — bulk o'zgarish, hamma cache tozalanadi.
+    """
+    target = "*" if user is None else str(user.telegram_id)
+    await session.execute(select(func.pg_notify(USERS_CHANNEL, f"{NODE_ID}|{target}")))
+    if user is None:
+        after_commit(session, forget_all_users)
+    else:
+        after_commit(session, lambda: _remember(user))
+
+
+async def _attach_cached(session: AsyncSession, telegram_id: int) -> User | None:
+    """Cache dagi qatorni sessiyaga DB ga bormasdan ulaydi"""
+    cols = _user_cache.get(telegram_id)
+    if cols is None:
+        return None
+    key = inspect(User).identity_key_from_primary_key((cols["id"],))
+    existing = session.sync_session.identity_map.get(key)
+    if existing is not None:
+        return existing  # Sessiyada yangiroq nusxa bor
+    user = User(**cols)
+    make_transient_to_detached(user)
+    return await session.merge(user, load=False)
 
 
 async def get_or_create_user(session: AsyncSession, telegram_id: int, full_name: str, username: str) -> User:
-    result = await session.execute(select(User).where(User.telegram_id == telegram_id))
-    user = result.scalar_one_or_none()
+    user = await _attach_cached(session, telegram_id)
+    if user is None:
+        result = await session.execute(select(User).where(User.telegram_id == telegram_id))
+        user = result.scalar_one_or_none()
+        if user is not None:
+            _remember(user)
 
     if not user:
         user = User(
@@ -15,26 +93,140 @@ async def get_or_create_user(session: AsyncSession, telegram_id: int, full_name:
             username=username,
         )
         session.add(user)
-        await session.commit()
-        await session.refresh(user)
+        await session.flush()
+        after_commit(session, lambda: _remember(user))
+    elif not user.is_active:
+        # Botni bloklab, keyin qaytgan user
+        user.is_active = True
+        await users_changed(session, user)
 
     return user
 
 
 async def get_user_by_telegram_id(session: AsyncSession, telegram_id: int) -> User | None:
+    user = await _attach_cached(session, telegram_id)
+    if user is not None:
+        return user
     result = await session.execute(select(User).where(User.telegram_id == telegram_id))
-    return result.scalar_one_or_none()
+    user = result.scalar_one_or_none()
+    if user is not None:
+        _remember(user)
+    return user
+
+
+async def get_telegram_id(session: AsyncSession, user_id: int) -> int:
+    telegram_id = _telegram_ids.get(user_id)
+    if telegram_id is None:
+        result = await session.execute(select(User).where(User.id == user_id))
+        user = result.scalar_one()
+        _remember(user)
+        telegram_id = user.telegram_id
+    return telegram_id
+
+
+async def add_to_score(session: AsyncSession, user: User, score_change: int):
+    """total_score ni DBda atomik oshiradi — cache dagi eski qiymat ustidan yozib yubormaslik uchun"""
+    result = await session.execute(
+        update(User)
+        .where(User.id == user.id)
+        .values(total_score=User.total_score + score_change, last_active=datetime.utcnow())
+        .returning(User.total_score, User.last_active)
+    )
+    total_score, last_active = result.one()
+    set_committed_value(user, "total_score", total_score)
+    set_committed_value(user, "last_active", last_active)
+    await users_changed(session, user)
 
 
 async def update_user_score(session: AsyncSession, user: User, score_change: int):
-    user.total_score += score_change
-    user.last_active = datetime.utcnow()
-    await session.commit()
+    from bot.services.status_service import invalidate_status
+    await add_to_score(session, user, score_change)
+    user_id = user.id
+    after_commit(session, lambda: invalidate_status(user_id))
 
 
 async def update_streak(session: AsyncSession, user: User, increment: bool = True):
-    if increment:
-        user.streak += 1
-    else:
-        user.streak = 0
-    await session.commit()
\ No newline at end of file
+    from bot.services.status_service import invalidate_status
+    result = await session.execute(
+        update(User)
+        .where(User.id == user.id)
+        .values(streak=User.streak + 1 if increment else 0)
+        .returning(User.streak)
+    )
+    set_committed_value(user, "streak", result.scalar_one())
+    await users_changed(session, user)
+    user_id = user.id
+    after_commit(session, lambda: invalidate_status(user_id))
+
+
+async def bulk_update_streaks(
+    session: AsyncSession, day: date, increment_ids: list[int], reset_ids: list[int], keep_ids: list[int]
+) -> dict[int, int]:
+    """Kun yakunida streaklarni bitta UPDATE bilan yangilaydi.
+
+    Har bir user kuniga bir marta yangilanadi (last_streak_date) — shardlar
+    bo'yicha kelisha olmagan ikki worker streakni ikki marta oshirmaydi.
+    id lar array parametr sifatida yuboriladi — 50k user ham bind
+    parametrlar limitiga urilmaydi.
+
+    Qaytaradi: shu chaqiruvda yangilangan userlar — user_id → yangi streak
+    """
+    ids = increment_ids + reset_ids + keep_ids
+    if not ids:
+        return {}
+
+    streak = case(
+        (User.id == any_(bindparam("increment_ids", increment_ids, type_=ARRAY(Integer))), User.streak + 1),
+        (User.id == any_(bindparam("reset_ids", reset_ids, type_=ARRAY(Integer))), 0),
+        else_=User.streak,
+    )
+    result = await session.execute(
+        update(User)
+        .where(
+            User.id == any_(bindparam("ids", ids, type_=ARRAY(Integer))),
+            User.last_streak_date.is_distinct_from(day),
+        )
+        .values(streak=streak, last_streak_date=day)
+        .returning(User.id, User.streak)
+    )
+    updated = dict(result.all())
+
+    if updated:
+        from bot.services.status_service import invalidate_all_statuses
+        after_commit(session, invalidate_all_statuses)
+        await users_changed(session)
+    return updated
+
+
+async def claim_pending_check(session: AsyncSession, day: date, user_ids: list[int]) -> set[int]:
+    """Kechki pending tekshiruvini yuborishdan oldin (user, kun) ni band qiladi.
+
+    Shardlar bo'yicha kelisha olmagan ikki worker bitta userga xabarni ikki
+    marta yubormaydi. Yuborishdan oldin chaqiruvchi commit qilishi kerak.
+    """
+    if not user_ids:
+        return set()
+    result = await session.execute(
+        update(User)
+        .where(
+            User.id == any_(bindparam("ids", user_ids, type_=ARRAY(Integer))),
+            User.last_pending_check_date.is_distinct_from(day),
+        )
+        .values(last_pending_check_date=day)
+        .returning(User.id)
+    )
+    return set(result.scalars().all())
+
+
+async def release_pending_check(session: AsyncSession, day: date, user_ids: list[int]):
+    """Yetib bormagan tekshiruvlar — keyingi urinishda qayta band qilinadi"""
+    if not user_ids:
+        return
+    await session.execute(
+        update(User)
+        .where(
+            User.id == any_(bindparam("ids", user_ids, type_=ARRAY(Integer))),
+            User.last_pending_check_date == day,
+        )
+        .values(last_pending_check_date=None)
+    )
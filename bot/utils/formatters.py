@@ -1,4 +1,5 @@
 from bot.models.plan import Plan, PlanStatus
+from bot.models.broadcast import Broadcast, BroadcastStatus
 
 
 def format_plan_list(plans: list[Plan]) -> str:
@@ -42,6 +43,19 @@ def format_plan_confirm(plans: list[dict]) -> str:
     return text
 
 
+def format_pending_check(plans: list[Plan]) -> str:
+    """Kun oxirida bajarilmay qolgan rejalar — bitta xabarda"""
+    text = "🌙 <b>Kun tugadi</b>\n\n"
+    text += f"⏳ Belgilanmagan rejalar: <b>{len(plans)} ta</b>\n\n"
+
+    for i, plan in enumerate(plans, 1):
+        time_str = f"🕐 {plan.scheduled_time}" if plan.scheduled_time else "🕐 Vaqtsiz"
+        text += f"<b>{i}. {plan.title}</b> — {time_str}\n"
+
+    text += "\nBu rejalarni bajardingizmi?\n<i>✅ bajardim · ❌ bajarmadim · 📅 ertaga</i>"
+    return text
+
+
 def format_summary(summary: dict) -> str:
     """Kunlik hisobotni formatlaydi"""
     text = "📊 <b>Bugungi hisobotingiz:</b>\n\n"
@@ -52,3 +66,21 @@ def format_summary(summary: dict) -> str:
     text += f"🏆 Umumiy ball: <b>{summary['total_score']}</b>\n"
     text += f"🔥 Streak: <b>{summary['streak']} kun</b>"
     return text
+
+
+def format_broadcast_progress(broadcast: Broadcast) -> str:
+    """Admin uchun broadcast holati"""
+    titles = {
+        BroadcastStatus.running: "⏳ <b>Yuborilmoqda...</b>",
+        BroadcastStatus.paused: "⏸ <b>Pauza qilindi</b>",
+        BroadcastStatus.cancelled: "⛔ <b>Bekor qilindi</b>",
+        BroadcastStatus.done: "✅ <b>Xabar yuborildi!</b>",
+    }
+    processed = broadcast.sent + broadcast.failed + broadcast.blocked
+
+    text = f"{titles[broadcast.status]}\n\n"
+    text += f"📊 Jarayon: <b>{processed} / {broadcast.total}</b>\n"
+    text += f"✅ Muvaffaqiyatli: <b>{broadcast.sent} ta</b>\n"
+    text += f"❌ Yuborilmadi: <b>{broadcast.failed} ta</b>\n"
+    text += f"🚫 Botni bloklagan: <b>{broadcast.blocked} ta</b>"
+    return text
\ No newline at end of file
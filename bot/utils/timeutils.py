@@ -0,0 +1,27 @@
+from datetime import datetime, date, timedelta
+
+import pytz
+
+from bot.config import TIMEZONE
+
+
+def tashkent_today() -> date:
+    return datetime.now(TIMEZONE).date()
+
+
+def tashkent_date(utc_naive: datetime) -> date:
+    """DBdagi UTC (tzinfo siz) vaqt → Tashkent kuni"""
+    return pytz.utc.localize(utc_naive).astimezone(TIMEZONE).date()
+
+
+def tashkent_day_bounds(day: date) -> tuple[datetime, datetime]:
+    """Tashkent kuni → [start, end) UTC oralig'i (tzinfo siz, DBdagi created_at bilan solishtirish uchun).
+
+    Ustunni funksiyaga o'ramasdan solishtirish (sargable) — indeks ishlaydi.
+    """
+    start = TIMEZONE.localize(datetime.combine(day, datetime.min.time()))
+    end = TIMEZONE.localize(datetime.combine(day + timedelta(days=1), datetime.min.time()))
+    return (
+        start.astimezone(pytz.utc).replace(tzinfo=None),
+        end.astimezone(pytz.utc).replace(tzinfo=None),
+    )
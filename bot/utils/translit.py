@@ -0,0 +1,67 @@
+import re
+
+# ─────────────────────────────────────────
+#  O'zbek kirill → lotin (1995 yilgi imlo qoidalari)
+# ─────────────────────────────────────────
+
+_LETTERS = {
+    "а": "a", "б": "b", "в": "v", "г": "g", "д": "d", "ё": "yo", "ж": "j", "з": "z",
+    "и": "i", "й": "y", "к": "k", "л": "l", "м": "m", "н": "n", "о": "o", "п": "p",
+    "р": "r", "с": "s", "т": "t", "у": "u", "ф": "f", "х": "x", "ц": "ts", "ч": "ch",
+    "ш": "sh", "ъ": "'", "ь": "", "э": "e", "ю": "yu", "я": "ya", "ў": "o'", "қ": "q",
+    "ғ": "g'", "ҳ": "h", "ы": "i", "щ": "sh",
+}
+_VOWELS = set("аеёиоуэюяў")
+
+_CYRILLIC = re.compile(r"[Ѐ-ӿ]")
+_UZBEK_ONLY = re.compile(r"[ўқғҳЎҚҒҲ]")
+_RUSSIAN_ONLY = re.compile(r"[ыщЫЩ]")
+# O'zbekcha so'z oxirlari ("ўқиш", "туриш", "дарсга") / ruscha ("читать", "занятие")
+_UZBEK_ENDINGS = re.compile(r"(?:иш|ш|га|да|дан|ни|лар|лари|ман|маш|моқ)\b", re.IGNORECASE)
+_RUSSIAN_ENDINGS = re.compile(r"(?:ть|ться|ие|ия|ый|ой|ая|ое|ого|ую|ем|ешь)\b", re.IGNORECASE)
+
+
+def has_cyrillic(text: str) -> bool:
+    return bool(_CYRILLIC.search(text))
+
+
+def is_uzbek_cyrillic(text: str) -> bool:
+    """Kirillcha matn o'zbekchami (translit yetarli) yoki ruscha (tarjima kerak)"""
+    if _UZBEK_ONLY.search(text):
+        return True
+    if _RUSSIAN_ONLY.search(text):
+        return False
+    return len(_UZBEK_ENDINGS.findall(text)) > len(_RUSSIAN_ENDINGS.findall(text))
+
+
+def _convert(char: str, prev: str) -> str:
+    lower = char.lower()
+    if lower == "е":
+        # So'z boshida va unlidan keyin "ye": "ер" → "yer", "поезд" → "poyezd"
+        latin = "ye" if not prev or not prev.isalpha() or prev.lower() in _VOWELS | {"ъ", "ь"} else "e"
+    elif lower == "ц":
+        # Unlidan keyin "ts", undoshdan keyin "s": "сирк" yozilishi — "цирк" → "sirk"
+        latin = "ts" if prev.lower() in _VOWELS else "s"
+    else:
+        latin = _LETTERS.get(lower)
+        if latin is None:
+            return char
+    if char.isupper() and latin:
+        return latin[0].upper() + latin[1:]
+    return latin
+
+
+def to_latin(text: str) -> str:
+    """O'zbek kirill matnini lotinga o'giradi, boshqa belgilar o'zgarmaydi"""
+    result = []
+    prev = ""
+    for index, char in enumerate(text):
+        latin = _convert(char, prev)
+        # Butun so'z katta harfda bo'lsa — "ШАХАР" → "SHAXAR"
+        if len(latin) > 1 and char.isupper():
+            following = text[index + 1: index + 2]
+            if following.isupper():
+                latin = latin.upper()
+        result.append(latin)
+        prev = char
+    return "".join(result)
@@ -0,0 +1,123 @@
+import asyncio
+import hmac
+import logging
+import signal
+
+from aiohttp import web
+from aiogram import Bot, Dispatcher
+from aiogram.types import Update
+
+from bot.config import (
+    WEBHOOK_URL, WEBHOOK_PATH, WEBHOOK_SECRET, WEBHOOK_HOST, WEBHOOK_PORT,
+    WEBHOOK_QUEUE_SIZE, WEBHOOK_WORKERS
+)
+
+logger = logging.getLogger(__name__)
+
+SECRET_HEADER = "X-Telegram-Bot-Api-Secret-Token"
+
+
+class UpdateIngress:
+    """Webhook → chegaralangan navbat → workerlar → dp.feed_update.
+
+    HTTP handler update ni faqat navbatga qo'yadi va darhol 200 qaytaradi.
+    Navbat to'lsa 503 qaytariladi — Telegram update ni keyinroq qayta
+    yuboradi, jarayon xotirasi esa cheksiz o'smaydi.
+    """
+
+    def __init__(self, bot: Bot, dp: Dispatcher, secret: str,
+                 queue_size: int = 1000, workers: int = 16):
+        if not secret:
+            raise ValueError("Webhook secret bo'sh bo'lmasligi kerak")
+        self.bot = bot
+        self.dp = dp
+        self.secret = secret
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.workers = workers
+        self.rejected = 0
+        self._tasks: list[asyncio.Task] = []
+
+    async def handle(self, request: web.Request) -> web.Response:
+        # Sirsiz so'rov — soxta update (masalan, admin callback) bo'lishi mumkin
+        if not hmac.compare_digest(request.headers.get(SECRET_HEADER, ""), self.secret):
+            return web.Response(status=401)
+        try:
+            data = await request.json()
+        except ValueError:
+            return web.Response(status=400)
+        try:
+            self.queue.put_nowait(data)
+        except asyncio.QueueFull:
+            self.rejected += 1
+            return web.Response(status=503, headers={"Retry-After": "1"})
+        return web.Response()
+
+    async def _worker(self):
+        while True:
+            data = await self.queue.get()
+            try:
+                update = Update.model_validate(data, context={"bot": self.bot})
+                await self.dp.feed_update(self.bot, update)
+            except Exception as e:
+                logger.error(f"Update ishlovida xato: {type(e).__name__}: {e}")
+            finally:
+                self.queue.task_done()
+
+    def start(self):
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def drain(self):
+        """Navbatdagi update larni tugatib, workerlarni to'xtatadi"""
+        await self.queue.join()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def app(self, path: str = WEBHOOK_PATH) -> web.Application:
+        app = web.Application()
+        app.router.add_post(path, self.handle)
+        return app
+
+
+async def run_webhook(bot: Bot, dp: Dispatcher):
+    """Webhook rejimi.
+
+    Socket SO_REUSEPORT bilan ochiladi — bir nechta jarayon bitta portni
+    bo'lishadi va yadro ulanishlarni ular orasida taqsimlaydi (yoki oldida
+    lokal load balancer turadi). Deploy paytida webhook o'chirilmaydi:
+    eski jarayon navbatini tugatib chiqadi, yangisi esa shu portda ishlayveradi.
+    """
+    if not WEBHOOK_SECRET:
+        # Sirsiz webhook yo'lini topgan har kim update yubora oladi
+        raise RuntimeError("BOT_MODE=webhook uchun WEBHOOK_SECRET o'rnatilishi shart")
+
+    ingress = UpdateIngress(bot, dp, WEBHOOK_SECRET, WEBHOOK_QUEUE_SIZE, WEBHOOK_WORKERS)
+    ingress.start()
+
+    runner = web.AppRunner(ingress.app())
+    await runner.setup()
+    site = web.TCPSite(runner, WEBHOOK_HOST, WEBHOOK_PORT, reuse_port=True)
+    await site.start()
+
+    if WEBHOOK_URL:
+        await bot.set_webhook(
+            WEBHOOK_URL.rstrip("/") + WEBHOOK_PATH,
+            secret_token=WEBHOOK_SECRET,
+            allowed_updates=dp.resolve_used_update_types(),
+        )
+    logger.info(f"🌐 Webhook {WEBHOOK_HOST}:{WEBHOOK_PORT}{WEBHOOK_PATH} da tinglanmoqda")
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    try:
+        await dp.emit_startup(bot=bot)
+        await stop.wait()
+    finally:
+        # Avval yangi so'rovlarni qabul qilishni to'xtatamiz, keyin navbatni tugatamiz
+        await runner.cleanup()
+        await ingress.drain()
+        await dp.emit_shutdown(bot=bot)
+        logger.info(f"🌐 Webhook to'xtadi (rad etilgan update lar: {ingress.rejected})")
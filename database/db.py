@@ -1,5 +1,8 @@
+from typing import Callable
+
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
-from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.orm import DeclarativeBase, Session
 from bot.config import DATABASE_URL
 
 
@@ -23,12 +26,64 @@ class Base(DeclarativeBase):
     pass
 
 
+def after_commit(session: AsyncSession, callback: Callable[[], None]):
+    """Callback faqat tranzaksiya commit bo'lgandan keyin chaqiriladi (rollbackda — tashlanadi).
+
+    Xotiradagi holat (reminder queue, cache lar) DBdan oldin o'zgarib
+    qolmasligi uchun.
+    """
+    session.sync_session.info.setdefault("after_commit", []).append(callback)
+
+
+@event.listens_for(Session, "after_begin")
+def _count_checkout(session, transaction, connection):
+    # Session har bir tranzaksiya uchun pooldan ulanish oladi va commitda qaytaradi
+    session.info["checkouts"] = session.info.get("checkouts", 0) + 1
+
+
+@event.listens_for(Session, "after_commit")
+def _run_after_commit(session):
+    for callback in session.info.pop("after_commit", []):
+        callback()
+
+
+@event.listens_for(Session, "after_rollback")
+def _drop_after_commit(session):
+    session.info.pop("after_commit", None)
+
+
 async def get_db() -> AsyncSession:
     async with AsyncSessionLocal() as session:
         yield session
 
 
-async def create_tables():
-    async with engine.begin() as conn:
-        from bot.models import user, plan, score_log, admin  # noqa
-        await conn.run_sync(Base.metadata.create_all)
\ No newline at end of file
+async def check_schema():
+    """DB sxemasi migratsiyalar bilan bir xilligini tekshiradi.
+
+    Jadvallar faqat `alembic upgrade head` (Procfile release bosqichi) bilan
+    yaratiladi — create_all ishlatilmaydi, aks holda keyingi migratsiyalar
+    mavjud jadvallarga urilib to'xtaydi va backfill lar ishlamay qoladi.
+    """
+    from pathlib import Path
+    from alembic.config import Config
+    from alembic.script import ScriptDirectory
+    from sqlalchemy import text
+
+    root = Path(__file__).resolve().parent.parent
+    config = Config(str(root / "alembic.ini"))
+    config.set_main_option("script_location", str(root / "migrations"))  # cwd ga bog'liq bo'lmasin
+    heads = set(ScriptDirectory.from_config(config).get_heads())
+
+    async with engine.connect() as conn:
+        try:
+            result = await conn.execute(text("SELECT version_num FROM alembic_version"))
+            current = set(result.scalars().all())
+        except Exception:
+            current = set()
+
+    if current != heads:
+        found = ", ".join(sorted(current)) or "bo'sh"
+        raise RuntimeError(
+            f"DB sxemasi eskirgan ({found} → {', '.join(sorted(heads))}): "
+            f"avval `alembic upgrade head` ni ishga tushiring"
+        )
@@ -0,0 +1,102 @@
+import json
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+from aiogram.fsm.state import State
+from aiogram.fsm.storage.base import BaseStorage, StorageKey, StateType, KeyBuilder, DefaultKeyBuilder
+from sqlalchemy import select, delete, and_, case
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from bot.models.fsm_state import FsmState
+
+
+def _dumps(data: Dict[str, Any]) -> str | None:
+    # Bo'shliqsiz, unicode escape siz — kirill matnlar ham ixcham saqlanadi
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False) if data else None
+
+
+def _loads(raw: str | None) -> Dict[str, Any]:
+    return json.loads(raw) if raw else {}
+
+
+class PostgresStorage(BaseStorage):
+    """FSM storage — mavjud async SQLAlchemy engine ustida.
+
+    Har bir yozuv ttl ga uzaytiriladi; muddati o'tganlar o'qishda
+    ko'rinmaydi va cleanup_expired() bilan o'chiriladi.
+    """
+
+    def __init__(
+        self,
+        session_maker: async_sessionmaker,
+        ttl: timedelta = timedelta(hours=24),
+        key_builder: KeyBuilder | None = None,
+    ):
+        self.session_maker = session_maker
+        self.ttl = ttl
+        self.key_builder = key_builder or DefaultKeyBuilder()
+
+    async def _upsert(self, key: StorageKey, column: str, value: str | None):
+        now = datetime.utcnow()
+        other = "data" if column == "state" else "state"
+        stmt = insert(FsmState).values(key=self.key_builder.build(key), expires_at=now + self.ttl, **{column: value})
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[FsmState.key],
+            set_={
+                column: value,
+                "expires_at": now + self.ttl,
+                # Muddati o'tgan qatordagi eski qiymat qayta "tirilmasin"
+                other: case((FsmState.expires_at <= now, None), else_=getattr(FsmState, other)),
+            },
+        )
+        async with self.session_maker() as session:
+            await session.execute(stmt)
+            # Holat ham, ma'lumot ham bo'sh bo'lsa — qatorni saqlab o'tirmaymiz
+            await session.execute(
+                delete(FsmState).where(
+                    and_(
+                        FsmState.key == self.key_builder.build(key),
+                        FsmState.state == None,
+                        FsmState.data == None
+                    )
+                )
+            )
+            await session.commit()
+
+    async def _get(self, key: StorageKey, column):
+        async with self.session_maker() as session:
+            result = await session.execute(
+                select(column).where(
+                    and_(
+                        FsmState.key == self.key_builder.build(key),
+                        FsmState.expires_at > datetime.utcnow()
+                    )
+                )
+            )
+            return result.scalar_one_or_none()
+
+    async def set_state(self, key: StorageKey, state: StateType = None) -> None:
+        await self._upsert(key, "state", state.state if isinstance(state, State) else state)
+
+    async def get_state(self, key: StorageKey) -> Optional[str]:
+        return await self._get(key, FsmState.state)
+
+    async def set_data(self, key: StorageKey, data: Dict[str, Any]) -> None:
+        await self._upsert(key, "data", _dumps(data))
+
+    async def get_data(self, key: StorageKey) -> Dict[str, Any]:
+        return _loads(await self._get(key, FsmState.data))
+
+    async def cleanup_expired(self) -> int:
+        """Tashlab ketilgan (muddati o'tgan) holatlarni o'chiradi"""
+        async with self.session_maker() as session:
+            result = await session.execute(
+                delete(FsmState).where(FsmState.expires_at <= datetime.utcnow())
+            )
+            await session.commit()
+            return result.rowcount
+
+    async def close(self) -> None:
+        # Engine umumiy — uni bot yopilganda database.db o'zi yopadi
+        pass
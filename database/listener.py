@@ -0,0 +1,78 @@
+import asyncio
+import logging
+from typing import Awaitable, Callable
+
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from database.db import engine
+
+logger = logging.getLogger(__name__)
+
+Handler = Callable[[str], Awaitable[None]]
+
+
+class PgListener:
+    """Postgres LISTEN/NOTIFY — replikalar o'rtasida kichik signallar uchun.
+
+    Alohida ulanish ochiq turadi va uzilsa qayta ulanadi. Uzilish paytida
+    kelgan xabarlar yo'qoladi, shuning uchun har bir foydalanuvchi o'z
+    holatini davriy ravishda (TTL/reconcile) baribir yangilab turishi kerak.
+    """
+
+    def __init__(self, engine: AsyncEngine, reconnect_seconds: float = 5):
+        self.engine = engine
+        self.reconnect_seconds = reconnect_seconds
+        self._handlers: dict[str, list[Handler]] = {}
+        self._tasks: set[asyncio.Task] = set()
+        self._runner: asyncio.Task | None = None
+
+    def on(self, channel: str, handler: Handler):
+        self._handlers.setdefault(channel, []).append(handler)
+
+    async def notify(self, channel: str, payload: str = ""):
+        async with self.engine.begin() as conn:
+            await conn.execute(select(func.pg_notify(channel, payload)))
+
+    def _dispatch(self, connection, pid, channel, payload):
+        for handler in self._handlers.get(channel, []):
+            task = asyncio.create_task(handler(payload))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    def start(self):
+        if self._runner is None or self._runner.done():
+            self._runner = asyncio.create_task(self.run())
+
+    async def stop(self):
+        if self._runner is not None:
+            self._runner.cancel()
+            await asyncio.gather(self._runner, return_exceptions=True)
+
+    async def run(self):
+        while True:
+            conn = None
+            try:
+                conn = await self.engine.connect()
+                await conn.execution_options(isolation_level="AUTOCOMMIT")
+                raw = (await conn.get_raw_connection()).driver_connection
+                for channel in self._handlers:
+                    await raw.add_listener(channel, self._dispatch)
+
+                # Ulanish tirikligini tekshirib turamiz
+                while True:
+                    await asyncio.sleep(30)
+                    await raw.execute("SELECT 1")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"LISTEN ulanishi uzildi: {type(e).__name__}: {e}")
+            finally:
+                if conn is not None:
+                    # Listenerlar biriktirilgan ulanish poolga qaytmasin
+                    await conn.invalidate()
+                    await conn.close()
+            await asyncio.sleep(self.reconnect_seconds)
+
+
+listener = PgListener(engine)
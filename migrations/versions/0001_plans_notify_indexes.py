@@ -0,0 +1,88 @@
+"""Boshlang'ich sxema + eslatma query'si uchun indekslar
+
+Eski bazalarda jadvallar create_tables() orqali yaratilgan, shuning uchun
+jadvallar faqat mavjud bo'lmasa yaratiladi.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+
+    if not inspector.has_table("users"):
+        op.create_table(
+            "users",
+            sa.Column("id", sa.Integer, primary_key=True, autoincrement=True),
+            sa.Column("telegram_id", sa.BigInteger, unique=True, nullable=False),
+            sa.Column("full_name", sa.String(255), nullable=True),
+            sa.Column("username", sa.String(255), nullable=True),
+            sa.Column("streak", sa.Integer, default=0),
+            sa.Column("total_score", sa.Integer, default=0),
+            sa.Column("is_active", sa.Boolean, default=True),
+            sa.Column("created_at", sa.DateTime),
+            sa.Column("last_active", sa.DateTime),
+        )
+
+    if not inspector.has_table("plans"):
+        op.create_table(
+            "plans",
+            sa.Column("id", sa.Integer, primary_key=True, autoincrement=True),
+            sa.Column("user_id", sa.Integer, sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+            sa.Column("title", sa.String(500), nullable=False),
+            sa.Column("description", sa.String(1000), nullable=True),
+            sa.Column("scheduled_time", sa.String(10), nullable=True),
+            sa.Column("plan_date", sa.Date),
+            sa.Column("status", sa.Enum("pending", "done", "failed", name="planstatus")),
+            sa.Column("score_value", sa.Integer, default=5),
+            sa.Column("created_at", sa.DateTime),
+            sa.Column("notified_at", sa.DateTime, nullable=True),
+        )
+
+    if not inspector.has_table("score_logs"):
+        op.create_table(
+            "score_logs",
+            sa.Column("id", sa.Integer, primary_key=True, autoincrement=True),
+            sa.Column("user_id", sa.Integer, sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+            sa.Column("plan_id", sa.Integer, sa.ForeignKey("plans.id", ondelete="CASCADE"), nullable=True),
+            sa.Column("score_change", sa.Integer, nullable=False),
+            sa.Column("reason", sa.String(255), nullable=True),
+            sa.Column("created_at", sa.DateTime),
+        )
+
+    if not inspector.has_table("admins"):
+        op.create_table(
+            "admins",
+            sa.Column("id", sa.Integer, primary_key=True, autoincrement=True),
+            sa.Column("telegram_id", sa.BigInteger, unique=True, nullable=False),
+            sa.Column("full_name", sa.String(255), nullable=True),
+            sa.Column("is_super", sa.Boolean, default=False),
+            sa.Column("added_at", sa.DateTime),
+        )
+
+    op.create_index(
+        "ix_plans_date_time_status", "plans",
+        ["plan_date", "scheduled_time", "status"],
+        if_not_exists=True,
+    )
+    op.create_index(
+        "ix_plans_notify_pending", "plans",
+        ["plan_date", "scheduled_time"],
+        postgresql_where=sa.text("status = 'pending' AND notified_at IS NULL"),
+        if_not_exists=True,
+    )
+
+
+def downgrade():
+    op.drop_index("ix_plans_notify_pending", table_name="plans", if_exists=True)
+    op.drop_index("ix_plans_date_time_status", table_name="plans", if_exists=True)
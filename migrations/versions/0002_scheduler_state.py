@@ -0,0 +1,27 @@
+"""scheduler_state jadvali (eslatmalar watermark'i)
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "scheduler_state",
+        sa.Column("key", sa.String(64), primary_key=True),
+        sa.Column("value", sa.String(255), nullable=False),
+        sa.Column("updated_at", sa.DateTime),
+    )
+
+
+def downgrade():
+    op.drop_table("scheduler_state")
@@ -0,0 +1,45 @@
+"""broadcasts va broadcast_deliveries jadvallari
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "broadcasts",
+        sa.Column("id", sa.Integer, primary_key=True, autoincrement=True),
+        sa.Column("text", sa.Text, nullable=False),
+        sa.Column("admin_chat_id", sa.BigInteger, nullable=False),
+        sa.Column("progress_message_id", sa.Integer, nullable=True),
+        sa.Column("status", sa.Enum("running", "paused", "cancelled", "done", name="broadcaststatus")),
+        sa.Column("last_user_id", sa.Integer, default=0),
+        sa.Column("total", sa.Integer, default=0),
+        sa.Column("sent", sa.Integer, default=0),
+        sa.Column("failed", sa.Integer, default=0),
+        sa.Column("blocked", sa.Integer, default=0),
+        sa.Column("created_at", sa.DateTime),
+        sa.Column("finished_at", sa.DateTime, nullable=True),
+    )
+    op.create_table(
+        "broadcast_deliveries",
+        sa.Column("broadcast_id", sa.Integer, sa.ForeignKey("broadcasts.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("user_id", sa.Integer, sa.ForeignKey("users.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("status", sa.String(16), nullable=False),
+        sa.Column("updated_at", sa.DateTime),
+    )
+
+
+def downgrade():
+    op.drop_table("broadcast_deliveries")
+    op.drop_table("broadcasts")
+    sa.Enum(name="broadcaststatus").drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,21 @@
+"""users(created_at, id) indeksi — admin userlar ro'yxati keyset pagination
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18
+"""
+from alembic import op
+
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index("ix_users_created_at_id", "users", ["created_at", "id"], if_not_exists=True)
+
+
+def downgrade():
+    op.drop_index("ix_users_created_at_id", table_name="users", if_exists=True)
@@ -0,0 +1,23 @@
+"""users(total_score) va plans(user_id, plan_date) indekslari — admin statistikasi
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18
+"""
+from alembic import op
+
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index("ix_users_total_score", "users", ["total_score"], if_not_exists=True)
+    op.create_index("ix_plans_user_id_plan_date", "plans", ["user_id", "plan_date"], if_not_exists=True)
+
+
+def downgrade():
+    op.drop_index("ix_plans_user_id_plan_date", table_name="plans", if_exists=True)
+    op.drop_index("ix_users_total_score", table_name="users", if_exists=True)
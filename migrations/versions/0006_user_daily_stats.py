@@ -0,0 +1,50 @@
+"""user_daily_stats rollup jadvali + mavjud ma'lumotlardan to'ldirish
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "user_daily_stats",
+        sa.Column("user_id", sa.Integer, sa.ForeignKey("users.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("date", sa.Date, primary_key=True),
+        sa.Column("planned", sa.Integer, nullable=False, server_default="0"),
+        sa.Column("done", sa.Integer, nullable=False, server_default="0"),
+        sa.Column("failed", sa.Integer, nullable=False, server_default="0"),
+        sa.Column("score_delta", sa.Integer, nullable=False, server_default="0"),
+    )
+
+    op.execute("""
+        INSERT INTO user_daily_stats (user_id, date, planned, done, failed, score_delta)
+        SELECT user_id, plan_date, count(*),
+               count(*) FILTER (WHERE status = 'done'),
+               count(*) FILTER (WHERE status = 'failed'),
+               0
+        FROM plans
+        WHERE plan_date IS NOT NULL
+        GROUP BY user_id, plan_date
+    """)
+    # score_logs.created_at — UTC; kun Tashkent bo'yicha olinadi
+    op.execute("""
+        INSERT INTO user_daily_stats (user_id, date, score_delta)
+        SELECT user_id, (created_at AT TIME ZONE 'UTC' AT TIME ZONE 'Asia/Tashkent')::date, sum(score_change)
+        FROM score_logs
+        WHERE created_at IS NOT NULL
+        GROUP BY 1, 2
+        ON CONFLICT (user_id, date) DO UPDATE SET score_delta = excluded.score_delta
+    """)
+
+
+def downgrade():
+    op.drop_table("user_daily_stats")
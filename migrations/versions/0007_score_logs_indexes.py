@@ -0,0 +1,23 @@
+"""score_logs(user_id, created_at) va score_logs(plan_id) indekslari
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18
+"""
+from alembic import op
+
+
+revision = "0007"
+down_revision = "0006"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index("ix_score_logs_user_id_created_at", "score_logs", ["user_id", "created_at"], if_not_exists=True)
+    op.create_index("ix_score_logs_plan_id", "score_logs", ["plan_id"], if_not_exists=True)
+
+
+def downgrade():
+    op.drop_index("ix_score_logs_plan_id", table_name="score_logs", if_exists=True)
+    op.drop_index("ix_score_logs_user_id_created_at", table_name="score_logs", if_exists=True)
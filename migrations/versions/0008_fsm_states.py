@@ -0,0 +1,30 @@
+"""fsm_states jadvali (Postgres FSM storage)
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0008"
+down_revision = "0007"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "fsm_states",
+        sa.Column("key", sa.String(255), primary_key=True),
+        sa.Column("state", sa.String(255), nullable=True),
+        sa.Column("data", sa.Text, nullable=True),
+        sa.Column("expires_at", sa.DateTime, nullable=False),
+    )
+    op.create_index("ix_fsm_states_expires_at", "fsm_states", ["expires_at"], if_not_exists=True)
+
+
+def downgrade():
+    op.drop_index("ix_fsm_states_expires_at", table_name="fsm_states", if_exists=True)
+    op.drop_table("fsm_states")
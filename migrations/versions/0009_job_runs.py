@@ -0,0 +1,35 @@
+"""job_runs jadvali (qaysi node qaysi jobni ishlatgani)
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0009"
+down_revision = "0008"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "job_runs",
+        sa.Column("id", sa.Integer, primary_key=True, autoincrement=True),
+        sa.Column("job_id", sa.String(64), nullable=False),
+        sa.Column("node_id", sa.String(128), nullable=False),
+        sa.Column("status", sa.String(16), nullable=False),
+        sa.Column("error", sa.Text, nullable=True),
+        sa.Column("started_at", sa.DateTime),
+        sa.Column("finished_at", sa.DateTime, nullable=True),
+    )
+    op.create_index(
+        "ix_job_runs_job_id_started_at", "job_runs", ["job_id", "started_at"], if_not_exists=True
+    )
+
+
+def downgrade():
+    op.drop_index("ix_job_runs_job_id_started_at", table_name="job_runs", if_exists=True)
+    op.drop_table("job_runs")
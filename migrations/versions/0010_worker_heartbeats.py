@@ -0,0 +1,27 @@
+"""worker_heartbeats jadvali (sharded scheduler)
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0010"
+down_revision = "0009"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "worker_heartbeats",
+        sa.Column("node_id", sa.String(128), primary_key=True),
+        sa.Column("started_at", sa.DateTime),
+        sa.Column("last_seen", sa.DateTime, nullable=False),
+    )
+
+
+def downgrade():
+    op.drop_table("worker_heartbeats")
@@ -0,0 +1,29 @@
+"""plan_extractions jadvali (GPT reja tahlili cache)
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0011"
+down_revision = "0010"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "plan_extractions",
+        sa.Column("key", sa.String(64), primary_key=True),
+        sa.Column("plans", sa.Text, nullable=False),
+        sa.Column("expires_at", sa.DateTime, nullable=False),
+    )
+    op.create_index("ix_plan_extractions_expires_at", "plan_extractions", ["expires_at"])
+
+
+def downgrade():
+    op.drop_index("ix_plan_extractions_expires_at", table_name="plan_extractions")
+    op.drop_table("plan_extractions")
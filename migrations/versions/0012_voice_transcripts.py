@@ -0,0 +1,29 @@
+"""voice_transcripts jadvali (Whisper natijalari cache)
+
+Revision ID: 0012
+Revises: 0011
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0012"
+down_revision = "0011"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "voice_transcripts",
+        sa.Column("file_unique_id", sa.String(64), primary_key=True),
+        sa.Column("text", sa.Text, nullable=False),
+        sa.Column("expires_at", sa.DateTime, nullable=False),
+    )
+    op.create_index("ix_voice_transcripts_expires_at", "voice_transcripts", ["expires_at"])
+
+
+def downgrade():
+    op.drop_index("ix_voice_transcripts_expires_at", table_name="voice_transcripts")
+    op.drop_table("voice_transcripts")
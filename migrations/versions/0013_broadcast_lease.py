@@ -0,0 +1,24 @@
+"""broadcasts.owner / lease_until — broadcast workerining egaligi
+
+Revision ID: 0013
+Revises: 0012
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0013"
+down_revision = "0012"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column("broadcasts", sa.Column("owner", sa.String(128), nullable=True))
+    op.add_column("broadcasts", sa.Column("lease_until", sa.DateTime, nullable=True))
+
+
+def downgrade():
+    op.drop_column("broadcasts", "lease_until")
+    op.drop_column("broadcasts", "owner")
@@ -0,0 +1,22 @@
+"""users.last_streak_date — kunlik streak yangilanishini idempotent qilish
+
+Revision ID: 0014
+Revises: 0013
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0014"
+down_revision = "0013"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column("users", sa.Column("last_streak_date", sa.Date, nullable=True))
+
+
+def downgrade():
+    op.drop_column("users", "last_streak_date")
@@ -0,0 +1,22 @@
+"""users.last_pending_check_date — kechki pending tekshiruvini (user, kun) bo'yicha band qilish
+
+Revision ID: 0015
+Revises: 0014
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0015"
+down_revision = "0014"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column("users", sa.Column("last_pending_check_date", sa.Date, nullable=True))
+
+
+def downgrade():
+    op.drop_column("users", "last_pending_check_date")